@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 import os
 
+from .database import parse_database_url
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -44,28 +46,41 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'home.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'home.middleware.StaticFilesMiddleware',
+    'home.middleware.CompressionMiddleware',
+    'home.middleware.HTMLMinifyMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'auth_firebase.middleware.FirebaseAuthMiddleware',
 ]
 
 ROOT_URLCONF = 'Voluntariados.urls'
 
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / "templates"],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'home.context_processors.deploy',
+            ],
+            # En producción los templates se compilan una sola vez por proceso
+            'loaders': TEMPLATE_LOADERS if DEBUG else [
+                ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
             ],
         },
     },
@@ -77,13 +92,61 @@ WSGI_APPLICATION = 'Voluntariados.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+# PRAGMAs que se ejecutan al abrir cada conexión SQLite. Con WAL los lectores
+# no se bloquean mientras otro worker escribe; busy_timeout (ms) hace que las
+# escrituras concurrentes esperen el lock en vez de fallar con "database is
+# locked"; synchronous=NORMAL es seguro con WAL y evita un fsync por commit.
+# mmap_size y cache_size (negativo = KiB) reducen las lecturas del archivo.
+# Ver auth_firebase/management/commands/benchmark_sqlite.py.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', '20000')),
+    'synchronous': 'NORMAL',
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', str(128 * 1024 * 1024))),
+    'cache_size': -int(os.environ.get('SQLITE_CACHE_KB', '20000')),
+    'temp_store': 'MEMORY',
+}
+
+SQLITE_OPTIONS = {
+    'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+    # Las transacciones toman el lock de escritura al empezar, así
+    # busy_timeout aplica y no fallan al pasar de lectura a escritura
+    'transaction_mode': 'IMMEDIATE',
 }
 
+# Con DATABASE_URL (Railway la define al agregar PostgreSQL) se usa esa base;
+# sin ella, el archivo SQLite local. Ver Voluntariados/database.py.
+DATABASE_URL = os.environ.get('DATABASE_URL')
+if DATABASE_URL:
+    DATABASE_POOL = None
+    if os.environ.get('DATABASE_POOL', 'True').lower() == 'true':
+        DATABASE_POOL = {
+            'min_size': int(os.environ.get('DATABASE_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.environ.get('DATABASE_POOL_MAX_SIZE', '10')),
+            'timeout': int(os.environ.get('DATABASE_POOL_TIMEOUT', '10')),
+        }
+    DATABASES = {
+        'default': parse_database_url(
+            DATABASE_URL,
+            conn_max_age=int(os.environ.get('DATABASE_CONN_MAX_AGE', '600')),
+            pool=DATABASE_POOL,
+            sqlite_options=SQLITE_OPTIONS,
+        ),
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+            'OPTIONS': SQLITE_OPTIONS,
+        }
+    }
+
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    # Base de pruebas en archivo para que los tests de concurrencia
+    # puedan abrir varias conexiones (la de memoria solo admite una)
+    DATABASES['default']['TEST'] = {'NAME': BASE_DIR / 'test_db.sqlite3'}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -128,6 +191,29 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 # WhiteNoise configuration
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
+# Versión del despliegue; invalida las páginas cacheadas con home.page_cache.
+# Railway define RAILWAY_GIT_COMMIT_SHA en cada despliegue.
+DEPLOY_VERSION = (
+    os.environ.get('DEPLOY_VERSION')
+    or os.environ.get('RAILWAY_GIT_COMMIT_SHA')
+    or 'dev'
+)[:12]
+STATIC_PAGE_CACHE = 'default'
+STATIC_PAGE_CACHE_TIMEOUT = None  # Hasta el siguiente despliegue
+# Minificar el HTML renderizado (siempre desactivado con DEBUG)
+HTML_MINIFY = os.environ.get('HTML_MINIFY', 'True').lower() == 'true'
+# Duración de los fragmentos {% cache %} de los templates (None = hasta el siguiente despliegue)
+FRAGMENT_CACHE_TIMEOUT = None
+
+# Métricas por ruta expuestas en /metrics (ver home.metrics). METRICS_DIR es
+# un directorio compartido por los workers de gunicorn para sumar sus
+# métricas; conviene vaciarlo al desplegar. Prometheus se autentica con
+# "Authorization: Bearer <METRICS_TOKEN>"; el staff del admin no lo necesita.
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True').lower() == 'true'
+METRICS_DIR = os.environ.get('METRICS_DIR') or None
+METRICS_FLUSH_INTERVAL = 5
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN') or None
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -142,3 +228,33 @@ FIREBASE_CONFIG = {
     'messagingSenderId': "your-sender-id",
     'appId': "your-app-id"
 }
+
+# Proyecto contra el que se verifican los ID tokens (aud/iss) y segundos que
+# se recuerda un token ya verificado
+FIREBASE_PROJECT_ID = os.environ.get('FIREBASE_PROJECT_ID', FIREBASE_CONFIG['projectId'])
+FIREBASE_TOKEN_CACHE_TTL = int(os.environ.get('FIREBASE_TOKEN_CACHE_TTL', '60'))
+# Archivo JSON de la cuenta de servicio que usa el comando sync_firestore; sin
+# él se usan las credenciales por defecto de Google (o el emulador con
+# FIRESTORE_EMULATOR_HOST)
+FIREBASE_CREDENTIALS = os.environ.get('FIREBASE_CREDENTIALS_PATH') or None
+
+# Rutas verificadas por FirebaseAuthMiddleware: nombres de URL ('auth:dashboard')
+# o prefijos de path ('/voluntariados/').
+# El inicio de sesión ocurre en el cliente con Firebase y no crea una sesión de
+# Django, así que por defecto no se exige sesión en ninguna ruta; solo se
+# redirige a los usuarios inactivos identificados con el header X-Firebase-UID.
+FIREBASE_AUTH_PROTECTED_ROUTES = []
+FIREBASE_AUTH_ACTIVE_USER_ROUTES = [
+    '/voluntariados/',
+    'auth:join_voluntariado',
+    'auth:volunteer_details',
+]
+
+# Caché de la decisión de acceso por UID usada por FirebaseAuthMiddleware.
+# SHARED_CACHE es el alias de un caché de CACHES compartido entre workers.
+FIREBASE_AUTH_CACHE = {
+    'LOCAL_TTL': int(os.environ.get('FIREBASE_AUTH_CACHE_TTL', '5')),
+    'LOCAL_MAX_ENTRIES': 10000,
+    'SHARED_CACHE': os.environ.get('FIREBASE_AUTH_SHARED_CACHE') or None,
+    'SHARED_TTL': 300,
+}
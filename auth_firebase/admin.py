@@ -1,5 +1,12 @@
 from django.contrib import admin
-from .models import UserStatus
+from .models import AchievementSummary, Event, Logro, Membership, Participation, UserAchievement, UserStatus, Voluntariado
+
+
+class MembershipInline(admin.TabularInline):
+    model = Membership
+    extra = 0
+    fields = ['voluntariado', 'role', 'joined_at']
+
 
 @admin.register(UserStatus)
 class UserStatusAdmin(admin.ModelAdmin):
@@ -21,12 +28,19 @@ class UserStatusAdmin(admin.ModelAdmin):
             'fields': ('fecha_registro', 'fecha_ultima_actividad'),
             'classes': ('collapse',)
         }),
-        ('Voluntariados', {
-            'fields': ('voluntariados',),
-            'classes': ('collapse',)
-        }),
     )
     
+    inlines = [MembershipInline]
+    
+    def save_formset(self, request, form, formset, change):
+        super().save_formset(request, form, formset, change)
+        if formset.model is Membership:
+            # Las membresías del admin no pasan por el contador de join_voluntariado
+            slugs = set()
+            for inline_form in formset.forms:
+                slugs.update((inline_form.initial.get('voluntariado'), inline_form.cleaned_data.get('voluntariado')))
+            Voluntariado.objects.filter(slug__in=slugs - {None}).recount_members()
+    
     actions = ['activate_users', 'deactivate_users', 'make_admin', 'remove_admin']
     
     def activate_users(self, request, queryset):
@@ -52,3 +66,89 @@ class UserStatusAdmin(admin.ModelAdmin):
         updated = queryset.update(rol='usuario')
         self.message_user(request, f'{updated} usuarios ya no son administradores.')
     remove_admin.short_description = "Quitar privilegios de administrador"
+
+
+@admin.register(Membership)
+class MembershipAdmin(admin.ModelAdmin):
+    list_display = ['user', 'voluntariado', 'role', 'joined_at']
+    list_filter = ['voluntariado', 'role']
+    search_fields = ['user__email', 'user__firebase_uid', 'voluntariado']
+    list_select_related = ['user']
+    raw_id_fields = ['user']
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        # Las membresías del admin no pasan por el contador de join_voluntariado
+        slugs = {obj.voluntariado, form.initial.get('voluntariado')}
+        Voluntariado.objects.filter(slug__in=slugs - {None}).recount_members()
+
+
+@admin.register(Voluntariado)
+class VoluntariadoAdmin(admin.ModelAdmin):
+    list_display = ['name', 'slug', 'code', 'active', 'member_count', 'max_members']
+    list_filter = ['active']
+    search_fields = ['name', 'slug', 'code']
+    readonly_fields = ['member_count']
+
+
+class ParticipationInline(admin.TabularInline):
+    model = Participation
+    extra = 0
+    fields = ['user', 'status', 'registered_at', 'attended']
+    raw_id_fields = ['user']
+
+
+@admin.register(Event)
+class EventAdmin(admin.ModelAdmin):
+    list_display = ['title', 'voluntariado', 'event_date', 'status', 'registered', 'max_participants']
+    list_filter = ['status', 'voluntariado']
+    search_fields = ['title', 'firestore_id']
+    list_select_related = ['voluntariado']
+    raw_id_fields = ['created_by']
+    readonly_fields = ['registered']
+    inlines = [ParticipationInline]
+
+    def save_formset(self, request, form, formset, change):
+        super().save_formset(request, form, formset, change)
+        if formset.model is Participation:
+            # Las inscripciones del admin no pasan por el UPDATE condicional de register_for_event
+            Event.objects.filter(pk=form.instance.pk).recount_registered()
+
+
+class UserAchievementInline(admin.TabularInline):
+    # Solo lectura: los logros se otorgan con UserAchievement.objects.grant()
+    # para que el resumen de cada usuario se mantenga al día
+    model = UserAchievement
+    extra = 0
+    fields = ['user', 'assigned_by', 'assigned_at']
+    readonly_fields = fields
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Logro)
+class LogroAdmin(admin.ModelAdmin):
+    list_display = ['name', 'voluntariado', 'criteria', 'points', 'hours', 'active']
+    list_filter = ['active', 'criteria', 'voluntariado']
+    search_fields = ['name', 'firestore_id']
+    list_select_related = ['voluntariado']
+    raw_id_fields = ['created_by']
+    inlines = [UserAchievementInline]
+
+    def delete_queryset(self, request, queryset):
+        # Logro.delete() recalcula los resúmenes de los usuarios afectados
+        for logro in queryset:
+            logro.delete()
+
+
+@admin.register(AchievementSummary)
+class AchievementSummaryAdmin(admin.ModelAdmin):
+    list_display = ['user', 'count', 'points', 'hours', 'latest', 'latest_at']
+    search_fields = ['user__email', 'user__firebase_uid']
+    list_select_related = ['user', 'latest']
+    readonly_fields = ['user', 'count', 'points', 'hours', 'latest', 'latest_at']
+
+    def has_add_permission(self, request):
+        return False
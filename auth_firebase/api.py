@@ -0,0 +1,242 @@
+"""
+Capa común de las APIs JSON de auth_firebase.
+
+loads() y dumps() usan orjson cuando está instalado y el módulo json de la
+biblioteca estándar si no; ambos producen el mismo JSON (los datetime y
+Decimal pasan por DjangoJSONEncoder en los dos casos).
+
+Cada endpoint declara su cuerpo con un Schema de Field. El Schema se
+compila una vez al importar la vista en una lista de funciones, una por
+campo, que solo hacen las comprobaciones que ese campo declara.
+
+api_endpoint() envuelve vistas síncronas o asíncronas: exige POST,
+decodifica y valida el cuerpo, pasa a la vista el diccionario limpio y
+convierte cualquier error en la misma forma de respuesta:
+{"success": false, "message": "...", "errors": {"campo": "motivo"}}.
+"""
+import json
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional; sin él se usa json
+    orjson = None
+
+_django_encoder = DjangoJSONEncoder()
+
+if orjson is not None:
+    # Los datetime se delegan a DjangoJSONEncoder para que la salida sea igual a la de json
+    _ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def dumps(value):
+        """Serializa value a JSON en bytes UTF-8"""
+        return orjson.dumps(value, default=_django_encoder.default, option=_ORJSON_OPTIONS)
+
+    loads = orjson.loads
+else:
+    def dumps(value):
+        """Serializa value a JSON en bytes UTF-8"""
+        return json.dumps(
+            value, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(',', ':'),
+        ).encode()
+
+    loads = json.loads
+
+
+class ApiResponse(HttpResponse):
+    """Respuesta JSON serializada con dumps()"""
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=dumps(data), **kwargs)
+
+
+def api_error(message, errors=None, status_key='success', **extra):
+    """Respuesta de error con la forma común de todos los endpoints"""
+    payload = {status_key: False, 'message': message}
+    if errors:
+        payload['errors'] = errors
+    payload.update(extra)
+    return ApiResponse(payload)
+
+
+_MISSING = object()
+_TYPE_NAMES = {str: 'texto', int: 'un número entero', bool: 'true o false', list: 'una lista'}
+
+
+class Field:
+    """
+    Un campo del cuerpo: tipo, obligatorio, valor por defecto y restricciones.
+
+    kind es str, int, bool, list o una tupla de tipos aceptados (p. ej.
+    (str, int) para ids que llegan como texto o número). Los int aceptan
+    también texto numérico. items, choices y max_items aplican a listas;
+    parse recibe el valor ya validado y puede lanzar ValueError.
+    """
+
+    def __init__(self, kind=str, required=False, default=None, choices=None,
+                 max_length=None, items=str, max_items=None, parse=None):
+        self.kind = kind
+        self.required = required
+        self.default = default
+        self.choices = frozenset(choices) if choices is not None else None
+        self.max_length = max_length
+        self.items = items
+        self.max_items = max_items
+        self.parse = parse
+
+    def compile(self):
+        """Devuelve una función valor -> (valor limpio, error o None)"""
+        kind, required, default = self.kind, self.required, self.default
+        steps = [self._type_step()]
+        if self.max_length is not None:
+            max_length = self.max_length
+            steps.append(lambda v: (v, f'admite hasta {max_length} caracteres') if len(v) > max_length else (v, None))
+        if self.max_items is not None:
+            max_items = self.max_items
+            steps.append(lambda v: (v, f'admite hasta {max_items} elementos') if len(v) > max_items else (v, None))
+        if self.choices is not None:
+            steps.append(self._choices_step())
+        if self.parse is not None:
+            parse = self.parse
+
+            def parse_step(value):
+                try:
+                    return parse(value), None
+                except ValueError as e:
+                    return value, str(e)
+            steps.append(parse_step)
+
+        def check(value):
+            if value is _MISSING or value is None or (value == '' and kind is str):
+                return (_MISSING, 'requerido') if required else (default, None)
+            for step in steps:
+                value, error = step(value)
+                if error:
+                    return value, error
+            return value, None
+        return check
+
+    def _type_step(self):
+        kind = self.kind
+        if kind is int:
+            def step(value):
+                if isinstance(value, bool):
+                    return value, 'debe ser un número entero'
+                if isinstance(value, int):
+                    return value, None
+                try:
+                    return int(value), None
+                except (TypeError, ValueError):
+                    return value, 'debe ser un número entero'
+            return step
+        if kind is list:
+            items = self.items
+
+            def step(value):
+                if not isinstance(value, list):
+                    return value, 'debe ser una lista'
+                if any(isinstance(item, bool) or not isinstance(item, items) for item in value):
+                    return value, 'contiene valores de tipo no válido'
+                return value, None
+            return step
+        if isinstance(kind, tuple):
+            message = 'debe ser ' + ' o '.join(_TYPE_NAMES[k] for k in kind)
+        else:
+            message = f'debe ser {_TYPE_NAMES[kind]}'
+
+        def step(value):
+            if isinstance(value, kind) and not (isinstance(value, bool) and kind is not bool):
+                return value, None
+            return value, message
+        return step
+
+    def _choices_step(self):
+        choices = self.choices
+        if self.kind is list:
+            def step(value):
+                invalid = [item for item in value if item not in choices]
+                if invalid:
+                    return value, f"valores no permitidos: {', '.join(map(str, invalid))}"
+                return value, None
+            return step
+        return lambda v: (v, None) if v in choices else (v, f'valor no válido: {v}')
+
+
+class Schema:
+    """Campos del cuerpo de un endpoint, compilados una sola vez"""
+
+    def __init__(self, **fields):
+        self.fields = fields
+        self._checks = [(name, field.compile()) for name, field in fields.items()]
+
+    def validate(self, data):
+        """Devuelve (datos limpios, errores por campo); los campos no declarados se descartan"""
+        cleaned, errors = {}, {}
+        for name, check in self._checks:
+            value, error = check(data.get(name, _MISSING))
+            if error:
+                errors[name] = error
+            else:
+                cleaned[name] = value
+        return cleaned, errors
+
+
+def _parse_request(request, schema, source, status_key):
+    """Devuelve (datos limpios, None) o (None, respuesta de error)"""
+    if request.method != 'POST':
+        return None, api_error('Método no permitido', status_key=status_key)
+    if source == 'form':
+        data = request.POST.dict()
+    else:
+        try:
+            data = loads(request.body)
+        except ValueError:
+            return None, api_error('El cuerpo no es JSON válido', status_key=status_key)
+        if not isinstance(data, dict):
+            return None, api_error('El cuerpo debe ser un objeto JSON', status_key=status_key)
+    if schema is None:
+        return data, None
+    cleaned, errors = schema.validate(data)
+    if errors:
+        message = '; '.join(f'{name}: {error}' for name, error in errors.items())
+        return None, api_error(message, errors=errors, status_key=status_key)
+    return cleaned, None
+
+
+def api_endpoint(schema=None, source='json', status_key='success'):
+    """
+    Decorador de los endpoints JSON: la vista recibe (request, data) con data
+    ya validado por schema. source='form' lee request.POST en vez del cuerpo
+    JSON (para subir archivos). status_key es la clave que indica éxito en las
+    respuestas de error ("valid" en verify_token).
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            async def wrapper(request, *args, **kwargs):
+                data, error = _parse_request(request, schema, source, status_key)
+                if error is not None:
+                    return error
+                try:
+                    return await view(request, data, *args, **kwargs)
+                except Exception as e:
+                    return api_error(str(e), status_key=status_key)
+            markcoroutinefunction(wrapper)
+        else:
+            def wrapper(request, *args, **kwargs):
+                data, error = _parse_request(request, schema, source, status_key)
+                if error is not None:
+                    return error
+                try:
+                    return view(request, data, *args, **kwargs)
+                except Exception as e:
+                    return api_error(str(e), status_key=status_key)
+        wrapper = csrf_exempt(wraps(view)(wrapper))
+        wrapper.schema = schema
+        return wrapper
+    return decorator
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AuthFirebaseConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "auth_firebase"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,145 @@
+"""
+Caché de la decisión de acceso por Firebase UID usada por FirebaseAuthMiddleware.
+
+Tiene dos niveles: un LRU con TTL local al proceso y, opcionalmente, un caché
+compartido de Django (por ejemplo Redis o memcached) configurado con
+FIREBASE_AUTH_CACHE['SHARED_CACHE']. Las entradas se invalidan desde las
+señales de auth_firebase.signals cuando cambia un UserStatus.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+# Valores guardados por UID
+ACCESS_GRANTED = 1
+ACCESS_DENIED = 0
+NOT_REGISTERED = -1
+
+DEFAULTS = {
+    'LOCAL_TTL': 30,
+    'LOCAL_MAX_ENTRIES': 10000,
+    'SHARED_CACHE': None,
+    'SHARED_TTL': 300,
+    'KEY_PREFIX': 'auth_firebase:access:',
+}
+
+
+class TTLCache:
+    """LRU acotado en tamaño cuyas entradas expiran después de ttl segundos"""
+
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, expires = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class UserAccessCache:
+    """
+    Guarda si un UID puede acceder a las rutas de usuario activo.
+
+    Con varios procesos, las invalidaciones borran el nivel compartido y el
+    local del proceso que hizo el cambio; los demás procesos ven el cambio
+    cuando expira su entrada local, por eso LOCAL_TTL debe ser corto en
+    despliegues con varios workers.
+    """
+
+    def __init__(self, options=None):
+        self.configure(options)
+
+    def configure(self, options=None):
+        config = dict(DEFAULTS)
+        config.update(options or {})
+        self.key_prefix = config['KEY_PREFIX']
+        self.shared_alias = config['SHARED_CACHE']
+        self.shared_ttl = config['SHARED_TTL']
+        self.local = TTLCache(config['LOCAL_TTL'], config['LOCAL_MAX_ENTRIES'])
+
+    @property
+    def shared(self):
+        if self.shared_alias:
+            return caches[self.shared_alias]
+        return None
+
+    def _key(self, firebase_uid):
+        return f'{self.key_prefix}{firebase_uid}'
+
+    def get_access(self, firebase_uid):
+        """
+        Devuelve ACCESS_GRANTED, ACCESS_DENIED o NOT_REGISTERED para el UID,
+        consultando la base de datos solo si no está en ningún nivel del caché.
+        """
+        value = self.local.get(firebase_uid)
+        if value is not None:
+            return value
+
+        shared = self.shared
+        if shared is not None:
+            value = shared.get(self._key(firebase_uid))
+            if value is not None:
+                self.local.set(firebase_uid, value)
+                return value
+
+        value = self._load(firebase_uid)
+        self.local.set(firebase_uid, value)
+        if shared is not None:
+            shared.set(self._key(firebase_uid), value, self.shared_ttl)
+        return value
+
+    def _load(self, firebase_uid):
+        from .models import UserStatus
+
+        user_status = (
+            UserStatus.objects.filter(firebase_uid=firebase_uid)
+            .only('firebase_uid', 'estado', 'rol')
+            .first()
+        )
+        if user_status is None:
+            return NOT_REGISTERED
+        return ACCESS_GRANTED if user_status.can_access_voluntariados() else ACCESS_DENIED
+
+    def invalidate(self, *firebase_uids):
+        for firebase_uid in firebase_uids:
+            self.local.delete(firebase_uid)
+        shared = self.shared
+        if shared is not None and firebase_uids:
+            shared.delete_many([self._key(uid) for uid in firebase_uids])
+
+    def clear(self):
+        self.local.clear()
+
+
+user_access_cache = UserAccessCache(getattr(settings, 'FIREBASE_AUTH_CACHE', None))
@@ -0,0 +1,468 @@
+"""
+Sincronización masiva de Firestore a Django.
+
+Cada colección se recorre en páginas ordenadas por id de documento (o por
+fecha de actualización y id en las corridas incrementales) y cada página se
+inserta o actualiza con bulk_create(update_conflicts=True) en una transacción
+junto con su SyncCheckpoint. Si el proceso se corta, la siguiente ejecución
+retoma después del último documento confirmado.
+
+Las corridas incrementales solo leen los documentos cuyo campo de
+actualización (updated_field) es posterior a la última corrida completa;
+los documentos que no tienen ese campo solo se leen en corridas completas.
+
+La fuente de datos puede ser Firestore (o su emulador, con
+FIRESTORE_EMULATOR_HOST) o un archivo JSON con documentos grabados.
+"""
+import json
+import os
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import (
+    Event,
+    Logro,
+    Membership,
+    Participation,
+    SyncCheckpoint,
+    UserAchievement,
+    UserStatus,
+    Voluntariado,
+)
+from .signals import user_status_bulk_updated
+
+SYNC_BATCH_SIZE = 500
+# Margen para diferencias de reloj con Firestore; reprocesar documentos es inocuo
+SYNC_OVERLAP = timedelta(minutes=5)
+
+
+def to_datetime(value):
+    """Convierte un Timestamp de Firestore, un ISO 8601 o {'_seconds': ...} a datetime"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, datetime):
+        return value if timezone.is_aware(value) else timezone.make_aware(value, dt_timezone.utc)
+    if isinstance(value, dict) and '_seconds' in value:
+        seconds = value['_seconds'] + value.get('_nanoseconds', 0) / 1e9
+        return datetime.fromtimestamp(seconds, tz=dt_timezone.utc)
+    if isinstance(value, str):
+        parsed = parse_datetime(value)
+        if parsed is not None:
+            return to_datetime(parsed)
+    return None
+
+
+def _choice(value, choices, default):
+    return value if value in {key for key, _ in choices} else default
+
+
+class FirestoreSource:
+    """Lee páginas de una colección con el cliente de Firestore de firebase-admin"""
+
+    def __init__(self, client=None):
+        self.client = client or firestore_client()
+
+    def page(self, collection, limit, since=None, updated_field='updatedAt', after=None):
+        from google.cloud.firestore import FieldFilter
+
+        query = self.client.collection(collection)
+        if since is not None:
+            query = query.where(filter=FieldFilter(updated_field, '>=', since)).order_by(updated_field)
+        query = query.order_by('__name__')
+        if after is not None:
+            after_id, after_updated = after
+            cursor = {'__name__': after_id}
+            if since is not None:
+                cursor[updated_field] = after_updated
+            query = query.start_after(cursor)
+        return [(snapshot.id, snapshot.to_dict()) for snapshot in query.limit(limit).stream()]
+
+
+class FixtureSource:
+    """
+    Fuente grabada con la misma interfaz que FirestoreSource, para pruebas.
+
+    documents es {colección: {id: datos}}; las fechas pueden ser ISO 8601 o
+    {'_seconds': ..., '_nanoseconds': ...} como en las exportaciones de Firestore.
+    """
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding='utf-8') as fixture:
+            return cls(json.load(fixture))
+
+    def page(self, collection, limit, since=None, updated_field='updatedAt', after=None):
+        docs = self.documents.get(collection, {})
+        if since is None:
+            rows = sorted((doc_id, doc_id, data) for doc_id, data in docs.items())
+            if after is not None:
+                rows = [row for row in rows if row[0] > after[0]]
+        else:
+            rows = []
+            for doc_id, data in docs.items():
+                updated = to_datetime(data.get(updated_field))
+                if updated is not None and updated >= since:
+                    rows.append(((updated, doc_id), doc_id, data))
+            rows.sort(key=lambda row: row[0])
+            if after is not None:
+                rows = [row for row in rows if row[0] > (after[1], after[0])]
+        return [(doc_id, data) for _, doc_id, data in rows[:limit]]
+
+
+def firestore_client():
+    """Cliente de Firestore del proyecto; con FIRESTORE_EMULATOR_HOST usa el emulador"""
+    if os.environ.get('FIRESTORE_EMULATOR_HOST'):
+        # El emulador no valida credenciales
+        from google.cloud import firestore
+
+        return firestore.Client(project=settings.FIREBASE_PROJECT_ID)
+
+    import firebase_admin
+    from firebase_admin import credentials, firestore
+
+    try:
+        app = firebase_admin.get_app()
+    except ValueError:
+        path = getattr(settings, 'FIREBASE_CREDENTIALS', None)
+        credential = credentials.Certificate(path) if path else credentials.ApplicationDefault()
+        app = firebase_admin.initialize_app(credential, {'projectId': settings.FIREBASE_PROJECT_ID})
+    return firestore.client(app)
+
+
+class CollectionSync:
+    """Copia los documentos de una colección en un modelo de Django"""
+
+    collection = None
+    model = None
+    unique_fields = None
+    update_fields = None
+    updated_field = 'updatedAt'
+
+    def build(self, docs):
+        """Devuelve las instancias a guardar para la página docs"""
+        raise NotImplementedError
+
+    def after_save(self, docs):
+        """Guarda las relaciones que dependen de las filas recién insertadas"""
+
+    def save(self, docs):
+        instances = self.build(docs)
+        if instances:
+            self.model.objects.bulk_create(
+                instances,
+                update_conflicts=True,
+                unique_fields=self.unique_fields,
+                update_fields=self.update_fields,
+            )
+        self.after_save(docs)
+        return len(instances)
+
+
+class UsersSync(CollectionSync):
+    collection = 'users'
+    model = UserStatus
+    unique_fields = ['firebase_uid']
+    update_fields = ['email', 'nombre', 'apellido', 'estado', 'rol']
+
+    def build(self, docs):
+        return [
+            UserStatus(
+                firebase_uid=doc_id,
+                email=data.get('email', ''),
+                nombre=data.get('firstName', ''),
+                apellido=data.get('lastName', ''),
+                estado=_choice(data.get('estado'), UserStatus.STATUS_CHOICES, 'inactivo'),
+                rol=_choice(data.get('rol'), UserStatus.ROLE_CHOICES, 'usuario'),
+                fecha_registro=to_datetime(data.get('createdAt')) or timezone.now(),
+            )
+            for doc_id, data in docs
+        ]
+
+    def after_save(self, docs):
+        user_ids = dict(
+            UserStatus.objects.filter(firebase_uid__in=[doc_id for doc_id, _ in docs])
+            .values_list('firebase_uid', 'id')
+        )
+        memberships = [
+            Membership(
+                user_id=user_ids[doc_id],
+                voluntariado=voluntariado,
+                joined_at=to_datetime((info or {}).get('joinedAt')) or timezone.now(),
+            )
+            for doc_id, data in docs
+            for voluntariado, info in (data.get('voluntariados') or {}).items()
+        ]
+        # Las membresías nuevas entran como miembro; el rol de coordinador lo
+        # asigna la sincronización de voluntariados a partir de adminUids
+        Membership.objects.bulk_create(memberships, ignore_conflicts=True)
+        Voluntariado.objects.filter(
+            slug__in={membership.voluntariado for membership in memberships}
+        ).recount_members()
+        # bulk_create no dispara post_save: se avisa para invalidar el caché de acceso
+        user_status_bulk_updated.send(
+            sender=UserStatus, firebase_uids=list(user_ids), fields=tuple(self.update_fields)
+        )
+
+
+class VoluntariadosSync(CollectionSync):
+    collection = 'voluntariados'
+    model = Voluntariado
+    unique_fields = ['slug']
+    # member_count no se copia de memberCount: se cuenta desde Membership
+    update_fields = ['name', 'code', 'active', 'max_members']
+
+    def build(self, docs):
+        return [
+            Voluntariado(
+                slug=doc_id,
+                name=data.get('name', doc_id),
+                code=(data.get('code') or doc_id[:20]).upper(),
+                active=data.get('active', True),
+                max_members=data.get('maxMembers'),
+            )
+            for doc_id, data in docs
+        ]
+
+    def after_save(self, docs):
+        for doc_id, data in docs:
+            admin_uids = data.get('adminUids') or []
+            if admin_uids:
+                Membership.objects.filter(
+                    voluntariado=doc_id, user__firebase_uid__in=admin_uids
+                ).update(role='coordinador')
+        Voluntariado.objects.filter(slug__in=[doc_id for doc_id, _ in docs]).recount_members()
+
+
+class EventosSync(CollectionSync):
+    collection = 'eventos'
+    model = Event
+    unique_fields = ['firestore_id']
+    update_fields = [
+        'voluntariado', 'title', 'description', 'event_date', 'duration',
+        'max_participants', 'status', 'created_by',
+    ]
+    # Los eventos creados desde events-manager.js usan 'activo'
+    STATUS_ALIASES = {'activo': 'abierto'}
+
+    def build(self, docs):
+        voluntariados = dict(
+            Voluntariado.objects.filter(slug__in={data.get('voluntariadoId') for _, data in docs})
+            .values_list('slug', 'id')
+        )
+        creators = _user_ids(data.get('createdBy') for _, data in docs)
+        events = []
+        for doc_id, data in docs:
+            voluntariado_id = voluntariados.get(data.get('voluntariadoId'))
+            event_date = to_datetime(data.get('eventDate') or data.get('date'))
+            if voluntariado_id is None or event_date is None:
+                continue
+            status = self.STATUS_ALIASES.get(data.get('status'), data.get('status'))
+            events.append(Event(
+                firestore_id=doc_id,
+                voluntariado_id=voluntariado_id,
+                title=data.get('title', ''),
+                description=data.get('description', ''),
+                event_date=event_date,
+                duration=data.get('duration') or 2,
+                max_participants=data.get('maxParticipants') or None,
+                status=_choice(status, Event.STATUS_CHOICES, 'abierto'),
+                created_by_id=creators.get(data.get('createdBy')),
+                created_at=to_datetime(data.get('createdAt')) or timezone.now(),
+            ))
+        return events
+
+    def after_save(self, docs):
+        # registered no se copia de Firestore: register_for_event lo mantiene
+        # con las inscripciones locales y las promociones de la lista de espera
+        events = {
+            event.firestore_id: event
+            for event in Event.objects.filter(firestore_id__in=[doc_id for doc_id, _ in docs])
+            .only('id', 'firestore_id', 'max_participants')
+        }
+        users = _user_ids(uid for _, data in docs for uid in data.get('participants') or [])
+        existing = set(
+            Participation.objects.filter(event__in=events.values()).values_list('event_id', 'user_id')
+        )
+        seated = dict(
+            Participation.objects.filter(event__in=events.values(), status='inscrito')
+            .order_by().values('event').annotate(total=Count('id')).values_list('event', 'total')
+        )
+        participations = []
+        seen = set()
+        for doc_id, data in docs:
+            event = events.get(doc_id)
+            if event is None:
+                continue
+            attended = set(data.get('attended') or [])
+            for uid in data.get('participants') or []:
+                key = (event.pk, users.get(uid))
+                if uid not in users or key in seen:
+                    continue
+                seen.add(key)
+                participation = Participation(event=event, user_id=users[uid], attended=uid in attended)
+                if key not in existing:
+                    # Los participantes nuevos que no caben quedan en lista de espera
+                    if event.max_participants is not None and seated.get(event.pk, 0) >= event.max_participants:
+                        participation.status = 'en_espera'
+                    else:
+                        seated[event.pk] = seated.get(event.pk, 0) + 1
+                participations.append(participation)
+        if participations:
+            Participation.objects.bulk_create(
+                participations,
+                update_conflicts=True,
+                unique_fields=['event', 'user'],
+                update_fields=['attended'],
+            )
+        Event.objects.filter(pk__in=[event.pk for event in events.values()]).recount_registered()
+
+
+class LogrosSync(CollectionSync):
+    collection = 'logros'
+    model = Logro
+    unique_fields = ['firestore_id']
+    update_fields = [
+        'voluntariado', 'name', 'description', 'criteria', 'value', 'points', 'hours', 'icon', 'active',
+    ]
+
+    def build(self, docs):
+        voluntariados = dict(
+            Voluntariado.objects.filter(slug__in={data.get('voluntariadoId') for _, data in docs})
+            .values_list('slug', 'id')
+        )
+        creators = _user_ids(data.get('createdBy') for _, data in docs)
+        return [
+            Logro(
+                firestore_id=doc_id,
+                voluntariado_id=voluntariados[data.get('voluntariadoId')],
+                name=data.get('name', ''),
+                description=data.get('description', ''),
+                criteria=_choice(data.get('criteria'), Logro.CRITERIA_CHOICES, 'especial'),
+                value=data.get('value') or 1,
+                points=data.get('points') or 0,
+                hours=data.get('hours') or 0,
+                icon=data.get('icon') or 'fas fa-trophy',
+                active=data.get('isActive', True),
+                created_by_id=creators.get(data.get('createdBy')),
+                created_at=to_datetime(data.get('createdAt')) or timezone.now(),
+            )
+            for doc_id, data in docs
+            if data.get('voluntariadoId') in voluntariados
+        ]
+
+    def after_save(self, docs):
+        # bulk_create no pasa por Logro.save(): si cambiaron puntos u horas de
+        # logros ya otorgados hay que recalcular los resúmenes de sus usuarios
+        user_ids = UserAchievement.objects.filter(
+            logro__firestore_id__in=[doc_id for doc_id, _ in docs]
+        ).values_list('user_id', flat=True)
+        UserAchievement.objects.rebuild_summaries(user_ids)
+
+
+class UserAchievementsSync(CollectionSync):
+    collection = 'user_achievements'
+    model = UserAchievement
+    unique_fields = ['user', 'logro']
+    update_fields = ['assigned_by', 'assigned_at']
+    updated_field = 'assignedAt'
+
+    def build(self, docs):
+        users = _user_ids(
+            uid for _, data in docs for uid in (data.get('userId'), data.get('assignedBy'))
+        )
+        logros = dict(
+            Logro.objects.filter(firestore_id__in={data.get('achievementId') for _, data in docs})
+            .values_list('firestore_id', 'id')
+        )
+        return [
+            UserAchievement(
+                user_id=users[data.get('userId')],
+                logro_id=logros[data.get('achievementId')],
+                assigned_by_id=users.get(data.get('assignedBy')),
+                assigned_at=to_datetime(data.get('assignedAt')) or timezone.now(),
+            )
+            for _, data in docs
+            if data.get('userId') in users and data.get('achievementId') in logros
+        ]
+
+    def after_save(self, docs):
+        # Los resúmenes no se pueden ajustar con deltas porque una página
+        # puede repetir asignaciones ya sincronizadas
+        user_ids = _user_ids(data.get('userId') for _, data in docs).values()
+        UserAchievement.objects.rebuild_summaries(user_ids)
+
+
+def _user_ids(firebase_uids):
+    firebase_uids = {uid for uid in firebase_uids if uid}
+    if not firebase_uids:
+        return {}
+    return dict(
+        UserStatus.objects.filter(firebase_uid__in=firebase_uids).values_list('firebase_uid', 'id')
+    )
+
+
+# En orden de dependencia: cada colección referencia a las anteriores
+SYNCS = [UsersSync(), VoluntariadosSync(), EventosSync(), LogrosSync(), UserAchievementsSync()]
+COLLECTIONS = {sync.collection: sync for sync in SYNCS}
+
+
+def sync_collection(source, sync, batch_size=SYNC_BATCH_SIZE, full=False, restart=False, max_batches=None):
+    """
+    Sincroniza una colección y devuelve cuántos documentos leyó en esta ejecución.
+
+    Sin full, la corrida es incremental desde el synced_until del checkpoint.
+    Una corrida interrumpida se retoma desde su cursor salvo con restart (o
+    full). Con max_batches se detiene después de esa cantidad de páginas y
+    deja el checkpoint listo para continuar.
+    """
+    checkpoint, _ = SyncCheckpoint.objects.get_or_create(collection=sync.collection)
+    if not checkpoint.in_progress or restart or full:
+        checkpoint.run_started_at = timezone.now()
+        checkpoint.run_since = None if full or checkpoint.synced_until is None else checkpoint.synced_until - SYNC_OVERLAP
+        checkpoint.cursor_id = ''
+        checkpoint.cursor_updated_at = None
+        checkpoint.documents = 0
+        checkpoint.save()
+
+    read = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        after = None
+        if checkpoint.cursor_id:
+            after = (checkpoint.cursor_id, checkpoint.cursor_updated_at)
+        docs = source.page(
+            sync.collection, batch_size,
+            since=checkpoint.run_since, updated_field=sync.updated_field, after=after,
+        )
+        if not docs:
+            break
+        last_id, last_data = docs[-1]
+        with transaction.atomic():
+            sync.save(docs)
+            checkpoint.cursor_id = last_id
+            checkpoint.cursor_updated_at = to_datetime(last_data.get(sync.updated_field))
+            checkpoint.documents += len(docs)
+            checkpoint.save()
+        read += len(docs)
+        batches += 1
+        if len(docs) < batch_size:
+            break
+    else:
+        # Se alcanzó max_batches: la corrida queda en curso para retomarla
+        return read
+
+    checkpoint.synced_until = checkpoint.run_started_at
+    checkpoint.run_started_at = None
+    checkpoint.run_since = None
+    checkpoint.cursor_id = ''
+    checkpoint.cursor_updated_at = None
+    checkpoint.save()
+    return read
@@ -0,0 +1,319 @@
+"""
+Datos sintéticos y generador de carga para medir el sitio con volúmenes de
+inicio de semestre.
+
+generate() siembra voluntariados, usuarios, membresías, eventos e
+inscripciones con bulk_create por lotes. Los datos dependen solo de la
+semilla, así dos corridas con los mismos parámetros son comparables.
+
+run_load() reproduce contra un servidor HTTP una mezcla de páginas y APIs
+(SCENARIOS) desde varios hilos y summarize() resume rendimiento y
+latencias p50/p95/p99 por ruta.
+"""
+import json
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Event, Membership, Participation, UserStatus, Voluntariado
+
+SYNTHETIC_PREFIX = 'synthetic-'
+SYNTHETIC_ADMIN_UID = f'{SYNTHETIC_PREFIX}admin'
+# Proporción de usuarios por estado, como en un inicio de semestre
+STATUS_WEIGHTS = {'activo': 70, 'inactivo': 25, 'suspendido': 5}
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """Tamaño de los datos sintéticos; de él salen los UID, eventos y códigos válidos"""
+    users: int
+    events: int
+    voluntariados: int
+
+    def user_uid(self, index):
+        return f'{SYNTHETIC_PREFIX}{index}'
+
+    def event_id(self, index):
+        return f'{SYNTHETIC_PREFIX}evt-{index}'
+
+    def voluntariado_slug(self, index):
+        return f'{SYNTHETIC_PREFIX}vol-{index}'
+
+    def voluntariado_code(self, index):
+        return f'SYN{index}'
+
+
+def clear():
+    """Borra los datos sintéticos; los logros y resúmenes caen en cascada con sus usuarios"""
+    with transaction.atomic():
+        # Sin señales: liberar cada lugar o membresía de eventos y voluntariados
+        # que se borran a continuación solo haría miles de UPDATE inútiles
+        participations = Participation.objects.filter(event__firestore_id__startswith=SYNTHETIC_PREFIX)
+        participations._raw_delete(participations.db)
+        memberships = Membership.objects.filter(voluntariado__startswith=SYNTHETIC_PREFIX)
+        memberships._raw_delete(memberships.db)
+        Event.objects.filter(firestore_id__startswith=SYNTHETIC_PREFIX).delete()
+        UserStatus.objects.filter(firebase_uid__startswith=SYNTHETIC_PREFIX).delete()
+        Voluntariado.objects.filter(slug__startswith=SYNTHETIC_PREFIX).delete()
+
+
+def generate(dataset, batch_size=1000, seed=0):
+    """
+    Siembra dataset y devuelve cuántas filas se crearon de cada modelo.
+
+    Cada usuario pertenece a uno o dos voluntariados y se inscribe en hasta
+    tres eventos de ellos, sin pasar del cupo de cada evento.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    created = {'voluntariados': 0, 'users': 0, 'memberships': 0, 'events': 0, 'participations': 0}
+
+    with transaction.atomic():
+        voluntariados = Voluntariado.objects.bulk_create([
+            Voluntariado(
+                slug=dataset.voluntariado_slug(k),
+                name=f'Voluntariado sintético {k}',
+                code=dataset.voluntariado_code(k),
+            )
+            for k in range(dataset.voluntariados)
+        ])
+        created['voluntariados'] = len(voluntariados)
+
+        events = []
+        for offset in range(0, dataset.events, batch_size):
+            events += Event.objects.bulk_create([
+                Event(
+                    firestore_id=dataset.event_id(j),
+                    voluntariado=voluntariados[j % len(voluntariados)],
+                    title=f'Evento sintético {j}',
+                    event_date=now + timedelta(days=rng.randint(1, 90), hours=rng.randint(7, 17)),
+                    duration=rng.choice((2, 3, 4, 8)),
+                    max_participants=rng.choice((None, 25, 50, 100, 200)),
+                )
+                for j in range(offset, min(offset + batch_size, dataset.events))
+            ])
+        created['events'] = len(events)
+        events_by_voluntariado = {}
+        for event in events:
+            events_by_voluntariado.setdefault(event.voluntariado_id, []).append(event)
+        registered = {event.pk: 0 for event in events}
+
+        UserStatus.objects.create(
+            firebase_uid=SYNTHETIC_ADMIN_UID, email='admin@synthetic.unah.hn', estado='activo', rol='admin',
+        )
+        estados, weights = zip(*STATUS_WEIGHTS.items())
+        for offset in range(0, dataset.users, batch_size):
+            users = UserStatus.objects.bulk_create([
+                UserStatus(
+                    firebase_uid=dataset.user_uid(i),
+                    email=f'synthetic{i}@unah.hn',
+                    nombre=f'Nombre{i}',
+                    apellido=f'Apellido{i}',
+                    estado=rng.choices(estados, weights)[0],
+                    fecha_registro=now - timedelta(minutes=rng.randint(0, 180 * 24 * 60)),
+                )
+                for i in range(offset, min(offset + batch_size, dataset.users))
+            ])
+            memberships = []
+            participations = []
+            for user in users:
+                for voluntariado in rng.sample(voluntariados, min(len(voluntariados), rng.randint(1, 2))):
+                    memberships.append(Membership(user=user, voluntariado=voluntariado.slug))
+                    candidates = events_by_voluntariado.get(voluntariado.pk, [])
+                    for event in rng.sample(candidates, min(len(candidates), rng.randint(0, 3))):
+                        if event.max_participants is None or registered[event.pk] < event.max_participants:
+                            registered[event.pk] += 1
+                            participations.append(Participation(event=event, user=user))
+            Membership.objects.bulk_create(memberships, batch_size=batch_size)
+            Participation.objects.bulk_create(participations, batch_size=batch_size)
+            created['users'] += len(users)
+            created['memberships'] += len(memberships)
+            created['participations'] += len(participations)
+
+        for event in events:
+            event.registered = registered[event.pk]
+        Event.objects.bulk_update(events, ['registered'], batch_size=batch_size)
+        members = {}
+        for slug in Membership.objects.filter(voluntariado__startswith=SYNTHETIC_PREFIX).values_list('voluntariado', flat=True):
+            members[slug] = members.get(slug, 0) + 1
+        for voluntariado in voluntariados:
+            voluntariado.member_count = members.get(voluntariado.slug, 0)
+        Voluntariado.objects.bulk_update(voluntariados, ['member_count'])
+    return created
+
+
+def _page(name, uid=False, **kwargs):
+    def build(rng, dataset):
+        headers = {'X-Firebase-UID': dataset.user_uid(rng.randrange(dataset.users))} if uid else {}
+        return 'GET', reverse(name, kwargs=kwargs or None), None, headers
+    return build
+
+
+def _api(name, payload):
+    def build(rng, dataset):
+        return 'POST', reverse(name), payload(rng, dataset), {'Content-Type': 'application/json'}
+    return build
+
+
+# (nombre en el reporte, peso, petición). Las páginas cacheadas pesan más,
+# como en el tráfico real; las escrituras son inscripciones y uniones.
+SCENARIOS = [
+    ('home', 15, _page('home')),
+    ('reglamento', 3, _page('reglamento')),
+    ('eventos', 5, _page('eventos')),
+    ('nuestros_voluntariados:home', 5, _page('nuestros_voluntariados:home')),
+    ('nuestros_voluntariados:detalle', 7, _page('nuestros_voluntariados:detalle', slug='pumas_verdes')),
+    ('auth:dashboard', 10, _page('auth:dashboard', uid=True)),
+    ('auth:get_user_status', 25, _api('auth:get_user_status', lambda rng, d: {
+        'uid': d.user_uid(rng.randrange(d.users)),
+    })),
+    ('auth:get_achievement_summary', 8, _api('auth:get_achievement_summary', lambda rng, d: {
+        'uid': d.user_uid(rng.randrange(d.users)),
+    })),
+    ('auth:get_all_users', 3, _api('auth:get_all_users', lambda rng, d: {
+        'admin_uid': SYNTHETIC_ADMIN_UID, 'limit': 50, 'include_total': False,
+        'estado': rng.choice((None, 'activo', 'inactivo')),
+    })),
+    ('auth:get_event_participants', 3, _api('auth:get_event_participants', lambda rng, d: {
+        'admin_uid': SYNTHETIC_ADMIN_UID, 'event_id': d.event_id(rng.randrange(d.events)),
+    })),
+    ('auth:register_for_event', 10, _api('auth:register_for_event', lambda rng, d: {
+        'uid': d.user_uid(rng.randrange(d.users)), 'event_id': d.event_id(rng.randrange(d.events)),
+    })),
+    ('auth:join_voluntariado_api', 4, _api('auth:join_voluntariado_api', lambda rng, d: {
+        'uid': d.user_uid(rng.randrange(d.users)), 'code': d.voluntariado_code(rng.randrange(d.voluntariados)),
+    })),
+]
+
+
+def run_load(base_url, dataset, concurrency=16, seconds=None, requests=None, seed=0, scenarios=SCENARIOS):
+    """
+    Lanza concurrency hilos que piden rutas de scenarios al azar según su peso.
+
+    Cada hilo hace requests peticiones (secuencia reproducible con seed) o
+    trabaja durante seconds. Devuelve ({ruta: [latencias]}, {ruta: errores},
+    segundos transcurridos).
+    """
+    if seconds is None and requests is None:
+        raise ValueError('Indica seconds o requests')
+    names = [name for name, _, _ in scenarios]
+    weights = [weight for _, weight, _ in scenarios]
+    builders = dict((name, build) for name, _, build in scenarios)
+    latencies = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(concurrency + 1)
+
+    def client(index):
+        rng = random.Random(f'{seed}-{index}')
+        own_latencies = {name: [] for name in names}
+        own_errors = {name: 0 for name in names}
+        start_barrier.wait()
+        deadline = time.perf_counter() + seconds if seconds is not None else None
+        done = 0
+        while (requests is None or done < requests) and (deadline is None or time.perf_counter() < deadline):
+            name = rng.choices(names, weights)[0]
+            method, path, payload, headers = builders[name](rng, dataset)
+            data = json.dumps(payload).encode() if payload is not None else None
+            request = urllib.request.Request(base_url + path, data=data, headers=headers, method=method)
+            began = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    response.read()
+                own_latencies[name].append(time.perf_counter() - began)
+            except OSError:
+                own_errors[name] += 1
+            done += 1
+        with lock:
+            for name in names:
+                latencies[name].extend(own_latencies[name])
+                errors[name] += own_errors[name]
+
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    start_barrier.wait()
+    began = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return latencies, errors, time.perf_counter() - began
+
+
+def _percentiles(values):
+    if len(values) == 1:
+        return values[0], values[0], values[0]
+    cuts = statistics.quantiles(values, n=100, method='inclusive')
+    return cuts[49], cuts[94], cuts[98]
+
+
+def summarize(latencies, errors, elapsed):
+    """Reporte por ruta y total con peticiones/s y latencias en milisegundos"""
+    routes = {}
+    for name, values in latencies.items():
+        if not values and not errors[name]:
+            continue
+        route = {'requests': len(values), 'errors': errors[name], 'throughput_rps': round(len(values) / elapsed, 2)}
+        if values:
+            p50, p95, p99 = _percentiles(values)
+            route.update(
+                mean_ms=round(statistics.fmean(values) * 1000, 3),
+                p50_ms=round(p50 * 1000, 3),
+                p95_ms=round(p95 * 1000, 3),
+                p99_ms=round(p99 * 1000, 3),
+            )
+        routes[name] = route
+    everything = [value for values in latencies.values() for value in values]
+    total = {
+        'requests': len(everything),
+        'errors': sum(errors.values()),
+        'throughput_rps': round(len(everything) / elapsed, 2),
+    }
+    if everything:
+        p50, p95, p99 = _percentiles(everything)
+        total.update(p50_ms=round(p50 * 1000, 3), p95_ms=round(p95 * 1000, 3), p99_ms=round(p99 * 1000, 3))
+    return {'elapsed_seconds': round(elapsed, 3), 'total': total, 'routes': routes}
+
+
+def manage(env, *args):
+    """Ejecuta manage.py en un proceso aparte con el entorno indicado"""
+    subprocess.run(
+        [sys.executable, 'manage.py', *args], cwd=settings.BASE_DIR, env=env, check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def start_server(env, port, timeout=30):
+    """
+    Arranca gunicorn con gunicorn.conf.py y espera a que responda la página
+    de inicio. Devuelve el proceso, o None si no llegó a responder.
+    """
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py'],
+        cwd=settings.BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and server.poll() is None:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            # Una petición de calentamiento carga la aplicación en el worker
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/', timeout=30) as response:
+                response.read()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    if server.poll() is None:
+        server.terminate()
+        server.wait(timeout=30)
+    return None
@@ -0,0 +1,79 @@
+import json
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from auth_firebase import api
+from auth_firebase.views import USER_LIST_FIELDS, get_all_users
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara el tiempo de codificar y decodificar respuestas grandes (la lista "
+        "de usuarios de get_all_users) con json de la biblioteca estándar, como lo "
+        "hacía JsonResponse, y con auth_firebase.api (orjson si está instalado), "
+        "además del costo de validar el cuerpo de una petición con su Schema."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=5000, help='Usuarios en la respuesta')
+        parser.add_argument('--repeat', type=int, default=30, help='Repeticiones por medición')
+
+    def handle(self, *args, **options):
+        payload = self.user_list(options['users'])
+        repeat = options['repeat']
+        stdlib_body = json.dumps(payload, cls=DjangoJSONEncoder).encode()
+        api_body = api.dumps(payload)
+
+        backend = 'orjson' if api.orjson is not None else 'json (orjson no está instalado)'
+        self.stdout.write(f"{options['users']} usuarios, {len(stdlib_body) / 1024:.0f} KiB; api usa {backend}")
+        self.stdout.write(f"{'operación':28} {'json ms':>9} {'api ms':>9} {'x':>6}")
+        rows = [
+            ('codificar', lambda: json.dumps(payload, cls=DjangoJSONEncoder).encode(), lambda: api.dumps(payload)),
+            ('decodificar', lambda: json.loads(stdlib_body), lambda: api.loads(api_body)),
+        ]
+        for name, stdlib, fast in rows:
+            stdlib_ms = self.measure(stdlib, repeat)
+            fast_ms = self.measure(fast, repeat)
+            self.stdout.write(f'{name:28} {stdlib_ms:>9.3f} {fast_ms:>9.3f} {stdlib_ms / fast_ms:>6.1f}')
+
+        schema = get_all_users.schema
+        body = {
+            'admin_uid': 'admin-uid', 'limit': 50, 'fields': list(USER_LIST_FIELDS),
+            'estado': 'activo', 'fecha_desde': '2025-01-01', 'include_total': False,
+        }
+        validate_ms = self.measure(lambda: schema.validate(body), repeat * 100)
+        self.stdout.write(f"{'validar cuerpo get_all_users':28} {'':>9} {validate_ms * 1000:>8.1f}µs")
+
+    def measure(self, function, repeat):
+        function()
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
+
+    def user_list(self, count):
+        """Respuesta de get_all_users con count usuarios y todos sus campos"""
+        now = timezone.now()
+        users = [
+            {
+                'id': i,
+                'firebase_uid': f'uid-{i:08d}-aBcDeFgHiJkLmNoPqRsT',
+                'email': f'estudiante{i}@unah.hn',
+                'nombre': 'José María',
+                'apellido': 'Núñez Peña',
+                'estado': ('activo', 'inactivo', 'suspendido')[i % 3],
+                'rol': 'usuario',
+                'fecha_registro': (now - timedelta(minutes=i)).isoformat(),
+                'fecha_ultima_actividad': now - timedelta(seconds=i),
+                'voluntariados': ['pumas_verdes', 'sonriendo_juntos'][: i % 3],
+            }
+            for i in range(count)
+        ]
+        return {'success': True, 'users': users, 'next_cursor': 'MjAyNS0wMS0wMVQwMDowMDowMCswMDowMHwxMjM=', 'has_more': True}
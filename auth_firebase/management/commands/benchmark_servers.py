@@ -0,0 +1,126 @@
+import json
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+import urllib.request
+
+from django.core.management.base import BaseCommand, CommandError
+
+from auth_firebase.loadtest import manage, start_server
+
+SEED_SCRIPT = """
+from auth_firebase.models import UserStatus
+UserStatus.objects.create(firebase_uid='bench-admin', email='admin@unah.hn', estado='activo', rol='admin')
+UserStatus.objects.bulk_create(
+    [UserStatus(firebase_uid=f'bench-{i}', email=f'bench{i}@unah.hn', estado='activo') for i in range({users})],
+    batch_size=2000,
+)
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Levanta gunicorn en modo WSGI y en modo ASGI (uvicorn) sobre una base SQLite "
+        "temporal y compara peticiones por segundo y latencias p50/p99 de las APIs "
+        "de auth_firebase con la misma carga concurrente."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--modes', nargs='+', default=['wsgi', 'asgi'], choices=['wsgi', 'asgi'])
+        parser.add_argument('--workers', type=int, default=2, help='Workers de gunicorn')
+        parser.add_argument('--concurrency', type=int, default=32, help='Clientes simultáneos')
+        parser.add_argument('--seconds', type=float, default=10.0, help='Duración de cada modo')
+        parser.add_argument('--users', type=int, default=2000, help='Usuarios sembrados')
+        parser.add_argument('--port', type=int, default=8765)
+
+    def handle(self, *args, **options):
+        if 'asgi' in options['modes']:
+            try:
+                import uvicorn_worker  # noqa: F401
+            except ImportError:
+                raise CommandError('El modo asgi requiere uvicorn-worker (ver requirements.txt)')
+
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(
+                os.environ,
+                DATABASE_URL=f'sqlite:///{os.path.join(directory, "bench.sqlite3")}',
+                DEBUG='False',
+                WEB_CONCURRENCY=str(options['workers']),
+                PORT=str(options['port']),
+            )
+            manage(env, 'migrate', '--noinput', '-v', '0')
+            manage(env, 'shell', '-c', SEED_SCRIPT.replace('{users}', str(options['users'])))
+
+            for mode in options['modes']:
+                server = start_server(dict(env, SERVER_MODE=mode), options['port'])
+                if server is None:
+                    raise CommandError('gunicorn no respondió a tiempo')
+                try:
+                    results = self.load(options)
+                finally:
+                    server.terminate()
+                    server.wait(timeout=30)
+                self.report(mode, results, options['seconds'])
+
+    def request(self, port, route, payload):
+        path = {
+            'get_user_status': '/auth/api/get-user-status/',
+            'get_all_users': '/auth/api/get-all-users/',
+        }[route]
+        request = urllib.request.Request(
+            f'http://127.0.0.1:{port}{path}',
+            data=json.dumps(payload).encode(),
+            headers={'Content-Type': 'application/json'},
+        )
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.read()
+
+    def load(self, options):
+        deadline = time.perf_counter() + options['seconds']
+        results = {'get_user_status': [], 'get_all_users': [], 'errors': 0}
+        lock = threading.Lock()
+
+        def client():
+            latencies = {'get_user_status': [], 'get_all_users': []}
+            errors = 0
+            while time.perf_counter() < deadline:
+                if random.random() < 0.8:
+                    route, payload = 'get_user_status', {'uid': f'bench-{random.randrange(options["users"])}'}
+                else:
+                    route, payload = 'get_all_users', {'admin_uid': 'bench-admin', 'limit': 50, 'include_total': False}
+                start = time.perf_counter()
+                try:
+                    self.request(options['port'], route, payload)
+                    latencies[route].append(time.perf_counter() - start)
+                except OSError:
+                    errors += 1
+            with lock:
+                for route, values in latencies.items():
+                    results[route].extend(values)
+                results['errors'] += errors
+
+        threads = [threading.Thread(target=client) for _ in range(options['concurrency'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def report(self, mode, results, seconds):
+        self.stdout.write(self.style.MIGRATE_HEADING(mode.upper()))
+        total = 0
+        for route in ('get_user_status', 'get_all_users'):
+            latencies = sorted(results[route])
+            total += len(latencies)
+            if not latencies:
+                self.stdout.write(f'  {route}: sin respuestas')
+                continue
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            self.stdout.write(
+                f'  {route:16} {len(latencies) / seconds:8.1f} req/s  '
+                f'p50 {statistics.median(latencies) * 1000:7.2f} ms  p99 {p99 * 1000:7.2f} ms'
+            )
+        self.stdout.write(f'  total {total / seconds:.1f} req/s, errores: {results["errors"]}')
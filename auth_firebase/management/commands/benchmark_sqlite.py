@@ -0,0 +1,134 @@
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Configuración por defecto de Python/Django: journal DELETE, FULL y 5 s de espera
+STOCK_PRAGMAS = {
+    'journal_mode': 'DELETE',
+    'busy_timeout': 5000,
+    'synchronous': 'FULL',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara lecturas y escrituras concurrentes sobre un archivo SQLite con la "
+        "configuración por defecto y con los PRAGMAs de SQLITE_PRAGMAS. Cada hilo "
+        "abre su propia conexión, como los workers de gunicorn."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=20000, help='Filas de la tabla de prueba')
+        parser.add_argument('--readers', type=int, default=8, help='Hilos lectores')
+        parser.add_argument('--writers', type=int, default=4, help='Hilos escritores')
+        parser.add_argument('--seconds', type=float, default=5.0, help='Duración de cada perfil')
+
+    def handle(self, *args, **options):
+        profiles = [('por defecto', STOCK_PRAGMAS), ('ajustado', settings.SQLITE_PRAGMAS)]
+        with tempfile.TemporaryDirectory() as directory:
+            for label, pragmas in profiles:
+                path = os.path.join(directory, f'{label.replace(" ", "_")}.sqlite3')
+                self.seed(path, options['rows'])
+                stats = self.run_profile(path, pragmas, options)
+                self.report(label, stats, options['seconds'])
+
+    def connect(self, path, pragmas):
+        # isolation_level=None: las transacciones se abren a mano con BEGIN IMMEDIATE
+        conn = sqlite3.connect(path, timeout=pragmas.get('busy_timeout', 5000) / 1000, isolation_level=None)
+        for name, value in pragmas.items():
+            conn.execute(f'PRAGMA {name}={value}')
+        return conn
+
+    def seed(self, path, rows):
+        conn = sqlite3.connect(path)
+        conn.execute(
+            'CREATE TABLE usuarios (id INTEGER PRIMARY KEY, uid TEXT UNIQUE, '
+            'estado TEXT, actividad REAL)'
+        )
+        conn.execute('CREATE INDEX usuarios_estado ON usuarios (estado, actividad)')
+        conn.executemany(
+            'INSERT INTO usuarios (uid, estado, actividad) VALUES (?, ?, ?)',
+            ((f'uid-{i}', random.choice(['activo', 'inactivo']), time.time()) for i in range(rows)),
+        )
+        conn.commit()
+        conn.close()
+
+    def run_profile(self, path, pragmas, options):
+        rows = options['rows']
+        deadline = time.perf_counter() + options['seconds']
+        stats = {'read': [], 'write': [], 'errors': 0}
+        lock = threading.Lock()
+        barrier = threading.Barrier(options['readers'] + options['writers'])
+
+        def reader():
+            conn = self.connect(path, pragmas)
+            latencies, errors = [], 0
+            barrier.wait()
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    conn.execute('SELECT estado FROM usuarios WHERE uid = ?', (f'uid-{random.randrange(rows)}',)).fetchone()
+                    conn.execute(
+                        "SELECT id, uid FROM usuarios WHERE estado = 'activo' ORDER BY actividad DESC LIMIT 50"
+                    ).fetchall()
+                    latencies.append(time.perf_counter() - start)
+                except sqlite3.OperationalError:
+                    errors += 1
+            conn.close()
+            with lock:
+                stats['read'].extend(latencies)
+                stats['errors'] += errors
+
+        def writer():
+            conn = self.connect(path, pragmas)
+            latencies, errors = [], 0
+            barrier.wait()
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    conn.execute('BEGIN IMMEDIATE')
+                    conn.execute(
+                        'UPDATE usuarios SET estado = ?, actividad = ? WHERE uid = ?',
+                        (random.choice(['activo', 'inactivo']), time.time(), f'uid-{random.randrange(rows)}'),
+                    )
+                    conn.execute('COMMIT')
+                    latencies.append(time.perf_counter() - start)
+                except sqlite3.OperationalError:
+                    errors += 1
+                    if conn.in_transaction:
+                        conn.execute('ROLLBACK')
+            conn.close()
+            with lock:
+                stats['write'].extend(latencies)
+                stats['errors'] += errors
+
+        threads = [threading.Thread(target=reader) for _ in range(options['readers'])]
+        threads += [threading.Thread(target=writer) for _ in range(options['writers'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return stats
+
+    def report(self, label, stats, seconds):
+        self.stdout.write(self.style.MIGRATE_HEADING(label))
+        for kind in ('read', 'write'):
+            latencies = sorted(stats[kind])
+            if not latencies:
+                self.stdout.write(f'  {kind}: sin operaciones completadas')
+                continue
+            p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0]
+            self.stdout.write(
+                f'  {kind:5}: {len(latencies) / seconds:9.0f} ops/s  '
+                f'p50 {statistics.median(latencies) * 1000:7.2f} ms  '
+                f'p95 {p95 * 1000:7.2f} ms  max {latencies[-1] * 1000:7.2f} ms'
+            )
+        style = self.style.WARNING if stats['errors'] else self.style.SUCCESS
+        self.stdout.write(style(f'  errores "database is locked": {stats["errors"]}'))
@@ -0,0 +1,116 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from auth_firebase.models import UserStatus
+
+
+class _Rollback(Exception):
+    """Se lanza al final para deshacer los usuarios sembrados"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Siembra usuarios de prueba dentro de una transacción, muestra el plan de "
+        "consulta y el tiempo de las consultas frecuentes sobre UserStatus y "
+        "deshace todo al terminar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50000, help='Usuarios a sembrar')
+        parser.add_argument('--repeat', type=int, default=20, help='Repeticiones por consulta')
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.seed(options['users'], options['batch_size'])
+                full_scans = self.run_queries(options['repeat'])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        if full_scans:
+            self.stdout.write(self.style.WARNING(
+                f"Consultas con recorrido completo u ordenamiento temporal: {', '.join(full_scans)}"
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS('Todas las consultas usan índices'))
+
+    def seed(self, count, batch_size):
+        start = time.perf_counter()
+        now = timezone.now()
+        estados = [choice for choice, _ in UserStatus.STATUS_CHOICES]
+        for offset in range(0, count, batch_size):
+            UserStatus.objects.bulk_create([
+                UserStatus(
+                    firebase_uid=f'bench-{i}',
+                    email=f'bench{i}@unah.hn',
+                    estado=random.choice(estados),
+                    rol='admin' if i % 100 == 0 else 'usuario',
+                    fecha_registro=now - timedelta(minutes=random.randint(0, 525600)),
+                )
+                for i in range(offset, min(offset + batch_size, count))
+            ])
+        self.stdout.write(f'{count} usuarios sembrados en {time.perf_counter() - start:.2f}s\n')
+
+    def hot_queries(self):
+        """Consultas de get_all_users, export_users, el admin y el middleware"""
+        ordered = UserStatus.objects.order_by('-fecha_registro', '-id')
+        cursor = ordered.values('fecha_registro', 'id')[1000]
+        since = timezone.now() - timedelta(days=30)
+        return {
+            'primera pagina': ordered.values('id', 'email', 'estado')[:51],
+            'pagina por cursor': ordered.filter(
+                fecha_registro__lte=cursor['fecha_registro']
+            ).exclude(
+                fecha_registro=cursor['fecha_registro'], id__gte=cursor['id']
+            ).values('id', 'email')[:51],
+            'filtro por estado': ordered.filter(estado='inactivo').values('id')[:51],
+            'filtro por rol': ordered.filter(rol='admin').values('id')[:51],
+            'rango de fechas': ordered.filter(fecha_registro__gte=since).values('id')[:51],
+            'conteo por estado': UserStatus.objects.filter(estado='activo'),
+            'admin changelist': UserStatus.objects.filter(estado='inactivo', rol='usuario')
+                .order_by('-fecha_registro', '-pk')[:100],
+            'middleware por uid': UserStatus.objects.filter(firebase_uid='bench-4242'),
+        }
+
+    def run_queries(self, repeat):
+        full_scans = []
+        for name, queryset in self.hot_queries().items():
+            plan = queryset.explain()
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                # all() evita reutilizar el resultado cacheado del QuerySet
+                if name.startswith('conteo'):
+                    queryset.all().count()
+                else:
+                    list(queryset.all())
+                timings.append((time.perf_counter() - start) * 1000)
+
+            if self.is_full_scan(plan):
+                full_scans.append(name)
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(
+                f'  mediana {statistics.median(timings):.3f} ms, '
+                f'máximo {max(timings):.3f} ms'
+            )
+            for line in plan.splitlines():
+                self.stdout.write(f'  {line}')
+        return full_scans
+
+    def is_full_scan(self, plan):
+        if connection.vendor == 'sqlite':
+            for line in plan.splitlines():
+                if 'TEMP B-TREE' in line:
+                    return True
+                if 'SCAN' in line and 'INDEX' not in line:
+                    return True
+            return False
+        return 'Seq Scan' in plan or 'Sort' in plan
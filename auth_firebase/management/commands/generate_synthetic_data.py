@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from auth_firebase.loadtest import SYNTHETIC_PREFIX, Dataset, clear, generate
+from auth_firebase.models import UserStatus
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera voluntariados, usuarios, membresías, eventos e inscripciones "
+        "sintéticos con bulk_create por lotes. Con la misma semilla los datos "
+        "son idénticos, para comparar pruebas de carga entre commits."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000, help='Usuarios a generar')
+        parser.add_argument('--events', type=int, default=200, help='Eventos a generar')
+        parser.add_argument('--voluntariados', type=int, default=6, help='Voluntariados a generar')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--seed', type=int, default=0, help='Semilla de los datos aleatorios')
+        parser.add_argument('--clear', action='store_true', help='Borra antes los datos sintéticos existentes')
+
+    def handle(self, *args, **options):
+        if min(options['users'], options['events'], options['voluntariados'], options['batch_size']) < 1:
+            raise CommandError('--users, --events, --voluntariados y --batch-size deben ser mayores que 0')
+        if options['clear']:
+            clear()
+        elif UserStatus.objects.filter(firebase_uid__startswith=SYNTHETIC_PREFIX).exists():
+            raise CommandError('Ya hay datos sintéticos; usa --clear para regenerarlos')
+
+        dataset = Dataset(
+            users=options['users'], events=options['events'], voluntariados=options['voluntariados'],
+        )
+        start = time.perf_counter()
+        created = generate(dataset, batch_size=options['batch_size'], seed=options['seed'])
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"{created['users']} usuarios, {created['memberships']} membresías, "
+            f"{created['events']} eventos y {created['participations']} inscripciones "
+            f"en {created['voluntariados']} voluntariados generados en {elapsed:.2f}s"
+        ))
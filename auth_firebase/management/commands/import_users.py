@@ -0,0 +1,47 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from auth_firebase.onboarding import IMPORT_BATCH_SIZE, import_users
+
+
+class Command(BaseCommand):
+    help = (
+        "Da de alta usuarios desde un CSV (firebase_uid, email y opcionalmente "
+        "nombre, apellido, estado, rol, voluntariados). Lee el archivo fila por "
+        "fila, inserta por lotes y omite los UID o emails que ya existen."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Archivo CSV, o - para leer de la entrada estándar')
+        parser.add_argument('--voluntariado', help='Slug del voluntariado al que se une a todos los importados')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE, help='Filas por inserción')
+        parser.add_argument('--encoding', default='utf-8-sig')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size debe ser mayor que cero')
+        try:
+            if options['path'] == '-':
+                sys.stdin.reconfigure(encoding=options['encoding'], newline='')
+                result = self.run(sys.stdin, options)
+            else:
+                with open(options['path'], encoding=options['encoding'], newline='') as source:
+                    result = self.run(source, options)
+        except OSError as e:
+            raise CommandError(f'No se pudo leer el archivo: {e}')
+        except (UnicodeDecodeError, ValueError) as e:
+            raise CommandError(str(e))
+
+        for error in result.errors:
+            self.stdout.write(self.style.WARNING(f"  línea {error['line']}: {'; '.join(error['errors'])}"))
+        hidden = result.invalid + result.over_capacity - len(result.errors)
+        if hidden > 0:
+            self.stdout.write(self.style.WARNING(f'  ... y {hidden} errores más'))
+        message = f'{result.created} usuarios creados, {result.skipped} omitidos y {result.invalid} filas no válidas'
+        if result.over_capacity:
+            message += f'; {result.over_capacity} membresías sin cupo'
+        self.stdout.write(self.style.SUCCESS(message))
+
+    def run(self, source, options):
+        return import_users(source, voluntariado=options['voluntariado'], batch_size=options['batch_size'])
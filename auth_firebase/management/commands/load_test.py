@@ -0,0 +1,116 @@
+import json
+import os
+import subprocess
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from auth_firebase.loadtest import SCENARIOS, Dataset, manage, run_load, start_server, summarize
+
+
+class Command(BaseCommand):
+    help = (
+        "Reproduce una mezcla de páginas y APIs con clientes concurrentes y guarda "
+        "peticiones por segundo y latencias p50/p95/p99 por ruta en un archivo JSON. "
+        "Sin --url levanta gunicorn (WSGI o ASGI) sobre una base SQLite temporal "
+        "con datos de generate_synthetic_data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help='Servidor ya levantado con los datos sintéticos, p. ej. http://127.0.0.1:8000')
+        parser.add_argument('--mode', default='wsgi', choices=['wsgi', 'asgi'], help='Modo de gunicorn sin --url')
+        parser.add_argument('--workers', type=int, default=2, help='Workers de gunicorn sin --url')
+        parser.add_argument('--port', type=int, default=8766)
+        parser.add_argument('--users', type=int, default=10000, help='Usuarios de los datos sintéticos')
+        parser.add_argument('--events', type=int, default=200, help='Eventos de los datos sintéticos')
+        parser.add_argument('--voluntariados', type=int, default=6, help='Voluntariados de los datos sintéticos')
+        parser.add_argument('--concurrency', type=int, default=16, help='Clientes simultáneos')
+        parser.add_argument('--seconds', type=float, help='Duración de la prueba')
+        parser.add_argument('--requests', type=int, default=200, help='Peticiones por cliente si no se indica --seconds')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', default='loadtest.json', help='Archivo JSON del reporte')
+
+    def handle(self, *args, **options):
+        dataset = Dataset(
+            users=options['users'], events=options['events'], voluntariados=options['voluntariados'],
+        )
+        if options['url']:
+            report = self.run(options['url'].rstrip('/'), dataset, options)
+        else:
+            report = self.run_with_server(dataset, options)
+
+        report['config'] = {
+            key: options[key]
+            for key in ('url', 'mode', 'workers', 'users', 'events', 'voluntariados',
+                        'concurrency', 'seconds', 'requests', 'seed')
+        }
+        report['config']['mix'] = {name: weight for name, weight, _ in SCENARIOS}
+        report['commit'] = self.current_commit()
+        with open(options['output'], 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+            output.write('\n')
+
+        total = report['total']
+        for name, route in sorted(report['routes'].items()):
+            self.stdout.write(
+                f"  {name:34} {route['throughput_rps']:8.1f} req/s  p50 {route.get('p50_ms', 0):7.2f} ms  "
+                f"p95 {route.get('p95_ms', 0):7.2f} ms  p99 {route.get('p99_ms', 0):7.2f} ms  errores {route['errors']}"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Total {total['throughput_rps']:.1f} req/s, {total['requests']} peticiones, "
+            f"{total['errors']} errores; reporte en {options['output']}"
+        ))
+
+    def run(self, base_url, dataset, options):
+        latencies, errors, elapsed = run_load(
+            base_url,
+            dataset,
+            concurrency=options['concurrency'],
+            seconds=options['seconds'],
+            requests=None if options['seconds'] else options['requests'],
+            seed=options['seed'],
+        )
+        return summarize(latencies, errors, elapsed)
+
+    def run_with_server(self, dataset, options):
+        if options['mode'] == 'asgi':
+            try:
+                import uvicorn_worker  # noqa: F401
+            except ImportError:
+                raise CommandError('El modo asgi requiere uvicorn-worker (ver requirements.txt)')
+
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(
+                os.environ,
+                DATABASE_URL=f'sqlite:///{os.path.join(directory, "loadtest.sqlite3")}',
+                DEBUG='False',
+                SERVER_MODE=options['mode'],
+                WEB_CONCURRENCY=str(options['workers']),
+                PORT=str(options['port']),
+            )
+            manage(env, 'migrate', '--noinput', '-v', '0')
+            manage(
+                env, 'generate_synthetic_data',
+                '--users', str(dataset.users),
+                '--events', str(dataset.events),
+                '--voluntariados', str(dataset.voluntariados),
+                '--seed', str(options['seed']),
+            )
+            server = start_server(env, options['port'])
+            if server is None:
+                raise CommandError('gunicorn no respondió a tiempo')
+            try:
+                return self.run(f"http://127.0.0.1:{options['port']}", dataset, options)
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+
+    def current_commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
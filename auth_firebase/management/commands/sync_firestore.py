@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from auth_firebase.firestore_sync import (
+    COLLECTIONS,
+    SYNC_BATCH_SIZE,
+    SYNCS,
+    FirestoreSource,
+    FixtureSource,
+    sync_collection,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Copia las colecciones de Firestore (users, voluntariados, eventos, logros, "
+        "user_achievements) a la base de Django por páginas. Por defecto solo lee "
+        "lo que cambió desde la última corrida y retoma una corrida interrumpida "
+        "desde su último documento. Con FIRESTORE_EMULATOR_HOST usa el emulador."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'collections', nargs='*',
+            help='Colecciones a sincronizar (por defecto todas, en orden de dependencia)',
+        )
+        parser.add_argument('--batch-size', type=int, default=SYNC_BATCH_SIZE, help='Documentos por página')
+        parser.add_argument('--full', action='store_true', help='Releer todos los documentos')
+        parser.add_argument('--restart', action='store_true', help='Descartar una corrida interrumpida')
+        parser.add_argument('--max-batches', type=int, help='Detenerse después de N páginas por colección')
+        parser.add_argument('--fixtures', help='Leer documentos grabados de un archivo JSON en vez de Firestore')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size debe ser mayor que cero')
+        unknown = set(options['collections']) - set(COLLECTIONS)
+        if unknown:
+            raise CommandError(f"Colecciones desconocidas: {', '.join(sorted(unknown))}")
+        if options['fixtures']:
+            source = FixtureSource.from_file(options['fixtures'])
+        else:
+            source = FirestoreSource()
+
+        selected = set(options['collections'])
+        for sync in SYNCS:
+            if selected and sync.collection not in selected:
+                continue
+            read = sync_collection(
+                source,
+                sync,
+                batch_size=options['batch_size'],
+                full=options['full'],
+                restart=options['restart'],
+                max_batches=options['max_batches'],
+            )
+            self.stdout.write(f'{sync.collection}: {read} documentos')
+        self.stdout.write(self.style.SUCCESS('Sincronización terminada'))
@@ -1,57 +1,87 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.http import JsonResponse
-from .models import UserStatus
+from .cache import ACCESS_DENIED, user_access_cache
+from .routes import ACTIVE_USER, PROTECTED, build_route_trie
 
 class FirebaseAuthMiddleware:
     """
-    Middleware para manejar la autenticación de Firebase y verificar estados de usuario
+    Middleware para manejar la autenticación de Firebase y verificar estados de usuario.
+
+    Las rutas protegidas y las que requieren usuario activo se declaran en
+    FIREBASE_AUTH_PROTECTED_ROUTES y FIREBASE_AUTH_ACTIVE_USER_ROUTES y se
+    compilan una vez al crear el middleware (ver auth_firebase.routes).
+    Funciona tanto bajo WSGI como bajo ASGI.
     """
+
+    sync_capable = True
+    async_capable = True
     
     def __init__(self, get_response):
         self.get_response = get_response
+        self.routes = build_route_trie()
+        self.login_url = reverse('auth:login')
+        self.inactive_user_url = reverse('auth:inactive_user')
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        # Rutas que requieren autenticación
-        protected_paths = [
-            '/auth/dashboard/',
-            '/auth/admin-panel/',
-            '/voluntariados/',
-            # Agregar más rutas protegidas aquí
-        ]
-        
-        # Rutas que requieren estado activo
-        active_user_paths = [
-            '/voluntariados/',
-            '/auth/join-voluntariado/',
-            '/auth/volunteer-details/',
-        ]
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        route_flags = self.routes.match(request.path)
+        if not route_flags:
+            # Rutas públicas y estáticas no requieren ninguna verificación
+            return self.get_response(request)
         
         # Si la ruta está protegida, verificar autenticación
-        if any(request.path.startswith(path) for path in protected_paths):
+        if route_flags & PROTECTED:
             # En una implementación real, aquí verificarías el token de Firebase
             # Por ahora, solo redirigimos si no hay sesión Django (opcional)
-            if not request.user.is_authenticated and not request.path.startswith('/auth/login'):
-                # Para API calls, retornar JSON
-                if request.path.startswith('/api/'):
-                    return JsonResponse({'error': 'Authentication required'}, status=401)
-                # Para páginas web, redirigir al login
-                return redirect(reverse('auth:login'))
+            if not request.user.is_authenticated:
+                response = self.login_required(request)
+                if response is not None:
+                    return response
         
         # Verificar si la ruta requiere usuario activo
-        if any(request.path.startswith(path) for path in active_user_paths):
+        if route_flags & ACTIVE_USER:
             # Aquí deberías verificar el estado del usuario desde Firebase
             # Por ahora, solo verificamos si hay un header personalizado
             user_uid = request.META.get('HTTP_X_FIREBASE_UID')
-            if user_uid:
-                try:
-                    user_status = UserStatus.objects.get(firebase_uid=user_uid)
-                    if not user_status.can_access_voluntariados():
-                        # Usuario inactivo, redirigir a página de estado
-                        return redirect(reverse('auth:inactive_user'))
-                except UserStatus.DoesNotExist:
-                    # Usuario no registrado en el sistema
-                    pass
+            # La decisión se cachea por UID; los usuarios no registrados pasan
+            if user_uid and user_access_cache.get_access(user_uid) == ACCESS_DENIED:
+                # Usuario inactivo, redirigir a página de estado
+                return redirect(self.inactive_user_url)
 
         response = self.get_response(request)
         return response
+
+    async def __acall__(self, request):
+        """Las mismas verificaciones bajo ASGI, sin bloquear el event loop"""
+        route_flags = self.routes.match(request.path)
+        if not route_flags:
+            return await self.get_response(request)
+        
+        if route_flags & PROTECTED:
+            user = await request.auser()
+            if not user.is_authenticated:
+                response = self.login_required(request)
+                if response is not None:
+                    return response
+        
+        if route_flags & ACTIVE_USER:
+            user_uid = request.META.get('HTTP_X_FIREBASE_UID')
+            if user_uid and await sync_to_async(user_access_cache.get_access)(user_uid) == ACCESS_DENIED:
+                return redirect(self.inactive_user_url)
+
+        return await self.get_response(request)
+
+    def login_required(self, request):
+        """Respuesta para una ruta protegida sin sesión, o None en la página de login"""
+        if request.path.startswith(self.login_url):
+            return None
+        # Para API calls, retornar JSON
+        if request.path.startswith('/api/'):
+            return JsonResponse({'error': 'Authentication required'}, status=401)
+        # Para páginas web, redirigir al login
+        return redirect(self.login_url)
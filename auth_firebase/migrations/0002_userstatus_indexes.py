@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth_firebase", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="userstatus",
+            index=models.Index(
+                fields=["fecha_registro", "id"], name="userstatus_registro_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userstatus",
+            index=models.Index(
+                fields=["estado", "fecha_registro", "id"], name="userstatus_estado_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userstatus",
+            index=models.Index(
+                fields=["rol", "fecha_registro", "id"], name="userstatus_rol_idx"
+            ),
+        ),
+    ]
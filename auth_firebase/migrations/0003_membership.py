@@ -0,0 +1,153 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:36
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+
+def _parse_joined_at(value, default):
+    if isinstance(value, str):
+        joined_at = parse_datetime(value)
+        if joined_at is not None:
+            if timezone.is_naive(joined_at):
+                joined_at = timezone.make_aware(joined_at)
+            return joined_at
+    return default
+
+
+def _iter_memberships(voluntariados):
+    """
+    Admite los formatos guardados en el JSON: lista de ids, lista de objetos
+    con 'id', o el formato de Firestore {id: {joinedAt, ...}}.
+    """
+    if isinstance(voluntariados, dict):
+        items = voluntariados.items()
+    elif isinstance(voluntariados, list):
+        items = []
+        for item in voluntariados:
+            if isinstance(item, dict):
+                items.append((item.get("id") or item.get("voluntariadoId"), item))
+            else:
+                items.append((item, {}))
+    else:
+        items = []
+    for voluntariado, extra in items:
+        if voluntariado:
+            yield str(voluntariado), extra if isinstance(extra, dict) else {}
+
+
+def copy_voluntariados_to_memberships(apps, schema_editor):
+    UserStatus = apps.get_model("auth_firebase", "UserStatus")
+    Membership = apps.get_model("auth_firebase", "Membership")
+    batch = []
+    for user in UserStatus.objects.only("id", "fecha_registro", "voluntariados").iterator(
+        chunk_size=1000
+    ):
+        for voluntariado, extra in _iter_memberships(user.voluntariados):
+            role = extra.get("role")
+            batch.append(
+                Membership(
+                    user_id=user.id,
+                    voluntariado=voluntariado[:128],
+                    role=role if role in ("miembro", "coordinador") else "miembro",
+                    joined_at=_parse_joined_at(
+                        extra.get("joinedAt") or extra.get("joined_at"),
+                        user.fecha_registro,
+                    ),
+                )
+            )
+        if len(batch) >= 1000:
+            Membership.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        Membership.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def copy_memberships_to_voluntariados(apps, schema_editor):
+    UserStatus = apps.get_model("auth_firebase", "UserStatus")
+    Membership = apps.get_model("auth_firebase", "Membership")
+    grouped = {}
+    for user_id, voluntariado in Membership.objects.order_by("joined_at").values_list(
+        "user_id", "voluntariado"
+    ):
+        grouped.setdefault(user_id, []).append(voluntariado)
+    for user_id, voluntariados in grouped.items():
+        UserStatus.objects.filter(id=user_id).update(voluntariados=voluntariados)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth_firebase", "0002_userstatus_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Membership",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "voluntariado",
+                    models.CharField(max_length=128, verbose_name="Voluntariado"),
+                ),
+                (
+                    "role",
+                    models.CharField(
+                        choices=[("miembro", "Miembro"), ("coordinador", "Coordinador")],
+                        default="miembro",
+                        max_length=20,
+                        verbose_name="Rol",
+                    ),
+                ),
+                (
+                    "joined_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="Fecha de Ingreso",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="memberships",
+                        to="auth_firebase.userstatus",
+                        verbose_name="Usuario",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Membresía",
+                "verbose_name_plural": "Membresías",
+                "ordering": ["joined_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["voluntariado", "joined_at"],
+                        name="membership_voluntariado_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "voluntariado"), name="unique_membership"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(
+            copy_voluntariados_to_memberships, copy_memberships_to_voluntariados
+        ),
+        migrations.RemoveField(
+            model_name="userstatus",
+            name="voluntariados",
+        ),
+    ]
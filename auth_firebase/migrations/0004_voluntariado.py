@@ -0,0 +1,59 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth_firebase", "0003_membership"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Voluntariado",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "slug",
+                    models.SlugField(
+                        max_length=128, unique=True, verbose_name="Identificador"
+                    ),
+                ),
+                ("name", models.CharField(max_length=150, verbose_name="Nombre")),
+                (
+                    "code",
+                    models.CharField(
+                        max_length=20, unique=True, verbose_name="Código de Ingreso"
+                    ),
+                ),
+                ("active", models.BooleanField(default=True, verbose_name="Activo")),
+                (
+                    "member_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Miembros"),
+                ),
+                (
+                    "max_members",
+                    models.PositiveIntegerField(
+                        blank=True,
+                        help_text="Vacío para no limitar el número de miembros",
+                        null=True,
+                        verbose_name="Límite de Miembros",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Voluntariado",
+                "verbose_name_plural": "Voluntariados",
+                "ordering": ["name"],
+            },
+        ),
+    ]
@@ -0,0 +1,182 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:42
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth_firebase", "0004_voluntariado"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Event",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "firestore_id",
+                    models.CharField(
+                        blank=True,
+                        max_length=128,
+                        null=True,
+                        unique=True,
+                        verbose_name="ID en Firestore",
+                    ),
+                ),
+                ("title", models.CharField(max_length=200, verbose_name="Título")),
+                (
+                    "description",
+                    models.TextField(blank=True, verbose_name="Descripción"),
+                ),
+                ("event_date", models.DateTimeField(verbose_name="Fecha del Evento")),
+                (
+                    "duration",
+                    models.PositiveSmallIntegerField(
+                        default=2, verbose_name="Duración (horas)"
+                    ),
+                ),
+                (
+                    "max_participants",
+                    models.PositiveIntegerField(
+                        blank=True,
+                        help_text="Vacío para no limitar el número de participantes",
+                        null=True,
+                        verbose_name="Cupo",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("abierto", "Abierto"),
+                            ("cerrado", "Cerrado"),
+                            ("cancelado", "Cancelado"),
+                            ("finalizado", "Finalizado"),
+                        ],
+                        default="abierto",
+                        max_length=20,
+                        verbose_name="Estado",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="Fecha de Creación",
+                    ),
+                ),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="eventos_creados",
+                        to="auth_firebase.userstatus",
+                        verbose_name="Creado por",
+                    ),
+                ),
+                (
+                    "voluntariado",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="eventos",
+                        to="auth_firebase.voluntariado",
+                        verbose_name="Voluntariado",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Evento",
+                "verbose_name_plural": "Eventos",
+                "ordering": ["event_date"],
+            },
+        ),
+        migrations.CreateModel(
+            name="Participation",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "registered_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="Fecha de Inscripción",
+                    ),
+                ),
+                (
+                    "attended",
+                    models.BooleanField(default=False, verbose_name="Asistió"),
+                ),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="participations",
+                        to="auth_firebase.event",
+                        verbose_name="Evento",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="participations",
+                        to="auth_firebase.userstatus",
+                        verbose_name="Usuario",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Participación",
+                "verbose_name_plural": "Participaciones",
+                "ordering": ["registered_at"],
+            },
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="participants",
+            field=models.ManyToManyField(
+                related_name="eventos",
+                through="auth_firebase.Participation",
+                to="auth_firebase.userstatus",
+                verbose_name="Participantes",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="participation",
+            index=models.Index(
+                fields=["user", "registered_at"], name="participation_user_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="participation",
+            constraint=models.UniqueConstraint(
+                fields=("event", "user"), name="unique_participation"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["voluntariado", "event_date"], name="event_voluntariado_idx"
+            ),
+        ),
+    ]
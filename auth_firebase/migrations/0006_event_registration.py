@@ -0,0 +1,44 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth_firebase", "0005_event_participation"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="registered",
+            field=models.PositiveIntegerField(default=0, verbose_name="Inscritos"),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="waitlist",
+            field=models.BooleanField(
+                default=False,
+                help_text="Al llenarse el cupo, las nuevas inscripciones quedan en espera",
+                verbose_name="Lista de Espera",
+            ),
+        ),
+        migrations.AddField(
+            model_name="participation",
+            name="status",
+            field=models.CharField(
+                choices=[("inscrito", "Inscrito"), ("en_espera", "En Lista de Espera")],
+                default="inscrito",
+                max_length=20,
+                verbose_name="Estado",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="participation",
+            index=models.Index(
+                fields=["event", "status", "registered_at"],
+                name="participation_status_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,223 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:45
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth_firebase", "0006_event_registration"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Logro",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "firestore_id",
+                    models.CharField(
+                        blank=True,
+                        max_length=128,
+                        null=True,
+                        unique=True,
+                        verbose_name="ID en Firestore",
+                    ),
+                ),
+                ("name", models.CharField(max_length=150, verbose_name="Nombre")),
+                (
+                    "description",
+                    models.TextField(blank=True, verbose_name="Descripción"),
+                ),
+                (
+                    "criteria",
+                    models.CharField(
+                        choices=[
+                            ("horas", "Horas"),
+                            ("eventos", "Eventos"),
+                            ("especial", "Especial"),
+                        ],
+                        default="especial",
+                        max_length=20,
+                        verbose_name="Criterio",
+                    ),
+                ),
+                (
+                    "value",
+                    models.PositiveIntegerField(
+                        default=1, verbose_name="Valor del Criterio"
+                    ),
+                ),
+                (
+                    "points",
+                    models.PositiveIntegerField(default=0, verbose_name="Puntos"),
+                ),
+                (
+                    "hours",
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name="Horas Otorgadas"
+                    ),
+                ),
+                (
+                    "icon",
+                    models.CharField(
+                        default="fas fa-trophy", max_length=50, verbose_name="Icono"
+                    ),
+                ),
+                ("active", models.BooleanField(default=True, verbose_name="Activo")),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="Fecha de Creación",
+                    ),
+                ),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="logros_creados",
+                        to="auth_firebase.userstatus",
+                        verbose_name="Creado por",
+                    ),
+                ),
+                (
+                    "voluntariado",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="logros",
+                        to="auth_firebase.voluntariado",
+                        verbose_name="Voluntariado",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Logro",
+                "verbose_name_plural": "Logros",
+                "ordering": ["voluntariado", "name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="AchievementSummary",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="achievement_summary",
+                        serialize=False,
+                        to="auth_firebase.userstatus",
+                        verbose_name="Usuario",
+                    ),
+                ),
+                (
+                    "count",
+                    models.PositiveIntegerField(default=0, verbose_name="Logros"),
+                ),
+                (
+                    "points",
+                    models.PositiveIntegerField(default=0, verbose_name="Puntos"),
+                ),
+                ("hours", models.PositiveIntegerField(default=0, verbose_name="Horas")),
+                (
+                    "latest_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Fecha del Último Logro"
+                    ),
+                ),
+                (
+                    "latest",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="auth_firebase.logro",
+                        verbose_name="Último Logro",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Resumen de Logros",
+                "verbose_name_plural": "Resúmenes de Logros",
+            },
+        ),
+        migrations.CreateModel(
+            name="UserAchievement",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "assigned_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="Fecha de Asignación",
+                    ),
+                ),
+                (
+                    "assigned_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="logros_asignados",
+                        to="auth_firebase.userstatus",
+                        verbose_name="Asignado por",
+                    ),
+                ),
+                (
+                    "logro",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="asignaciones",
+                        to="auth_firebase.logro",
+                        verbose_name="Logro",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="achievements",
+                        to="auth_firebase.userstatus",
+                        verbose_name="Usuario",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Logro de Usuario",
+                "verbose_name_plural": "Logros de Usuarios",
+                "ordering": ["-assigned_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["user", "-assigned_at"], name="achievement_user_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "logro"), name="unique_user_achievement"
+                    )
+                ],
+            },
+        ),
+    ]
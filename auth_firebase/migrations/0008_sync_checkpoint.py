@@ -0,0 +1,79 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth_firebase", "0007_achievements"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SyncCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "collection",
+                    models.CharField(
+                        max_length=64, unique=True, verbose_name="Colección"
+                    ),
+                ),
+                (
+                    "run_started_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Inicio de la Corrida"
+                    ),
+                ),
+                (
+                    "run_since",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Cambios Desde"
+                    ),
+                ),
+                (
+                    "cursor_id",
+                    models.CharField(
+                        blank=True, max_length=128, verbose_name="Último Documento"
+                    ),
+                ),
+                (
+                    "cursor_updated_at",
+                    models.DateTimeField(
+                        blank=True,
+                        null=True,
+                        verbose_name="Actualización del Último Documento",
+                    ),
+                ),
+                (
+                    "documents",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Documentos Procesados"
+                    ),
+                ),
+                (
+                    "synced_until",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Sincronizado Hasta"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Actualizado"),
+                ),
+            ],
+            options={
+                "verbose_name": "Punto de Sincronización",
+                "verbose_name_plural": "Puntos de Sincronización",
+            },
+        ),
+    ]
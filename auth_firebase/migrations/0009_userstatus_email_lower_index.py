@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:17
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth_firebase", "0008_sync_checkpoint"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="userstatus",
+            index=models.Index(
+                django.db.models.functions.text.Lower("email"),
+                name="userstatus_email_lower_idx",
+            ),
+        ),
+    ]
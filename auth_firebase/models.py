@@ -1,6 +1,45 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Lower
 from django.utils import timezone
 
+from .signals import user_status_bulk_updated
+
+
+class UserStatusQuerySet(models.QuerySet):
+    """QuerySet que avisa qué usuarios cambiaron en las actualizaciones masivas"""
+
+    def update(self, **kwargs):
+        # update() no dispara post_save, así que se envía una señal propia
+        # con los UID afectados para que los cachés puedan invalidarse
+        firebase_uids = list(self.values_list('firebase_uid', flat=True))
+        updated = super().update(**kwargs)
+        self._notify_updated(firebase_uids, kwargs)
+        return updated
+
+    def update_uids(self, firebase_uids, **kwargs):
+        """
+        Aplica update() a los usuarios con esos UID y devuelve los que existían,
+        leyéndolos una sola vez para la señal y para quien llama.
+        """
+        users = self.filter(firebase_uid__in=firebase_uids)
+        found = list(users.values_list('firebase_uid', flat=True))
+        if found:
+            super(UserStatusQuerySet, users).update(**kwargs)
+            self._notify_updated(found, kwargs)
+        return found
+
+    def _notify_updated(self, firebase_uids, changes):
+        if firebase_uids:
+            user_status_bulk_updated.send(
+                sender=self.model, firebase_uids=firebase_uids, fields=tuple(changes)
+            )
+
+    def members_of(self, voluntariado):
+        """Usuarios con membresía en el voluntariado indicado"""
+        return self.filter(memberships__voluntariado=voluntariado)
+
+
 class UserStatus(models.Model):
     """
     Modelo para manejar el estado de los usuarios de Firebase
@@ -24,12 +63,21 @@ class UserStatus(models.Model):
     rol = models.CharField(max_length=20, choices=ROLE_CHOICES, default='usuario', verbose_name="Rol")
     fecha_registro = models.DateTimeField(default=timezone.now, verbose_name="Fecha de Registro")
     fecha_ultima_actividad = models.DateTimeField(auto_now=True, verbose_name="Última Actividad")
-    voluntariados = models.JSONField(default=list, blank=True, verbose_name="Voluntariados")
+    objects = UserStatusQuerySet.as_manager()
     
     class Meta:
         verbose_name = "Estado de Usuario"
         verbose_name_plural = "Estados de Usuarios"
         ordering = ['-fecha_registro']
+        # Índices para el orden por defecto, la paginación por cursor de
+        # get_all_users y los filtros del admin por estado y rol
+        indexes = [
+            models.Index(fields=['fecha_registro', 'id'], name='userstatus_registro_idx'),
+            models.Index(fields=['estado', 'fecha_registro', 'id'], name='userstatus_estado_idx'),
+            models.Index(fields=['rol', 'fecha_registro', 'id'], name='userstatus_rol_idx'),
+            # Búsqueda de emails existentes sin distinguir mayúsculas (onboarding)
+            models.Index(Lower('email'), name='userstatus_email_lower_idx'),
+        ]
     
     def __str__(self):
         return f"{self.email} - {self.get_estado_display()}"
@@ -47,3 +95,477 @@ class UserStatus(models.Model):
     def can_access_voluntariados(self):
         """Verifica si el usuario puede acceder a información de voluntariados"""
         return self.is_active
+    
+    def get_voluntariados(self):
+        """Identificadores de los voluntariados a los que pertenece el usuario"""
+        return list(Membership.objects.voluntariados_of(self))
+
+
+class VoluntariadoQuerySet(models.QuerySet):
+
+    def recount_members(self):
+        """Recalcula member_count contando las membresías de cada voluntariado en un UPDATE"""
+        members = (
+            Membership.objects.filter(voluntariado=OuterRef('slug'))
+            .order_by().values('voluntariado').annotate(total=Count('id')).values('total')
+        )
+        return self.update(member_count=Coalesce(Subquery(members), 0))
+
+
+class Voluntariado(models.Model):
+    """
+    Voluntariado al que los usuarios se unen con un código.
+
+    slug es el identificador del voluntariado (el id del documento en
+    Firestore) y es el valor que guarda Membership.voluntariado.
+    """
+    slug = models.SlugField(max_length=128, unique=True, verbose_name="Identificador")
+    name = models.CharField(max_length=150, verbose_name="Nombre")
+    code = models.CharField(max_length=20, unique=True, verbose_name="Código de Ingreso")
+    active = models.BooleanField(default=True, verbose_name="Activo")
+    member_count = models.PositiveIntegerField(default=0, verbose_name="Miembros")
+    max_members = models.PositiveIntegerField(
+        null=True, blank=True, verbose_name="Límite de Miembros",
+        help_text="Vacío para no limitar el número de miembros",
+    )
+    objects = VoluntariadoQuerySet.as_manager()
+    
+    class Meta:
+        verbose_name = "Voluntariado"
+        verbose_name_plural = "Voluntariados"
+        ordering = ['name']
+    
+    def __str__(self):
+        return self.name
+    
+    def save(self, *args, **kwargs):
+        # Los códigos se comparan siempre en mayúsculas
+        self.code = self.code.strip().upper()
+        super().save(*args, **kwargs)
+    
+    @property
+    def is_full(self):
+        return self.max_members is not None and self.member_count >= self.max_members
+
+
+class MembershipQuerySet(models.QuerySet):
+
+    def voluntariados_of(self, user):
+        """Identificadores de voluntariado del usuario, en orden de ingreso"""
+        return (
+            self.filter(user=user)
+            .order_by('joined_at', 'id')
+            .values_list('voluntariado', flat=True)
+        )
+
+    def by_user(self, user_ids):
+        """Diccionario {user_id: [voluntariados]} para varios usuarios en una consulta"""
+        grouped = {user_id: [] for user_id in user_ids}
+        rows = (
+            self.filter(user_id__in=user_ids)
+            .order_by('joined_at', 'id')
+            .values_list('user_id', 'voluntariado')
+        )
+        for user_id, voluntariado in rows:
+            grouped[user_id].append(voluntariado)
+        return grouped
+
+    async def aby_user(self, user_ids):
+        """Versión asíncrona de by_user"""
+        grouped = {user_id: [] for user_id in user_ids}
+        rows = (
+            self.filter(user_id__in=user_ids)
+            .order_by('joined_at', 'id')
+            .values_list('user_id', 'voluntariado')
+        )
+        async for user_id, voluntariado in rows:
+            grouped[user_id].append(voluntariado)
+        return grouped
+
+
+class Membership(models.Model):
+    """
+    Membresía de un usuario en un voluntariado.
+
+    voluntariado guarda el identificador del voluntariado (Voluntariado.slug,
+    el id del documento en Firestore). Reemplaza la lista JSON UserStatus.voluntariados para que
+    ambas direcciones de la relación sean consultas indexadas.
+    """
+    ROLE_CHOICES = [
+        ('miembro', 'Miembro'),
+        ('coordinador', 'Coordinador'),
+    ]
+    
+    user = models.ForeignKey(
+        UserStatus,
+        on_delete=models.CASCADE,
+        related_name='memberships',
+        verbose_name="Usuario",
+    )
+    voluntariado = models.CharField(max_length=128, verbose_name="Voluntariado")
+    role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='miembro', verbose_name="Rol")
+    joined_at = models.DateTimeField(default=timezone.now, verbose_name="Fecha de Ingreso")
+    
+    objects = MembershipQuerySet.as_manager()
+    
+    class Meta:
+        verbose_name = "Membresía"
+        verbose_name_plural = "Membresías"
+        ordering = ['joined_at']
+        constraints = [
+            # También sirve de índice para "voluntariados de un usuario"
+            models.UniqueConstraint(fields=['user', 'voluntariado'], name='unique_membership'),
+        ]
+        indexes = [
+            models.Index(fields=['voluntariado', 'joined_at'], name='membership_voluntariado_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.email} - {self.voluntariado}"
+
+
+class EventQuerySet(models.QuerySet):
+
+    def recount_registered(self):
+        """Recalcula registered contando las inscripciones confirmadas de cada evento en un UPDATE"""
+        seated = (
+            Participation.objects.filter(event=OuterRef('pk'), status='inscrito')
+            .order_by().values('event').annotate(total=Count('id')).values('total')
+        )
+        return self.update(registered=Coalesce(Subquery(seated), 0))
+
+
+class Event(models.Model):
+    """Evento de un voluntariado (colección 'eventos' de Firestore)"""
+    STATUS_CHOICES = [
+        ('abierto', 'Abierto'),
+        ('cerrado', 'Cerrado'),
+        ('cancelado', 'Cancelado'),
+        ('finalizado', 'Finalizado'),
+    ]
+    
+    firestore_id = models.CharField(
+        max_length=128, unique=True, null=True, blank=True, verbose_name="ID en Firestore"
+    )
+    voluntariado = models.ForeignKey(
+        Voluntariado,
+        on_delete=models.CASCADE,
+        related_name='eventos',
+        verbose_name="Voluntariado",
+    )
+    title = models.CharField(max_length=200, verbose_name="Título")
+    description = models.TextField(blank=True, verbose_name="Descripción")
+    event_date = models.DateTimeField(verbose_name="Fecha del Evento")
+    duration = models.PositiveSmallIntegerField(default=2, verbose_name="Duración (horas)")
+    max_participants = models.PositiveIntegerField(
+        null=True, blank=True, verbose_name="Cupo",
+        help_text="Vacío para no limitar el número de participantes",
+    )
+    registered = models.PositiveIntegerField(default=0, verbose_name="Inscritos")
+    waitlist = models.BooleanField(
+        default=False, verbose_name="Lista de Espera",
+        help_text="Al llenarse el cupo, las nuevas inscripciones quedan en espera",
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='abierto', verbose_name="Estado")
+    created_by = models.ForeignKey(
+        UserStatus,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='eventos_creados',
+        verbose_name="Creado por",
+    )
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="Fecha de Creación")
+    participants = models.ManyToManyField(
+        UserStatus,
+        through='Participation',
+        related_name='eventos',
+        verbose_name="Participantes",
+    )
+    objects = EventQuerySet.as_manager()
+    
+    class Meta:
+        verbose_name = "Evento"
+        verbose_name_plural = "Eventos"
+        ordering = ['event_date']
+        indexes = [
+            models.Index(fields=['voluntariado', 'event_date'], name='event_voluntariado_idx'),
+        ]
+    
+    def __str__(self):
+        return self.title
+
+
+class Participation(models.Model):
+    """Inscripción de un usuario en un evento"""
+    STATUS_CHOICES = [
+        ('inscrito', 'Inscrito'),
+        ('en_espera', 'En Lista de Espera'),
+    ]
+    
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        related_name='participations',
+        verbose_name="Evento",
+    )
+    user = models.ForeignKey(
+        UserStatus,
+        on_delete=models.CASCADE,
+        related_name='participations',
+        verbose_name="Usuario",
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='inscrito', verbose_name="Estado")
+    registered_at = models.DateTimeField(default=timezone.now, verbose_name="Fecha de Inscripción")
+    attended = models.BooleanField(default=False, verbose_name="Asistió")
+    
+    class Meta:
+        verbose_name = "Participación"
+        verbose_name_plural = "Participaciones"
+        ordering = ['registered_at']
+        constraints = [
+            # También sirve de índice para "participantes de un evento"
+            models.UniqueConstraint(fields=['event', 'user'], name='unique_participation'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'registered_at'], name='participation_user_idx'),
+            # Lista de espera de un evento en orden de llegada
+            models.Index(fields=['event', 'status', 'registered_at'], name='participation_status_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.email} - {self.event.title}"
+
+
+class Logro(models.Model):
+    """Logro que un voluntariado otorga a sus miembros (colección 'logros' de Firestore)"""
+    CRITERIA_CHOICES = [
+        ('horas', 'Horas'),
+        ('eventos', 'Eventos'),
+        ('especial', 'Especial'),
+    ]
+    
+    firestore_id = models.CharField(
+        max_length=128, unique=True, null=True, blank=True, verbose_name="ID en Firestore"
+    )
+    voluntariado = models.ForeignKey(
+        Voluntariado,
+        on_delete=models.CASCADE,
+        related_name='logros',
+        verbose_name="Voluntariado",
+    )
+    name = models.CharField(max_length=150, verbose_name="Nombre")
+    description = models.TextField(blank=True, verbose_name="Descripción")
+    criteria = models.CharField(max_length=20, choices=CRITERIA_CHOICES, default='especial', verbose_name="Criterio")
+    value = models.PositiveIntegerField(default=1, verbose_name="Valor del Criterio")
+    points = models.PositiveIntegerField(default=0, verbose_name="Puntos")
+    hours = models.PositiveSmallIntegerField(default=0, verbose_name="Horas Otorgadas")
+    icon = models.CharField(max_length=50, default='fas fa-trophy', verbose_name="Icono")
+    active = models.BooleanField(default=True, verbose_name="Activo")
+    created_by = models.ForeignKey(
+        UserStatus,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='logros_creados',
+        verbose_name="Creado por",
+    )
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="Fecha de Creación")
+    
+    class Meta:
+        verbose_name = "Logro"
+        verbose_name_plural = "Logros"
+        ordering = ['voluntariado', 'name']
+    
+    def __str__(self):
+        return self.name
+    
+    def save(self, *args, **kwargs):
+        # Los resúmenes guardan totales de puntos y horas: si cambian los del
+        # logro se recalculan los de quienes ya lo tienen
+        with transaction.atomic():
+            previous = None
+            if self.pk is not None:
+                previous = Logro.objects.filter(pk=self.pk).values_list('points', 'hours').first()
+            super().save(*args, **kwargs)
+            if previous is not None and previous != (self.points, self.hours):
+                UserAchievement.objects.rebuild_summaries(self.asignaciones.values_list('user_id', flat=True))
+    
+    def delete(self, *args, **kwargs):
+        # Al borrar el logro se borran sus asignaciones en cascada; los
+        # resúmenes de esos usuarios se recalculan en la misma transacción
+        with transaction.atomic():
+            user_ids = list(self.asignaciones.values_list('user_id', flat=True))
+            result = super().delete(*args, **kwargs)
+            UserAchievement.objects.rebuild_summaries(user_ids)
+        return result
+
+
+class UserAchievementManager(models.Manager):
+    """Otorga y retira logros manteniendo al día el resumen del usuario"""
+
+    def grant(self, user, logro, assigned_by=None):
+        """
+        Otorga logro a user y suma sus puntos y horas al resumen en la misma
+        transacción. Lanza IntegrityError si el usuario ya lo tenía.
+        """
+        with transaction.atomic():
+            achievement = self.create(user=user, logro=logro, assigned_by=assigned_by)
+            AchievementSummary.objects.get_or_create(user=user)
+            AchievementSummary.objects.filter(user=user).update(
+                count=F('count') + 1,
+                points=F('points') + logro.points,
+                hours=F('hours') + logro.hours,
+                latest=logro,
+                latest_at=achievement.assigned_at,
+            )
+        return achievement
+
+    def revoke(self, user, logro):
+        """Retira logro a user y recalcula su resumen; devuelve False si no lo tenía"""
+        with transaction.atomic():
+            deleted, _ = self.filter(user=user, logro=logro).delete()
+            if not deleted:
+                return False
+            # Se recalcula en vez de restar logro.points: los puntos del logro
+            # pudieron cambiar (o sincronizarse) después de otorgarlo
+            self.rebuild_summaries([user.pk])
+        return True
+
+    def rebuild_summaries(self, user_ids):
+        """Recalcula desde cero el resumen de los usuarios indicados"""
+        user_ids = set(user_ids)
+        totals = {
+            row['user_id']: row
+            for row in self.filter(user_id__in=user_ids).values('user_id').annotate(
+                total=models.Count('id'),
+                total_points=models.Sum('logro__points'),
+                total_hours=models.Sum('logro__hours'),
+            ).order_by()
+        }
+        latest = {}
+        for achievement in self.filter(user_id__in=user_ids).order_by('user_id', '-assigned_at', '-id'):
+            latest.setdefault(achievement.user_id, achievement)
+        summaries = []
+        for user_id in user_ids:
+            row = totals.get(user_id, {})
+            last = latest.get(user_id)
+            summaries.append(AchievementSummary(
+                user_id=user_id,
+                count=row.get('total', 0),
+                points=row.get('total_points') or 0,
+                hours=row.get('total_hours') or 0,
+                latest_id=last.logro_id if last else None,
+                latest_at=last.assigned_at if last else None,
+            ))
+        AchievementSummary.objects.bulk_create(
+            summaries,
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=['count', 'points', 'hours', 'latest', 'latest_at'],
+        )
+
+
+class UserAchievement(models.Model):
+    """Logro otorgado a un usuario (colección 'user_achievements' de Firestore)"""
+    user = models.ForeignKey(
+        UserStatus,
+        on_delete=models.CASCADE,
+        related_name='achievements',
+        verbose_name="Usuario",
+    )
+    logro = models.ForeignKey(
+        Logro,
+        on_delete=models.CASCADE,
+        related_name='asignaciones',
+        verbose_name="Logro",
+    )
+    assigned_by = models.ForeignKey(
+        UserStatus,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='logros_asignados',
+        verbose_name="Asignado por",
+    )
+    assigned_at = models.DateTimeField(default=timezone.now, verbose_name="Fecha de Asignación")
+    
+    objects = UserAchievementManager()
+    
+    class Meta:
+        verbose_name = "Logro de Usuario"
+        verbose_name_plural = "Logros de Usuarios"
+        ordering = ['-assigned_at']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'logro'], name='unique_user_achievement'),
+        ]
+        indexes = [
+            models.Index(fields=['user', '-assigned_at'], name='achievement_user_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.email} - {self.logro.name}"
+
+
+class AchievementSummary(models.Model):
+    """
+    Resumen de logros por usuario (cantidad, puntos, horas y el más reciente).
+
+    Lo mantienen UserAchievement.objects.grant()/revoke() y Logro.save()
+    dentro de la misma transacción, así el dashboard lee una sola fila en vez de recorrer los logros.
+    """
+    user = models.OneToOneField(
+        UserStatus,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='achievement_summary',
+        verbose_name="Usuario",
+    )
+    count = models.PositiveIntegerField(default=0, verbose_name="Logros")
+    points = models.PositiveIntegerField(default=0, verbose_name="Puntos")
+    hours = models.PositiveIntegerField(default=0, verbose_name="Horas")
+    latest = models.ForeignKey(
+        Logro,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name="Último Logro",
+    )
+    latest_at = models.DateTimeField(null=True, blank=True, verbose_name="Fecha del Último Logro")
+    
+    class Meta:
+        verbose_name = "Resumen de Logros"
+        verbose_name_plural = "Resúmenes de Logros"
+    
+    def __str__(self):
+        return f"{self.user.email}: {self.count} logros"
+
+
+class SyncCheckpoint(models.Model):
+    """
+    Avance de la sincronización de una colección de Firestore (ver firestore_sync).
+
+    Mientras una corrida está en curso guarda el último documento procesado
+    para poder retomarla; al terminar, synced_until marca desde dónde empieza
+    la siguiente corrida incremental.
+    """
+    collection = models.CharField(max_length=64, unique=True, verbose_name="Colección")
+    run_started_at = models.DateTimeField(null=True, blank=True, verbose_name="Inicio de la Corrida")
+    run_since = models.DateTimeField(null=True, blank=True, verbose_name="Cambios Desde")
+    cursor_id = models.CharField(max_length=128, blank=True, verbose_name="Último Documento")
+    cursor_updated_at = models.DateTimeField(null=True, blank=True, verbose_name="Actualización del Último Documento")
+    documents = models.PositiveIntegerField(default=0, verbose_name="Documentos Procesados")
+    synced_until = models.DateTimeField(null=True, blank=True, verbose_name="Sincronizado Hasta")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Actualizado")
+    
+    class Meta:
+        verbose_name = "Punto de Sincronización"
+        verbose_name_plural = "Puntos de Sincronización"
+    
+    def __str__(self):
+        return self.collection
+    
+    @property
+    def in_progress(self):
+        return self.run_started_at is not None
@@ -0,0 +1,225 @@
+"""
+Alta masiva de usuarios desde los listados CSV de los coordinadores.
+
+El archivo se lee fila por fila (nunca completo en memoria) y las filas
+válidas se insertan por lotes de IMPORT_BATCH_SIZE con bulk_create, cada
+lote en su propia transacción corta, así importar miles de estudiantes no
+bloquea la base mientras dura la lectura del archivo.
+
+Columnas: firebase_uid (o uid) y email son obligatorias; nombre, apellido,
+estado, rol y voluntariados (slugs separados por ";") son opcionales. Una
+fila se omite si su UID o su email (sin distinguir mayúsculas) ya existen
+en la base o aparecieron antes en el mismo archivo. Las membresías respetan
+max_members igual que join_voluntariado: las que no caben se cuentan en
+over_capacity y se reportan con su línea, y el usuario se crea igual.
+"""
+import csv
+from dataclasses import dataclass, field
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.functions import Lower
+
+from .models import Membership, UserStatus, Voluntariado
+from .signals import user_status_bulk_updated
+
+IMPORT_BATCH_SIZE = 500
+# Errores por fila que se devuelven; el resto solo se cuenta
+IMPORT_MAX_ERRORS = 100
+COLUMN_ALIASES = {'uid': 'firebase_uid', 'correo': 'email', 'voluntariado': 'voluntariados'}
+REQUIRED_COLUMNS = ('firebase_uid', 'email')
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    skipped: int = 0
+    invalid: int = 0
+    # Membresías no creadas porque el voluntariado llegó a max_members
+    over_capacity: int = 0
+    errors: list = field(default_factory=list)
+
+    def add_error(self, line, errors):
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append({'line': line, 'errors': errors})
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'skipped': self.skipped,
+            'invalid': self.invalid,
+            'over_capacity': self.over_capacity,
+            'errors': self.errors,
+        }
+
+
+def _normalize_header(name):
+    name = (name or '').strip().lower()
+    return COLUMN_ALIASES.get(name, name)
+
+
+def _validate_row(row, voluntariado_slugs):
+    """Devuelve (usuario, slugs, errores) a partir de una fila del CSV"""
+    errors = []
+    firebase_uid = (row.get('firebase_uid') or '').strip()
+    email = (row.get('email') or '').strip().lower()
+    nombre = (row.get('nombre') or '').strip()
+    apellido = (row.get('apellido') or '').strip()
+    estado = (row.get('estado') or '').strip().lower() or 'inactivo'
+    rol = (row.get('rol') or '').strip().lower() or 'usuario'
+    slugs = [slug.strip() for slug in (row.get('voluntariados') or '').split(';') if slug.strip()]
+
+    if not firebase_uid:
+        errors.append('firebase_uid requerido')
+    elif len(firebase_uid) > 128:
+        errors.append('firebase_uid demasiado largo')
+    try:
+        validate_email(email)
+    except ValidationError:
+        errors.append(f'email no válido: {email}' if email else 'email requerido')
+    if len(nombre) > 100 or len(apellido) > 100:
+        errors.append('nombre y apellido admiten hasta 100 caracteres')
+    if estado not in dict(UserStatus.STATUS_CHOICES):
+        errors.append(f'estado no válido: {estado}')
+    if rol not in dict(UserStatus.ROLE_CHOICES):
+        errors.append(f'rol no válido: {rol}')
+    unknown = [slug for slug in slugs if slug not in voluntariado_slugs]
+    if unknown:
+        errors.append(f"voluntariados desconocidos: {', '.join(unknown)}")
+    if errors:
+        return None, slugs, errors
+    user = UserStatus(
+        firebase_uid=firebase_uid, email=email, nombre=nombre, apellido=apellido, estado=estado, rol=rol,
+    )
+    return user, slugs, []
+
+
+def _insert_new(new):
+    """
+    Inserta los usuarios de new y devuelve los (usuario, slugs, línea) creados.
+
+    Si alguien se registró por register_user con uno de esos UID entre la
+    lectura de existentes y la inserción, el lote falla completo: se
+    descartan los UID ya tomados y se reintenta con el resto, así solo se
+    cuentan las filas que este import creó de verdad.
+    """
+    while new:
+        try:
+            with transaction.atomic():
+                UserStatus.objects.bulk_create([user for user, _, _ in new])
+            return new
+        except IntegrityError:
+            taken = set(
+                UserStatus.objects.filter(firebase_uid__in=[user.firebase_uid for user, _, _ in new])
+                .values_list('firebase_uid', flat=True)
+            )
+            if not taken:
+                raise
+            new = [item for item in new if item[0].firebase_uid not in taken]
+    return new
+
+
+def _reserve_places(slug, wanted):
+    """
+    Suma hasta wanted miembros a member_count sin pasar de max_members y
+    devuelve cuántos lugares obtuvo. La fila queda bloqueada hasta el final
+    de la transacción, así join_voluntariado no puede tomar los mismos lugares.
+    """
+    voluntariado = Voluntariado.objects.select_for_update().only('member_count', 'max_members').get(slug=slug)
+    places = wanted
+    if voluntariado.max_members is not None:
+        places = max(0, min(wanted, voluntariado.max_members - voluntariado.member_count))
+    if places:
+        Voluntariado.objects.filter(pk=voluntariado.pk).update(member_count=F('member_count') + places)
+    return places
+
+
+def _save_batch(batch, result):
+    """Inserta un lote de (usuario, slugs, línea) omitiendo los UID y emails que ya existen"""
+    uids = [user.firebase_uid for user, _, _ in batch]
+    emails = [user.email for user, _, _ in batch]
+    with transaction.atomic():
+        existing_uids = set(UserStatus.objects.filter(firebase_uid__in=uids).values_list('firebase_uid', flat=True))
+        # Los emails importados van en minúsculas; los guardados pueden no estarlo
+        existing_emails = set(
+            UserStatus.objects.annotate(email_lower=Lower('email'))
+            .filter(email_lower__in=emails)
+            .values_list('email_lower', flat=True)
+        )
+        new = [
+            item for item in batch
+            if item[0].firebase_uid not in existing_uids and item[0].email not in existing_emails
+        ]
+        new = _insert_new(new)
+        result.created += len(new)
+        result.skipped += len(batch) - len(new)
+        if not new:
+            return
+
+        # Sin ignore_conflicts bulk_create asigna el id de cada usuario
+        wanted = {}
+        for user, slugs, line in new:
+            for slug in dict.fromkeys(slugs):
+                wanted.setdefault(slug, []).append((Membership(user=user, voluntariado=slug), line))
+        memberships = []
+        # Las membresías que no caben en el cupo se reportan como las filas no válidas
+        for slug, requested in wanted.items():
+            places = _reserve_places(slug, len(requested))
+            memberships += [membership for membership, _ in requested[:places]]
+            for _, line in requested[places:]:
+                result.over_capacity += 1
+                result.add_error(line, [f'voluntariado sin cupo: {slug}'])
+        Membership.objects.bulk_create(memberships)
+
+    # bulk_create no dispara post_save: se avisa para descartar el
+    # "no registrado" que el caché de acceso pudo guardar para estos UID
+    new_uids = [user.firebase_uid for user, _, _ in new]
+    user_status_bulk_updated.send(sender=UserStatus, firebase_uids=new_uids, fields=('firebase_uid',))
+
+
+def import_users(lines, voluntariado=None, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Importa usuarios desde lines (un archivo de texto o cualquier iterable de
+    líneas CSV con encabezado) y devuelve un ImportResult.
+
+    voluntariado es el slug al que se une a todos los usuarios importados,
+    además de los de su columna voluntariados. Lanza ValueError si faltan
+    columnas obligatorias o voluntariado no existe.
+    """
+    voluntariado_slugs = set(Voluntariado.objects.values_list('slug', flat=True))
+    if voluntariado and voluntariado not in voluntariado_slugs:
+        raise ValueError(f'Voluntariado no encontrado: {voluntariado}')
+
+    reader = csv.DictReader(lines)
+    if reader.fieldnames is None:
+        raise ValueError('El archivo está vacío')
+    reader.fieldnames = [_normalize_header(name) for name in reader.fieldnames]
+    missing = [column for column in REQUIRED_COLUMNS if column not in reader.fieldnames]
+    if missing:
+        raise ValueError(f"Faltan columnas: {', '.join(missing)}")
+
+    result = ImportResult()
+    seen_uids, seen_emails = set(), set()
+    batch = []
+    for row in reader:
+        user, slugs, errors = _validate_row(row, voluntariado_slugs)
+        if errors:
+            result.invalid += 1
+            result.add_error(reader.line_num, errors)
+            continue
+        if user.firebase_uid in seen_uids or user.email in seen_emails:
+            result.skipped += 1
+            continue
+        seen_uids.add(user.firebase_uid)
+        seen_emails.add(user.email)
+        if voluntariado:
+            slugs.append(voluntariado)
+        batch.append((user, slugs, reader.line_num))
+        if len(batch) >= batch_size:
+            _save_batch(batch, result)
+            batch = []
+    if batch:
+        _save_batch(batch, result)
+    return result
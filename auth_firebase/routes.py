@@ -0,0 +1,61 @@
+"""
+Clasificación de rutas para FirebaseAuthMiddleware.
+
+Las rutas se declaran en settings como prefijos de path ('/voluntariados/')
+o nombres de URL ('auth:dashboard') y se compilan una sola vez en un trie de
+prefijos, así clasificar un path cuesta O(len(path)) sin importar cuántas
+rutas haya declaradas.
+"""
+from django.conf import settings
+from django.urls import reverse
+
+PROTECTED = 1
+ACTIVE_USER = 2
+
+
+class RouteTrie:
+    """Trie de prefijos de path donde cada nodo terminal guarda banderas"""
+
+    __slots__ = ('_root',)
+
+    def __init__(self):
+        # Cada nodo es [hijos, banderas]
+        self._root = [{}, 0]
+
+    def add(self, prefix, flags):
+        node = self._root
+        for char in prefix:
+            node = node[0].setdefault(char, [{}, 0])
+        node[1] |= flags
+
+    def match(self, path):
+        """Devuelve la unión de banderas de todos los prefijos declarados de path"""
+        node = self._root
+        flags = node[1]
+        for char in path:
+            node = node[0].get(char)
+            if node is None:
+                break
+            flags |= node[1]
+        return flags
+
+
+def route_prefix(route):
+    """Convierte un nombre de URL en su path; los paths se devuelven tal cual"""
+    if route.startswith('/'):
+        return route
+    return reverse(route)
+
+
+def build_route_trie(protected=None, active_user=None):
+    """Compila las rutas declaradas en FIREBASE_AUTH_PROTECTED_ROUTES y FIREBASE_AUTH_ACTIVE_USER_ROUTES"""
+    if protected is None:
+        protected = getattr(settings, 'FIREBASE_AUTH_PROTECTED_ROUTES', ())
+    if active_user is None:
+        active_user = getattr(settings, 'FIREBASE_AUTH_ACTIVE_USER_ROUTES', ())
+    trie = RouteTrie()
+    for route in protected:
+        trie.add(route_prefix(route), PROTECTED)
+    for route in active_user:
+        trie.add(route_prefix(route), ACTIVE_USER)
+    return trie
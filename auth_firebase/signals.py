@@ -0,0 +1,73 @@
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+# Se envía después de UserStatus.objects.filter(...).update(...) con los UID afectados
+user_status_bulk_updated = Signal()
+
+
+def _invalidate_access(*firebase_uids):
+    from .cache import user_access_cache
+
+    user_access_cache.invalidate(*firebase_uids)
+    # Se repite al confirmar la transacción para descartar lecturas concurrentes
+    # que hayan guardado el estado anterior mientras la transacción seguía abierta
+    transaction.on_commit(lambda: user_access_cache.invalidate(*firebase_uids))
+
+
+@receiver(post_save, sender='auth_firebase.UserStatus')
+@receiver(post_delete, sender='auth_firebase.UserStatus')
+def invalidate_user_access(sender, instance, **kwargs):
+    """Invalida el acceso cacheado del usuario guardado o eliminado"""
+    _invalidate_access(instance.firebase_uid)
+
+
+@receiver(user_status_bulk_updated)
+def invalidate_bulk_user_access(sender, firebase_uids, **kwargs):
+    """Invalida el acceso cacheado de los usuarios de una actualización masiva"""
+    _invalidate_access(*firebase_uids)
+
+
+@receiver(post_delete, sender='auth_firebase.Membership')
+def release_membership(sender, instance, **kwargs):
+    """Descuenta la membresía eliminada (admin o cascada de un usuario) del cupo del voluntariado"""
+    from .models import Voluntariado
+
+    Voluntariado.objects.filter(slug=instance.voluntariado, member_count__gt=0).update(
+        member_count=F('member_count') - 1
+    )
+
+
+@receiver(post_delete, sender='auth_firebase.Participation')
+def release_participation(sender, instance, **kwargs):
+    """
+    Libera el lugar de una inscripción eliminada (admin o cascada de un
+    usuario) y lo pasa al primero de la lista de espera, en una transacción.
+    """
+    if instance.status != 'inscrito':
+        return
+    from .models import Event, Participation
+
+    with transaction.atomic():
+        # Serializa las liberaciones del mismo evento (en SQLite ya lo están)
+        event = Event.objects.select_for_update().only('id').filter(pk=instance.event_id).first()
+        if event is None:
+            return
+        Event.objects.filter(pk=event.pk, registered__gt=0).update(registered=F('registered') - 1)
+        waiting = (
+            Participation.objects.filter(event=event, status='en_espera')
+            .order_by('registered_at', 'id').first()
+        )
+        if waiting is None:
+            return
+        # Mismo UPDATE condicional que register_for_event, por si el cupo se redujo
+        seat_taken = (
+            Event.objects
+            .filter(pk=event.pk)
+            .filter(Q(max_participants__isnull=True) | Q(registered__lt=F('max_participants')))
+            .update(registered=F('registered') + 1)
+        )
+        if seat_taken:
+            waiting.status = 'inscrito'
+            waiting.save(update_fields=['status'])
@@ -1,3 +1,1270 @@
-from django.test import TestCase
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+import jwt
+from asgiref.sync import iscoroutinefunction
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.http import HttpResponse
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models import Count
+from django.test import Client, LiveServerTestCase, RequestFactory, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from home import urls as home_urls
+from nuestros_voluntariados import urls as voluntariados_urls
+
+from . import api, urls as auth_urls, views
+from .api import Field, Schema
+from .cache import ACCESS_DENIED, ACCESS_GRANTED, user_access_cache
+from .firestore_sync import COLLECTIONS, FirestoreSource, FixtureSource, sync_collection
+from .loadtest import Dataset, generate, run_load, summarize
+from .middleware import FirebaseAuthMiddleware
+from .models import (
+    Event,
+    Logro,
+    Membership,
+    Participation,
+    SyncCheckpoint,
+    UserAchievement,
+    UserStatus,
+    Voluntariado,
+)
+from .onboarding import import_users
+from .routes import ACTIVE_USER, PROTECTED, build_route_trie
+from .tokens import (
+    FirebaseTokenVerifier,
+    GoogleCertificateSource,
+    InvalidTokenError,
+    StaticKeySource,
+    set_token_verifier,
+)
+
+
+class AuthApiTestCase(TestCase):
+    """Base con un administrador y utilidades para llamar a los endpoints JSON"""
+
+    def setUp(self):
+        self.admin = UserStatus.objects.create(
+            firebase_uid='admin-uid',
+            email='admin@unah.hn',
+            estado='activo',
+            rol='admin',
+        )
+
+    def post_json(self, url_name, payload):
+        response = self.client.post(
+            reverse(url_name),
+            data=json.dumps(payload),
+            content_type='application/json',
+        )
+        return response.json()
+
+    def create_users(self, count, **extra):
+        base = timezone.now() - timedelta(days=1)
+        return UserStatus.objects.bulk_create([
+            UserStatus(
+                firebase_uid=f'uid-{i}',
+                email=f'user{i}@unah.hn',
+                fecha_registro=base + timedelta(minutes=i),
+                **extra
+            )
+            for i in range(count)
+        ])
+
+
+class GetAllUsersTests(AuthApiTestCase):
+
+    def test_requires_admin(self):
+        self.create_users(1)
+        data = self.post_json('auth:get_all_users', {'admin_uid': 'uid-0'})
+        self.assertFalse(data['success'])
+
+    def test_cursor_walks_every_user_once(self):
+        self.create_users(25)
+        seen = []
+        cursor = None
+        while True:
+            payload = {'admin_uid': 'admin-uid', 'limit': 10, 'include_total': False}
+            if cursor:
+                payload['cursor'] = cursor
+            data = self.post_json('auth:get_all_users', payload)
+            self.assertTrue(data['success'])
+            self.assertNotIn('total', data)
+            seen.extend(u['firebase_uid'] for u in data['users'])
+            cursor = data['next_cursor']
+            if not data['has_more']:
+                break
+        self.assertEqual(len(seen), 26)
+        self.assertEqual(len(set(seen)), 26)
+        self.assertEqual(seen[0], 'admin-uid')
+
+    def test_filters_and_projection(self):
+        self.create_users(5)
+        UserStatus.objects.filter(firebase_uid__in=['uid-1', 'uid-3']).update(estado='activo')
+        data = self.post_json('auth:get_all_users', {
+            'admin_uid': 'admin-uid',
+            'estado': 'activo',
+            'rol': 'usuario',
+            'fields': ['firebase_uid', 'estado'],
+        })
+        self.assertEqual(data['total'], 2)
+        self.assertEqual(
+            data['users'],
+            [
+                {'firebase_uid': 'uid-3', 'estado': 'activo'},
+                {'firebase_uid': 'uid-1', 'estado': 'activo'},
+            ],
+        )
+
+    def test_date_only_fecha_hasta_includes_the_whole_day(self):
+        midday = timezone.make_aware(datetime(2025, 3, 31, 12, 0))
+        UserStatus.objects.create(firebase_uid='mediodia', email='m@unah.hn', fecha_registro=midday)
+        UserStatus.objects.create(firebase_uid='siguiente', email='s@unah.hn', fecha_registro=midday + timedelta(days=1))
+        for fecha_hasta, expected in (('2025-03-31', ['mediodia']), ('2025-03-31T11:00:00', [])):
+            data = self.post_json('auth:get_all_users', {
+                'admin_uid': 'admin-uid', 'fecha_desde': '2025-03-31', 'fecha_hasta': fecha_hasta,
+                'fields': ['firebase_uid'],
+            })
+            self.assertEqual([user['firebase_uid'] for user in data['users']], expected)
+
+    def test_rejects_unknown_fields(self):
+        data = self.post_json('auth:get_all_users', {
+            'admin_uid': 'admin-uid',
+            'fields': ['email', 'password'],
+        })
+        self.assertFalse(data['success'])
+
+
+class ExportUsersTests(AuthApiTestCase):
+
+    def export(self, payload):
+        return self.client.post(
+            reverse('auth:export_users'),
+            data=json.dumps(payload),
+            content_type='application/json',
+        )
+
+    def test_requires_admin(self):
+        response = self.export({'admin_uid': 'desconocido'})
+        self.assertFalse(response.json()['success'])
+
+    def test_ndjson_streams_one_line_per_user(self):
+        self.create_users(3)
+        response = self.export({'admin_uid': 'admin-uid'})
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(json.loads(lines[-1])['firebase_uid'], 'uid-0')
+
+    def test_csv_has_header_and_filtered_rows(self):
+        self.create_users(3)
+        response = self.export({'admin_uid': 'admin-uid', 'format': 'csv', 'rol': 'usuario'})
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertTrue(lines[0].startswith('id,firebase_uid,email'))
+        self.assertEqual(len(lines), 4)
+
+
+class UserAccessCacheTests(AuthApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        user_access_cache.clear()
+        self.user = UserStatus.objects.create(firebase_uid='uid-cache', email='cache@unah.hn')
+        self.middleware = FirebaseAuthMiddleware(lambda request: HttpResponse('ok'))
+
+    def request_details(self):
+        request = RequestFactory().get('/auth/volunteer-details/', HTTP_X_FIREBASE_UID='uid-cache')
+        return self.middleware(request)
+
+    def test_repeated_requests_hit_the_cache(self):
+        self.assertEqual(self.request_details().status_code, 302)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.request_details().status_code, 302)
+
+    def test_save_invalidates(self):
+        self.request_details()
+        self.user.estado = 'activo'
+        self.user.save()
+        self.assertEqual(self.request_details().status_code, 200)
+
+    def test_bulk_update_invalidates(self):
+        self.request_details()
+        UserStatus.objects.filter(firebase_uid='uid-cache').update(estado='activo')
+        self.assertEqual(self.request_details().status_code, 200)
+        UserStatus.objects.filter(firebase_uid='uid-cache').update(estado='suspendido')
+        self.assertEqual(self.request_details().status_code, 302)
+
+    def test_unregistered_user_passes(self):
+        request = RequestFactory().get('/auth/volunteer-details/', HTTP_X_FIREBASE_UID='nadie')
+        self.assertEqual(self.middleware(request).status_code, 200)
+
+
+class RouteTrieTests(TestCase):
+
+    def test_match_combines_declared_prefixes(self):
+        trie = build_route_trie(
+            protected=['auth:dashboard', '/voluntariados/'],
+            active_user=['/voluntariados/', 'auth:volunteer_details'],
+        )
+        self.assertEqual(trie.match('/auth/dashboard/'), PROTECTED)
+        self.assertEqual(trie.match('/voluntariados/patitas_unah/'), PROTECTED | ACTIVE_USER)
+        self.assertEqual(trie.match('/auth/volunteer-details/?id=1'), ACTIVE_USER)
+        self.assertEqual(trie.match('/voluntariados'), 0)
+        self.assertEqual(trie.match('/static/css/styles.css'), 0)
+        self.assertEqual(trie.match('/'), 0)
+
+
+class VerifyTokenTests(AuthApiTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        cls.key_source = StaticKeySource({'kid-1': cls.private_key.public_key()})
+
+    def setUp(self):
+        super().setUp()
+        self.verifier = FirebaseTokenVerifier('proyecto-prueba', key_source=self.key_source)
+        set_token_verifier(self.verifier)
+        self.addCleanup(set_token_verifier, None)
+
+    def make_token(self, kid='kid-1', **overrides):
+        now = int(time.time())
+        claims = {
+            'iss': 'https://securetoken.google.com/proyecto-prueba',
+            'aud': 'proyecto-prueba',
+            'sub': 'uid-token',
+            'email': 'token@unah.hn',
+            'iat': now,
+            'exp': now + 3600,
+        }
+        claims.update(overrides)
+        return jwt.encode(claims, self.private_key, algorithm='RS256', headers={'kid': kid})
+
+    def test_valid_token(self):
+        data = self.post_json('auth:verify_token', {'token': self.make_token()})
+        self.assertTrue(data['valid'])
+        self.assertEqual(data['uid'], 'uid-token')
+
+    def test_rejects_wrong_audience_unknown_key_and_expired(self):
+        for token in (
+            self.make_token(aud='otro-proyecto'),
+            self.make_token(kid='kid-2'),
+            self.make_token(exp=int(time.time()) - 60),
+            'no-es-un-token',
+        ):
+            data = self.post_json('auth:verify_token', {'token': token})
+            self.assertFalse(data['valid'])
+
+    def test_verified_tokens_are_cached(self):
+        token = self.make_token()
+        self.verifier.verify(token)
+        with mock.patch.object(self.verifier, '_decode') as decode:
+            self.assertEqual(self.verifier.verify(token)['sub'], 'uid-token')
+        decode.assert_not_called()
+
+
+class GoogleCertificateSourceTests(TestCase):
+
+    def test_respects_cache_control_max_age(self):
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        pem = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+        ).decode()
+        response = mock.MagicMock()
+        response.read.return_value = json.dumps({'kid-1': pem}).encode()
+        response.headers = {'Cache-Control': 'public, max-age=120, must-revalidate'}
+        response.__enter__.return_value = response
+
+        source = GoogleCertificateSource()
+        with mock.patch('urllib.request.urlopen', return_value=response) as urlopen:
+            source.get_keys()
+            source.get_keys()
+        self.assertEqual(urlopen.call_count, 1)
+        self.assertIn('kid-1', source.get_keys())
+        self.assertAlmostEqual(source._expires - time.monotonic(), 120, delta=5)
+
+    def test_failed_refresh_backs_off_with_stale_keys(self):
+        source = GoogleCertificateSource()
+        source._keys = {'kid-1': object()}
+        with mock.patch('urllib.request.urlopen', side_effect=OSError('sin red')) as urlopen:
+            self.assertIn('kid-1', source.get_keys())
+            self.assertIn('kid-1', source.get_keys())
+        self.assertEqual(urlopen.call_count, 1)
+        self.assertGreater(source._expires, time.monotonic())
+
+    def test_garbage_body_falls_back_to_stale_keys(self):
+        response = mock.MagicMock()
+        response.read.return_value = b'<html>502 Bad Gateway</html>'
+        response.__enter__.return_value = response
+        source = GoogleCertificateSource()
+        with mock.patch('urllib.request.urlopen', return_value=response):
+            with self.assertRaises(InvalidTokenError):
+                source.get_keys()
+            source._keys = {'kid-1': object()}
+            self.assertIn('kid-1', source.get_keys())
+        self.assertGreater(source._expires, time.monotonic())
+
+
+class BulkUpdateUserStatusTests(AuthApiTestCase):
+
+    def test_updates_all_targets_in_one_request(self):
+        self.create_users(5)
+        data = self.post_json('auth:bulk_update_user_status', {
+            'admin_uid': 'admin-uid',
+            'target_uids': ['uid-0', 'uid-1', 'uid-2', 'no-existe'],
+            'estado': 'activo',
+        })
+        self.assertTrue(data['success'])
+        self.assertEqual(data['updated'], 3)
+        self.assertEqual(data['results']['no-existe'], 'no encontrado')
+        self.assertEqual(UserStatus.objects.filter(estado='activo', rol='usuario').count(), 3)
+
+    def test_validates_values_and_admin(self):
+        self.create_users(1)
+        for payload in (
+            {'admin_uid': 'admin-uid', 'target_uids': ['uid-0'], 'estado': 'borrado'},
+            {'admin_uid': 'admin-uid', 'target_uids': ['uid-0']},
+            {'admin_uid': 'uid-0', 'target_uids': ['uid-0'], 'rol': 'admin'},
+        ):
+            self.assertFalse(self.post_json('auth:bulk_update_user_status', payload)['success'])
+        self.assertEqual(UserStatus.objects.get(firebase_uid='uid-0').rol, 'usuario')
+
+
+class MembershipTests(AuthApiTestCase):
+
+    def test_query_both_directions(self):
+        users = self.create_users(3)
+        Membership.objects.create(user=users[0], voluntariado='pumas_verdes')
+        Membership.objects.create(user=users[1], voluntariado='pumas_verdes')
+        Membership.objects.create(user=users[1], voluntariado='patitas_unah')
+
+        members = UserStatus.objects.members_of('pumas_verdes')
+        self.assertEqual(set(members.values_list('firebase_uid', flat=True)), {'uid-0', 'uid-1'})
+        self.assertEqual(users[1].get_voluntariados(), ['pumas_verdes', 'patitas_unah'])
+
+    def test_get_all_users_lists_voluntariados_with_one_query(self):
+        users = self.create_users(3)
+        for user in users:
+            Membership.objects.create(user=user, voluntariado='pumas_verdes')
+        # admin, página de usuarios y membresías
+        with self.assertNumQueries(3):
+            data = self.post_json('auth:get_all_users', {
+                'admin_uid': 'admin-uid',
+                'include_total': False,
+                'fields': ['firebase_uid', 'voluntariados'],
+            })
+        self.assertEqual(data['users'][0], {'firebase_uid': 'admin-uid', 'voluntariados': []})
+        self.assertEqual(data['users'][1], {'firebase_uid': 'uid-2', 'voluntariados': ['pumas_verdes']})
+
+
+class MembershipMigrationTests(TransactionTestCase):
+
+    def test_json_voluntariados_become_memberships(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate([('auth_firebase', '0002_userstatus_indexes')])
+        old_apps = executor.loader.project_state([('auth_firebase', '0002_userstatus_indexes')]).apps
+        OldUserStatus = old_apps.get_model('auth_firebase', 'UserStatus')
+        OldUserStatus.objects.create(firebase_uid='a', email='a@unah.hn', voluntariados=['pumas_verdes'])
+        OldUserStatus.objects.create(
+            firebase_uid='b',
+            email='b@unah.hn',
+            voluntariados={'patitas_unah': {'joinedAt': '2025-03-01T10:00:00Z', 'status': 'inactivo'}},
+        )
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+        self.assertEqual(UserStatus.objects.get(firebase_uid='a').get_voluntariados(), ['pumas_verdes'])
+        membership = Membership.objects.get(user__firebase_uid='b')
+        self.assertEqual(membership.voluntariado, 'patitas_unah')
+        self.assertEqual(membership.joined_at.year, 2025)
+
+
+class JoinVoluntariadoTests(AuthApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.users = self.create_users(3)
+        self.voluntariado = Voluntariado.objects.create(
+            slug='pumas_verdes', name='Pumas Verdes', code='verde1', max_members=2
+        )
+
+    def join(self, uid, code='VERDE1'):
+        return self.post_json('auth:join_voluntariado_api', {'uid': uid, 'code': code})
+
+    def test_join_creates_membership_and_counts(self):
+        data = self.join('uid-0', code='verde1')
+        self.assertTrue(data['success'])
+        self.assertEqual(data['voluntariado']['member_count'], 1)
+        self.assertEqual(self.users[0].get_voluntariados(), ['pumas_verdes'])
+
+    def test_duplicate_and_full_are_rejected_without_changes(self):
+        self.assertTrue(self.join('uid-0')['success'])
+        self.assertFalse(self.join('uid-0')['success'])
+        self.assertTrue(self.join('uid-1')['success'])
+        data = self.join('uid-2')
+        self.assertFalse(data['success'])
+        self.assertIn('límite', data['message'])
+
+        self.voluntariado.refresh_from_db()
+        self.assertEqual(self.voluntariado.member_count, 2)
+        self.assertEqual(UserStatus.objects.members_of('pumas_verdes').count(), 2)
+
+    def test_response_reports_the_count_after_the_update(self):
+        Membership.objects.create(user=self.users[1], voluntariado='pumas_verdes')
+        Voluntariado.objects.filter(pk=self.voluntariado.pk).update(member_count=1)
+        with mock.patch.object(Voluntariado.objects, 'get', return_value=self.voluntariado):
+            data = self.join('uid-0')
+        self.assertEqual(data['voluntariado']['member_count'], 2)
+
+    def test_deleting_memberships_frees_places(self):
+        self.join('uid-0')
+        self.join('uid-1')
+        Membership.objects.get(user=self.users[0]).delete()
+        self.users[1].delete()
+        self.voluntariado.refresh_from_db()
+        self.assertEqual(self.voluntariado.member_count, 0)
+        self.assertTrue(self.join('uid-2')['success'])
+
+    def test_admin_changes_recount_members(self):
+        self.client.force_login(User.objects.create_superuser('staff', 'staff@unah.hn', 'clave'))
+        now = timezone.localtime()
+        response = self.client.post(reverse('admin:auth_firebase_membership_add'), {
+            'user': self.users[0].pk, 'voluntariado': 'pumas_verdes', 'role': 'miembro',
+            'joined_at_0': now.strftime('%Y-%m-%d'), 'joined_at_1': now.strftime('%H:%M:%S'),
+        })
+        self.assertEqual(response.status_code, 302)
+        self.voluntariado.refresh_from_db()
+        self.assertEqual(self.voluntariado.member_count, 1)
+
+    def test_unknown_or_inactive_code(self):
+        self.assertFalse(self.join('uid-0', code='NOEXISTE')['success'])
+        Voluntariado.objects.filter(pk=self.voluntariado.pk).update(active=False)
+        self.assertFalse(self.join('uid-0')['success'])
+
+
+class TemplateFragmentCacheTests(TestCase):
+
+    def test_large_pages_store_their_content_fragment(self):
+        cache.clear()
+        for url_name, fragment, marker in (
+            ('auth:admin_panel', 'auth_admin_panel', 'admin-panel-container'),
+            ('auth:volunteer_details', 'auth_volunteer_details', 'volunteer-details'),
+        ):
+            response = self.client.get(reverse(url_name))
+            self.assertContains(response, marker)
+            key = make_template_fragment_key(fragment, [settings.DEPLOY_VERSION])
+            self.assertIn(marker, cache.get(key, ''))
+
+
+class EventParticipantsTests(AuthApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        voluntariado = Voluntariado.objects.create(slug='patitas_unah', name='Patitas UNAH', code='PAT1')
+        self.event = Event.objects.create(
+            voluntariado=voluntariado,
+            firestore_id='evt-1',
+            title='Jornada de adopción',
+            event_date=timezone.now() + timedelta(days=7),
+        )
+
+    def test_participant_profiles_in_constant_queries(self):
+        users = self.create_users(50)
+        Participation.objects.bulk_create([Participation(event=self.event, user=user) for user in users])
+        # admin, evento y participantes con sus perfiles
+        with self.assertNumQueries(3):
+            data = self.post_json('auth:get_event_participants', {
+                'admin_uid': 'admin-uid',
+                'event_id': 'evt-1',
+            })
+        self.assertTrue(data['success'])
+        self.assertEqual(data['event']['voluntariado']['id'], 'patitas_unah')
+        self.assertEqual(len(data['participants']), 50)
+        self.assertEqual(data['participants'][0]['email'], 'user0@unah.hn')
+
+    def test_lookup_by_pk_and_missing_event(self):
+        data = self.post_json('auth:get_event_participants', {'admin_uid': 'admin-uid', 'event_id': self.event.pk})
+        self.assertEqual(data['participants'], [])
+        data = self.post_json('auth:get_event_participants', {'admin_uid': 'admin-uid', 'event_id': 'nada'})
+        self.assertFalse(data['success'])
+
+
+class RegisterForEventTests(AuthApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        voluntariado = Voluntariado.objects.create(slug='pumas_verdes', name='Pumas Verdes', code='PV1')
+        self.event = Event.objects.create(
+            voluntariado=voluntariado,
+            firestore_id='evt-1',
+            title='Reforestación',
+            event_date=timezone.now() + timedelta(days=7),
+            max_participants=2,
+        )
+        self.users = self.create_users(3)
+
+    def register(self, index, event_id='evt-1'):
+        return self.post_json('auth:register_for_event', {'uid': f'uid-{index}', 'event_id': event_id})
+
+    def test_seats_until_full(self):
+        self.assertEqual(self.register(0)['status'], 'inscrito')
+        self.assertEqual(self.register(1, self.event.pk)['status'], 'inscrito')
+        data = self.register(2)
+        self.assertFalse(data['success'])
+        self.assertEqual(data['status'], 'lleno')
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registered, 2)
+        # la inscripción rechazada se deshace
+        self.assertEqual(self.event.participations.count(), 2)
+
+    def test_waitlist_and_duplicates(self):
+        Event.objects.filter(pk=self.event.pk).update(waitlist=True, max_participants=1)
+        self.assertEqual(self.register(0)['status'], 'inscrito')
+        self.assertEqual(self.register(1)['status'], 'en_espera')
+        self.assertEqual(self.register(0)['status'], 'duplicado')
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registered, 1)
+        statuses = dict(self.event.participations.values_list('user__firebase_uid', 'status'))
+        self.assertEqual(statuses, {'uid-0': 'inscrito', 'uid-1': 'en_espera'})
+
+    def test_admin_inline_recounts_registered(self):
+        self.client.force_login(User.objects.create_superuser('staff', 'staff@unah.hn', 'clave'))
+        now = timezone.localtime()
+        event_date = timezone.localtime(self.event.event_date)
+        response = self.client.post(reverse('admin:auth_firebase_event_change', args=[self.event.pk]), {
+            'firestore_id': 'evt-1', 'voluntariado': self.event.voluntariado_id, 'title': 'Reforestación',
+            'description': '', 'event_date_0': event_date.strftime('%Y-%m-%d'),
+            'event_date_1': event_date.strftime('%H:%M:%S'), 'duration': 2, 'max_participants': 2,
+            'status': 'abierto', 'created_by': '',
+            'created_at_0': now.strftime('%Y-%m-%d'), 'created_at_1': now.strftime('%H:%M:%S'),
+            'participations-TOTAL_FORMS': 2, 'participations-INITIAL_FORMS': 0,
+            **{
+                f'participations-{i}-{name}': value
+                for i, user in enumerate(self.users[:2])
+                for name, value in (
+                    ('user', user.pk), ('status', 'inscrito'),
+                    ('registered_at_0', now.strftime('%Y-%m-%d')), ('registered_at_1', now.strftime('%H:%M:%S')),
+                )
+            },
+        })
+        self.assertEqual(response.status_code, 302)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registered, 2)
+        self.assertEqual(self.register(2)['status'], 'lleno')
+
+    def test_cancellations_free_seats_and_promote_the_waitlist(self):
+        Event.objects.filter(pk=self.event.pk).update(waitlist=True, max_participants=1)
+        self.register(0)
+        self.register(1)
+        self.register(2)
+        self.event.participations.get(user__firebase_uid='uid-2').delete()
+        self.event.participations.get(user__firebase_uid='uid-0').delete()
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registered, 1)
+        self.assertEqual(self.event.participations.get().status, 'inscrito')
+
+        # Al borrar al usuario su inscripción cae en cascada y libera el lugar
+        self.users[1].delete()
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registered, 0)
+        self.assertEqual(self.register(0)['status'], 'inscrito')
+
+    def test_closed_and_past_events(self):
+        Event.objects.filter(pk=self.event.pk).update(status='cerrado')
+        self.assertEqual(self.register(0)['status'], 'cerrado')
+        Event.objects.filter(pk=self.event.pk).update(status='abierto', event_date=timezone.now() - timedelta(days=1))
+        self.assertEqual(self.register(0)['status'], 'cerrado')
+        self.assertEqual(self.register(0, 'nada')['message'], 'Evento no encontrado')
+
+
+class RegisterForEventConcurrencyTests(TransactionTestCase):
+    """Cientos de inscripciones simultáneas nunca superan el cupo"""
+
+    capacity = 50
+    attempts = 200
+
+    def setUp(self):
+        # Cada hilo abre su propia conexión; una base en memoria no se comparte
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest('Requiere una base de pruebas en archivo')
+
+    def test_concurrent_registrations_respect_capacity(self):
+        voluntariado = Voluntariado.objects.create(slug='pumas_unidos', name='Pumas Unidos', code='PU1')
+        event = Event.objects.create(
+            voluntariado=voluntariado,
+            title='Colecta',
+            event_date=timezone.now() + timedelta(days=7),
+            max_participants=self.capacity,
+        )
+        UserStatus.objects.bulk_create([
+            UserStatus(firebase_uid=f'uid-{i}', email=f'user{i}@unah.hn') for i in range(self.attempts)
+        ])
+        barrier = threading.Barrier(self.attempts)
+        results = [None] * self.attempts
+
+        def register(index):
+            client = Client()
+            barrier.wait()
+            try:
+                response = client.post(
+                    reverse('auth:register_for_event'),
+                    data=json.dumps({'uid': f'uid-{index}', 'event_id': event.pk}),
+                    content_type='application/json',
+                )
+                results[index] = response.json().get('status')
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=register, args=(i,)) for i in range(self.attempts)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results.count('inscrito'), self.capacity)
+        self.assertEqual(results.count('lleno'), self.attempts - self.capacity)
+        event.refresh_from_db()
+        self.assertEqual(event.registered, self.capacity)
+        self.assertEqual(event.participations.filter(status='inscrito').count(), self.capacity)
+
+
+class AchievementTests(AuthApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        voluntariado = Voluntariado.objects.create(slug='pumas_verdes', name='Pumas Verdes', code='PV1')
+        self.first = Logro.objects.create(voluntariado=voluntariado, firestore_id='logro-1', name='Primer árbol', points=10, hours=2)
+        self.second = Logro.objects.create(voluntariado=voluntariado, name='Bosque', points=25, hours=5)
+        self.user = self.create_users(1)[0]
+
+    def grant(self, logro_id):
+        return self.post_json('auth:grant_achievement', {'admin_uid': 'admin-uid', 'uid': 'uid-0', 'logro_id': logro_id})
+
+    def summary(self):
+        return self.post_json('auth:get_achievement_summary', {'uid': 'uid-0'})['summary']
+
+    def test_grant_and_revoke_keep_summary_in_sync(self):
+        self.assertTrue(self.grant('logro-1')['success'])
+        self.assertTrue(self.grant(self.second.pk)['success'])
+        self.assertFalse(self.grant('logro-1')['success'])
+        summary = self.summary()
+        self.assertEqual((summary['count'], summary['points'], summary['hours']), (2, 35, 7))
+        self.assertEqual(summary['latest']['name'], 'Bosque')
+
+        data = self.post_json('auth:revoke_achievement', {'admin_uid': 'admin-uid', 'uid': 'uid-0', 'logro_id': self.second.pk})
+        self.assertTrue(data['success'])
+        summary = self.summary()
+        self.assertEqual((summary['count'], summary['points'], summary['hours']), (1, 10, 2))
+        self.assertEqual(summary['latest']['id'], 'logro-1')
+
+        UserAchievement.objects.revoke(self.user, self.first)
+        self.assertEqual(self.summary(), {'count': 0, 'points': 0, 'hours': 0, 'latest': None})
+
+    def test_summary_is_a_single_query(self):
+        self.grant('logro-1')
+        self.grant(self.second.pk)
+        with self.assertNumQueries(1):
+            self.post_json('auth:get_achievement_summary', {'uid': 'uid-0'})
+
+    def test_deleting_a_logro_rebuilds_summaries(self):
+        self.grant('logro-1')
+        self.grant(self.second.pk)
+        self.second.delete()
+        summary = self.summary()
+        self.assertEqual((summary['count'], summary['points']), (1, 10))
+        self.assertEqual(summary['latest']['id'], 'logro-1')
+
+    def test_editing_a_logro_rebuilds_summaries_and_can_still_be_revoked(self):
+        self.grant('logro-1')
+        self.first.points, self.first.hours = 20, 3
+        self.first.save()
+        summary = self.summary()
+        self.assertEqual((summary['points'], summary['hours']), (20, 3))
+
+        self.first.points = 5
+        self.first.save()
+        self.grant(self.second.pk)
+        self.assertEqual(self.summary()['points'], 30)
+        data = self.post_json('auth:revoke_achievement', {'admin_uid': 'admin-uid', 'uid': 'uid-0', 'logro_id': 'logro-1'})
+        self.assertTrue(data['success'])
+        summary = self.summary()
+        self.assertEqual((summary['count'], summary['points'], summary['hours']), (1, 25, 5))
+
+    def test_requires_admin(self):
+        data = self.post_json('auth:grant_achievement', {'admin_uid': 'uid-0', 'uid': 'uid-0', 'logro_id': 'logro-1'})
+        self.assertFalse(data['success'])
+        self.assertFalse(UserAchievement.objects.exists())
+
+
+class FirestoreSyncTests(TestCase):
+    fixture_path = Path(__file__).resolve().parent / 'testdata' / 'firestore_sample.json'
+
+    def setUp(self):
+        user_access_cache.clear()
+
+    def test_full_sync_from_recorded_fixture(self):
+        call_command('sync_firestore', fixtures=str(self.fixture_path), stdout=StringIO())
+
+        ana = UserStatus.objects.get(firebase_uid='uid-ana')
+        self.assertEqual((ana.nombre, ana.estado), ('Ana', 'activo'))
+        self.assertEqual(set(Membership.objects.values_list('user__firebase_uid', 'role')), {
+            ('uid-ana', 'miembro'), ('uid-luis', 'miembro'), ('uid-admin', 'coordinador'),
+        })
+        self.assertEqual(Voluntariado.objects.get(slug='pumas_verdes').code, 'PV2025')
+
+        event = Event.objects.get(firestore_id='evt-reforestacion')
+        self.assertEqual(event.registered, 2)
+        self.assertEqual(event.created_by.firebase_uid, 'uid-admin')
+        self.assertEqual(
+            list(event.participations.filter(attended=True).values_list('user__firebase_uid', flat=True)),
+            ['uid-ana'],
+        )
+        self.assertEqual(Event.objects.get(firestore_id='evt-huerto').status, 'abierto')
+
+        summary = ana.achievement_summary
+        self.assertEqual((summary.count, summary.hours, summary.latest.firestore_id), (1, 2, 'logro-primer-arbol'))
+
+        # Una segunda corrida completa no duplica nada
+        call_command('sync_firestore', full=True, fixtures=str(self.fixture_path), stdout=StringIO())
+        self.assertEqual(UserStatus.objects.count(), 3)
+        self.assertEqual(Participation.objects.count(), 2)
+        self.assertEqual(UserStatus.objects.get(firebase_uid='uid-ana').achievement_summary.count, 1)
+
+    def test_counters_come_from_local_rows(self):
+        docs = {
+            'users': {uid: {'email': f'{uid}@unah.hn', 'voluntariados': {'pumas_verdes': {}}} for uid in ('a', 'b', 'c')},
+            'voluntariados': {'pumas_verdes': {'name': 'Pumas Verdes', 'memberCount': 40}},
+            'eventos': {'evt-1': {
+                'title': 'Reforestación', 'date': '2030-01-01T14:00:00Z', 'voluntariadoId': 'pumas_verdes',
+                'maxParticipants': 2, 'participants': ['a', 'b', 'c'],
+            }},
+        }
+        source = FixtureSource(docs)
+        for name in ('users', 'voluntariados', 'eventos'):
+            sync_collection(source, COLLECTIONS[name])
+        self.assertEqual(Voluntariado.objects.get().member_count, 3)
+        event = Event.objects.get()
+        self.assertEqual(event.registered, 2)
+        self.assertEqual(
+            dict(event.participations.values_list('user__firebase_uid', 'status')),
+            {'a': 'inscrito', 'b': 'inscrito', 'c': 'en_espera'},
+        )
+
+        # Una baja local promueve a la lista de espera y la siguiente corrida no la deshace
+        event.participations.get(user__firebase_uid='a').delete()
+        sync_collection(source, COLLECTIONS['eventos'], full=True)
+        event.refresh_from_db()
+        self.assertEqual(event.registered, 2)
+        self.assertEqual(event.participations.filter(status='inscrito').count(), 2)
+
+    def test_interrupted_run_resumes_from_cursor(self):
+        docs = {'users': {
+            f'uid-{i:03d}': {'email': f'user{i}@unah.hn', 'estado': 'activo'} for i in range(25)
+        }}
+        source = FixtureSource(docs)
+        sync = COLLECTIONS['users']
+
+        self.assertEqual(sync_collection(source, sync, batch_size=10, max_batches=1), 10)
+        checkpoint = SyncCheckpoint.objects.get(collection='users')
+        self.assertTrue(checkpoint.in_progress)
+        self.assertEqual(checkpoint.cursor_id, 'uid-009')
+
+        # La siguiente ejecución continúa después del último documento confirmado
+        self.assertEqual(sync_collection(source, sync, batch_size=10), 15)
+        checkpoint.refresh_from_db()
+        self.assertFalse(checkpoint.in_progress)
+        self.assertIsNotNone(checkpoint.synced_until)
+        self.assertEqual(UserStatus.objects.count(), 25)
+
+    def test_incremental_run_reads_only_updated_documents(self):
+        old = (timezone.now() - timedelta(days=30)).isoformat()
+        docs = {'users': {
+            'uid-a': {'email': 'a@unah.hn', 'estado': 'activo', 'updatedAt': old},
+            'uid-b': {'email': 'b@unah.hn', 'estado': 'activo', 'updatedAt': old},
+        }}
+        source = FixtureSource(docs)
+        sync = COLLECTIONS['users']
+        self.assertEqual(sync_collection(source, sync), 2)
+        self.assertEqual(user_access_cache.get_access('uid-b'), ACCESS_GRANTED)
+
+        docs['users']['uid-b'].update(estado='suspendido', updatedAt=timezone.now().isoformat())
+        self.assertEqual(sync_collection(source, sync), 1)
+        self.assertEqual(UserStatus.objects.get(firebase_uid='uid-b').estado, 'suspendido')
+        # El caché de acceso se invalida aunque bulk_create no dispare post_save
+        self.assertEqual(user_access_cache.get_access('uid-b'), ACCESS_DENIED)
+        self.assertEqual(sync_collection(source, sync, full=True), 2)
+
+    def test_firestore_source_builds_cursor_query(self):
+        query = mock.MagicMock()
+        for method in ('where', 'order_by', 'start_after', 'limit'):
+            getattr(query, method).return_value = query
+        snapshot = mock.Mock(id='uid-1')
+        snapshot.to_dict.return_value = {'email': 'a@unah.hn'}
+        query.stream.return_value = [snapshot]
+        client = mock.Mock()
+        client.collection.return_value = query
+        since = timezone.now()
+
+        docs = FirestoreSource(client).page('users', 50, since=since, after=('uid-0', since))
+
+        self.assertEqual(docs, [('uid-1', {'email': 'a@unah.hn'})])
+        query.order_by.assert_has_calls([mock.call('updatedAt'), mock.call('__name__')])
+        query.start_after.assert_called_once_with({'__name__': 'uid-0', 'updatedAt': since})
+        query.limit.assert_called_once_with(50)
+
+
+class SqlitePragmaTests(TestCase):
+
+    def test_connection_init_applies_pragmas(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Solo aplica a SQLite')
+        with connection.cursor() as cursor:
+            for name in ('journal_mode', 'busy_timeout', 'mmap_size', 'cache_size'):
+                cursor.execute(f'PRAGMA {name}')
+                self.assertEqual(
+                    str(cursor.fetchone()[0]).lower(), str(settings.SQLITE_PRAGMAS[name]).lower(), name
+                )
+
+
+class AsyncApiTests(AuthApiTestCase):
+    """Las APIs asíncronas atendidas por el ASGIHandler (AsyncClient)"""
+
+    async def apost_json(self, url_name, payload):
+        response = await self.async_client.post(
+            reverse(url_name), data=json.dumps(payload), content_type='application/json'
+        )
+        return response.json()
+
+    async def test_register_then_get_status(self):
+        data = await self.apost_json('auth:register_user', {'uid': 'nuevo', 'email': 'nuevo@unah.hn'})
+        self.assertTrue(data['success'])
+        data = await self.apost_json('auth:register_user', {'uid': 'nuevo', 'email': 'nuevo@unah.hn'})
+        self.assertEqual(data['message'], 'Usuario ya registrado')
+        data = await self.apost_json('auth:get_user_status', {'uid': 'nuevo'})
+        self.assertEqual(data['user']['estado'], 'inactivo')
+        self.assertFalse(data['user']['can_access'])
+
+    async def test_update_status_and_list_users(self):
+        await UserStatus.objects.acreate(firebase_uid='uid-0', email='user0@unah.hn')
+        await Membership.objects.acreate(user=await UserStatus.objects.aget(firebase_uid='uid-0'), voluntariado='pumas_verdes')
+        data = await self.apost_json('auth:update_user_status', {
+            'admin_uid': 'admin-uid', 'target_uid': 'uid-0', 'estado': 'activo',
+        })
+        self.assertEqual(data['new_status'], 'activo')
+
+        data = await self.apost_json('auth:get_all_users', {'admin_uid': 'admin-uid', 'estado': 'activo'})
+        self.assertEqual(data['total'], 2)
+        users = {user['firebase_uid']: user for user in data['users']}
+        self.assertEqual(users['uid-0']['voluntariados'], ['pumas_verdes'])
+
+        data = await self.apost_json('auth:update_user_status', {'admin_uid': 'uid-0', 'target_uid': 'uid-0'})
+        self.assertFalse(data['success'])
+
+    async def test_middleware_runs_in_async_mode(self):
+        await UserStatus.objects.acreate(firebase_uid='inactivo-uid', email='x@unah.hn', estado='inactivo')
+        user_access_cache.clear()
+        response = await self.async_client.get(
+            reverse('auth:volunteer_details'), headers={'X-Firebase-UID': 'inactivo-uid'}
+        )
+        self.assertRedirects(response, reverse('auth:inactive_user'), fetch_redirect_response=False)
+        middleware = FirebaseAuthMiddleware(self._async_view)
+        self.assertTrue(iscoroutinefunction(middleware))
+
+    async def _async_view(self, request):
+        return HttpResponse()
+
+    async def test_export_streams_asynchronously(self):
+        await UserStatus.objects.abulk_create([
+            UserStatus(firebase_uid=f'uid-{i}', email=f'user{i}@unah.hn') for i in range(5)
+        ])
+        with mock.patch.object(views, 'EXPORT_CHUNK_SIZE', 2):
+            response = await self.async_client.post(
+                reverse('auth:export_users'),
+                data=json.dumps({'admin_uid': 'admin-uid'}),
+                content_type='application/json',
+            )
+            # Un iterador asíncrono se transmite tal cual; uno síncrono el
+            # ASGIHandler lo consumiría completo antes de enviar
+            self.assertTrue(response.is_async)
+            lines = [line async for line in response.streaming_content]
+        self.assertEqual(len(lines), 6)
+        self.assertEqual({json.loads(line)['firebase_uid'] for line in lines}, {'admin-uid'} | {f'uid-{i}' for i in range(5)})
+
+
+def _route_names():
+    """(nombre, patrón) de cada ruta con nombre de auth_firebase, home y nuestros_voluntariados"""
+    for module in (auth_urls, home_urls, voluntariados_urls):
+        namespace = getattr(module, 'app_name', None)
+        for pattern in module.urlpatterns:
+            if pattern.name:
+                yield (f'{namespace}:{pattern.name}' if namespace else pattern.name), pattern
+
+
+class QueryBudgetTests(AuthApiTestCase):
+    """
+    Presupuesto de consultas SQL de cada ruta, medido con varios tamaños de datos.
+
+    Cada ruta declara cuántas consultas puede hacer como máximo y ese número no
+    debe crecer con la cantidad de usuarios, membresías, inscritos o logros
+    (O(1)). Una ruta nueva sin presupuesto declarado hace fallar la prueba.
+    """
+
+    SIZES = (1, 20, 120)
+
+    # ruta -> consultas máximas, contando SAVEPOINT/RELEASE de las transacciones
+    # anidadas. Las páginas solo consultan el perfil en las rutas protegidas
+    # (FirebaseAuthMiddleware) y la caché de páginas se vacía antes de medir.
+    BUDGETS = {
+        'auth:login': 0,
+        'auth:register': 0,
+        'auth:dashboard': 0,
+        'auth:join_voluntariado': 1,
+        'auth:volunteer_details': 1,
+        'auth:admin_panel': 0,
+        'auth:inactive_user': 0,
+        'auth:verify_token': 0,
+        # ¿existe? + insert
+        'auth:register_user': 2,
+        'auth:get_user_status': 1,
+        # admin + usuario + update
+        'auth:update_user_status': 3,
+        # admin + (UID existentes + update) por lote de BULK_UPDATE_BATCH_SIZE
+        'auth:bulk_update_user_status': 5,
+        # admin + count + página + membresías de la página
+        'auth:get_all_users': 4,
+        # admin + filas + membresías por bloque de EXPORT_CHUNK_SIZE
+        'auth:export_users': 3,
+        # admin + voluntariados + (UID y emails existentes, insert en su
+        # savepoint, cupo y member_count por voluntariado, membresías) por lote
+        'auth:import_users': 12,
+        # usuario + voluntariado + (savepoint, membresía, cupo, member_count actual, release)
+        'auth:join_voluntariado_api': 7,
+        # admin + evento + participantes con su perfil
+        'auth:get_event_participants': 3,
+        'auth:register_for_event': 6,
+        'auth:grant_achievement': 11,
+        'auth:revoke_achievement': 9,
+        # resumen + lista de logros
+        'auth:get_achievement_summary': 2,
+        'home': 0,
+        'reglamento': 0,
+        'errores': 0,
+        'unirse': 0,
+        'eventos': 0,
+        'metrics': 0,
+        'nuestros_voluntariados:home': 1,
+        'nuestros_voluntariados:detalle': 1,
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.voluntariado = Voluntariado.objects.create(slug='pumas_verdes', name='Pumas Verdes', code='PV1')
+        self.event = Event.objects.create(
+            voluntariado=self.voluntariado,
+            firestore_id='evt-1',
+            title='Reforestación',
+            event_date=timezone.now() + timedelta(days=7),
+        )
+        self.logro = Logro.objects.create(voluntariado=self.voluntariado, firestore_id='logro-1', name='Primer árbol', points=10)
+        self.nuevo_logro = Logro.objects.create(voluntariado=self.voluntariado, firestore_id='logro-2', name='Bosque')
+        # Usuario sin membresías, inscripciones ni logros para las rutas que los crean
+        UserStatus.objects.create(firebase_uid='nuevo-uid', email='nuevo@unah.hn', estado='activo')
+        self.users = []
+
+    def grow(self, size):
+        """Agrega usuarios hasta tener size, cada uno miembro, inscrito y con un logro"""
+        base = timezone.now() - timedelta(days=1)
+        users = UserStatus.objects.bulk_create([
+            UserStatus(
+                firebase_uid=f'uid-{i}',
+                email=f'user{i}@unah.hn',
+                estado='activo',
+                fecha_registro=base + timedelta(minutes=i),
+            )
+            for i in range(len(self.users), size)
+        ])
+        self.users += users
+        Membership.objects.bulk_create([Membership(user=user, voluntariado='pumas_verdes') for user in users])
+        Participation.objects.bulk_create([Participation(event=self.event, user=user) for user in users])
+        UserAchievement.objects.bulk_create([UserAchievement(user=user, logro=self.logro) for user in users])
+        UserAchievement.objects.rebuild_summaries([user.pk for user in users])
+        Event.objects.filter(pk=self.event.pk).update(registered=size)
+
+    def call(self, name, pattern):
+        """Hace la petición de ejemplo de la ruta y devuelve la respuesta"""
+        api = {
+            'auth:verify_token': {},
+            'auth:register_user': {'uid': 'otro-uid', 'email': 'otro@unah.hn'},
+            'auth:get_user_status': {'uid': 'uid-0'},
+            'auth:update_user_status': {'admin_uid': 'admin-uid', 'target_uid': 'uid-0', 'estado': 'suspendido'},
+            'auth:bulk_update_user_status': {
+                'admin_uid': 'admin-uid', 'target_uids': [f'uid-{i}' for i in range(len(self.users))], 'estado': 'suspendido',
+            },
+            'auth:get_all_users': {'admin_uid': 'admin-uid', 'limit': 500},
+            'auth:export_users': {'admin_uid': 'admin-uid'},
+            'auth:join_voluntariado_api': {'uid': 'nuevo-uid', 'code': 'PV1'},
+            'auth:get_event_participants': {'admin_uid': 'admin-uid', 'event_id': 'evt-1'},
+            'auth:register_for_event': {'uid': 'nuevo-uid', 'event_id': 'evt-1'},
+            'auth:grant_achievement': {'admin_uid': 'admin-uid', 'uid': 'nuevo-uid', 'logro_id': 'logro-2'},
+            'auth:revoke_achievement': {'admin_uid': 'admin-uid', 'uid': 'uid-0', 'logro_id': 'logro-1'},
+            'auth:get_achievement_summary': {'uid': 'uid-0', 'include_list': True},
+        }
+        if name in api:
+            return self.client.post(reverse(name), data=json.dumps(api[name]), content_type='application/json')
+        if name == 'auth:import_users':
+            roster = 'firebase_uid,email,voluntariados\n' + ''.join(
+                f'csv-{i},csv{i}@unah.hn,pumas_verdes\n' for i in range(30)
+            )
+            upload = SimpleUploadedFile('roster.csv', roster.encode(), content_type='text/csv')
+            return self.client.post(reverse(name), {'admin_uid': 'admin-uid', 'file': upload})
+        kwargs = {'slug': 'pumas_verdes'} if pattern.pattern.converters else {}
+        headers = {'X-Firebase-UID': 'admin-uid' if name == 'auth:admin_panel' else 'uid-0'}
+        return self.client.get(reverse(name, kwargs=kwargs), headers=headers)
+
+    def budget_for(self, name, pattern):
+        # Las rutas por nombre de cada voluntariado las atiende "detalle"
+        if 'slug' in pattern.default_args:
+            name = 'nuestros_voluntariados:detalle'
+        self.assertIn(name, self.BUDGETS, f'La ruta {name} no declara su presupuesto de consultas')
+        return self.BUDGETS[name]
+
+    def measure(self, name, pattern):
+        """Consultas de una petición, deshaciendo sus cambios para la siguiente"""
+        cache.clear()
+        user_access_cache.clear()
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.call(name, pattern)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+            transaction.set_rollback(True)
+        self.assertLess(response.status_code, 500, name)
+        if response.get('Content-Type') == 'application/json':
+            # verify_token responde con "valid" en vez de "success"
+            self.assertTrue(response.json().get('success', True), f'{name}: {response.json()}')
+        return [query['sql'] for query in queries.captured_queries]
+
+    def test_every_route_within_budget_and_constant(self):
+        routes = list(_route_names())
+        counts = {name: [] for name, pattern in routes}
+        for size in self.SIZES:
+            self.grow(size)
+            for name, pattern in routes:
+                budget = self.budget_for(name, pattern)
+                queries = self.measure(name, pattern)
+                counts[name].append(len(queries))
+                self.assertLessEqual(
+                    len(queries), budget,
+                    f'{name} con {size} usuarios hizo {len(queries)} consultas (presupuesto {budget}):\n'
+                    + '\n'.join(queries),
+                )
+                if len(counts[name]) > 1 and len(queries) != counts[name][0]:
+                    self.fail(
+                        f'{name} crece con los datos: {counts[name]} consultas para {self.SIZES}:\n'
+                        + '\n'.join(queries)
+                    )
+
+
+class SyntheticDataTests(TestCase):
+
+    def test_generate_is_reproducible_and_respects_capacity(self):
+        dataset = Dataset(users=300, events=12, voluntariados=3)
+        created = generate(dataset, batch_size=64, seed=7)
+        self.assertEqual(created['users'], 300)
+        self.assertEqual(UserStatus.objects.filter(firebase_uid__startswith='synthetic-').count(), 301)
+        self.assertEqual(Membership.objects.count(), created['memberships'])
+        for event in Event.objects.annotate(total=Count('participations')):
+            self.assertEqual(event.registered, event.total)
+            if event.max_participants is not None:
+                self.assertLessEqual(event.total, event.max_participants)
+        for voluntariado in Voluntariado.objects.all():
+            self.assertEqual(voluntariado.member_count, Membership.objects.filter(voluntariado=voluntariado.slug).count())
+        estados = dict(UserStatus.objects.values_list('firebase_uid', 'estado'))
+
+        call_command('generate_synthetic_data', users=300, events=12, voluntariados=3, batch_size=64, seed=7,
+                     clear=True, stdout=StringIO())
+        self.assertEqual(dict(UserStatus.objects.values_list('firebase_uid', 'estado')), estados)
+        self.assertEqual(Membership.objects.count(), created['memberships'])
+
+
+class LoadDriverTests(LiveServerTestCase):
+
+    def test_report_has_percentiles_per_route(self):
+        dataset = Dataset(users=50, events=5, voluntariados=2)
+        generate(dataset, seed=1)
+        latencies, errors, elapsed = run_load(self.live_server_url, dataset, concurrency=4, requests=15, seed=1)
+        report = summarize(latencies, errors, elapsed)
+        self.assertEqual(report['total']['requests'] + report['total']['errors'], 60)
+        self.assertEqual(report['total']['errors'], 0)
+        for route in report['routes'].values():
+            self.assertLessEqual(route['p50_ms'], route['p95_ms'])
+            self.assertLessEqual(route['p95_ms'], route['p99_ms'])
+
+
+class ImportUsersTests(AuthApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        Voluntariado.objects.create(slug='pumas_verdes', name='Pumas Verdes', code='PV1')
+        UserStatus.objects.create(firebase_uid='existente', email='existente@unah.hn')
+
+    def upload(self, text, **extra):
+        upload = SimpleUploadedFile('roster.csv', text.encode('utf-8-sig'), content_type='text/csv')
+        response = self.client.post(reverse('auth:import_users'), {'admin_uid': 'admin-uid', 'file': upload, **extra})
+        return response.json()
+
+    def test_counts_created_skipped_and_invalid(self):
+        data = self.upload(
+            'UID,Correo,nombre,estado,voluntariados\n'
+            'nuevo-1,Nuevo1@unah.hn,Ana,activo,pumas_verdes\n'
+            'nuevo-2,nuevo2@unah.hn,Luis,,\n'
+            'existente,otro@unah.hn,,,\n'
+            'nuevo-3,existente@unah.hn,,,\n'
+            'nuevo-1,repetido@unah.hn,,,\n'
+            'nuevo-4,no-es-email,,,\n'
+            'nuevo-5,nuevo5@unah.hn,,jefe,desconocido\n',
+            voluntariado='pumas_verdes',
+        )
+        self.assertTrue(data['success'])
+        self.assertEqual((data['created'], data['skipped'], data['invalid']), (2, 3, 2))
+        self.assertEqual([error['line'] for error in data['errors']], [7, 8])
+        self.assertEqual(len(data['errors'][1]['errors']), 2)
+
+        user = UserStatus.objects.get(firebase_uid='nuevo-1')
+        self.assertEqual((user.email, user.nombre, user.estado), ('nuevo1@unah.hn', 'Ana', 'activo'))
+        self.assertEqual(UserStatus.objects.get(firebase_uid='nuevo-2').estado, 'inactivo')
+        self.assertEqual(list(Membership.objects.values_list('user__firebase_uid', flat=True).order_by('user__firebase_uid')), ['nuevo-1', 'nuevo-2'])
+        self.assertEqual(Voluntariado.objects.get(slug='pumas_verdes').member_count, 2)
+
+    def test_rejects_non_admin_and_missing_columns(self):
+        upload = SimpleUploadedFile('roster.csv', b'firebase_uid,email\n')
+        data = self.client.post(reverse('auth:import_users'), {'admin_uid': 'existente', 'file': upload}).json()
+        self.assertFalse(data['success'])
+        data = self.upload('uid,nombre\nx,y\n')
+        self.assertEqual(data['message'], 'Faltan columnas: email')
+        data = self.upload('uid,email\n', voluntariado='no_existe')
+        self.assertFalse(data['success'])
+
+    def test_imported_users_are_not_cached_as_unregistered(self):
+        user_access_cache.clear()
+        self.client.get(reverse('auth:volunteer_details'), headers={'X-Firebase-UID': 'nuevo-1'})
+        self.upload('uid,email,estado\nnuevo-1,nuevo1@unah.hn,inactivo\n')
+        response = self.client.get(reverse('auth:volunteer_details'), headers={'X-Firebase-UID': 'nuevo-1'})
+        self.assertRedirects(response, reverse('auth:inactive_user'), fetch_redirect_response=False)
+
+    def test_memberships_respect_max_members(self):
+        Voluntariado.objects.filter(slug='pumas_verdes').update(max_members=2, member_count=1)
+        data = self.upload(
+            'uid,email\nnuevo-1,nuevo1@unah.hn\nnuevo-2,nuevo2@unah.hn\nnuevo-3,nuevo3@unah.hn\n',
+            voluntariado='pumas_verdes',
+        )
+        self.assertEqual((data['created'], data['over_capacity']), (3, 2))
+        self.assertEqual(data['errors'], [
+            {'line': 3, 'errors': ['voluntariado sin cupo: pumas_verdes']},
+            {'line': 4, 'errors': ['voluntariado sin cupo: pumas_verdes']},
+        ])
+        self.assertIn('2 membresías sin cupo', data['message'])
+        self.assertEqual(Voluntariado.objects.get(slug='pumas_verdes').member_count, 2)
+        self.assertEqual(list(Membership.objects.values_list('user__firebase_uid', flat=True)), ['nuevo-1'])
+
+    def test_existing_emails_match_case_insensitively(self):
+        UserStatus.objects.create(firebase_uid='mayusculas', email='Foo@unah.hn')
+        result = import_users(['firebase_uid,email', 'nuevo-1,foo@unah.hn', 'nuevo-2,FOO2@unah.hn'])
+        self.assertEqual((result.created, result.skipped), (1, 1))
+
+    def test_user_registered_during_import_is_not_counted_as_created(self):
+        original = UserStatus.objects.annotate
+
+        def register_during_import(*args, **kwargs):
+            # Simula un register_user que llega después de leer los UID existentes
+            UserStatus.objects.create(firebase_uid='carrera', email='carrera@unah.hn')
+            return original(*args, **kwargs)
+
+        with mock.patch.object(UserStatus.objects, 'annotate', side_effect=register_during_import):
+            result = import_users(['uid,email,voluntariados', 'carrera,carrera@unah.hn,pumas_verdes', 'nuevo-1,nuevo1@unah.hn,pumas_verdes'])
+        self.assertEqual((result.created, result.skipped), (1, 1))
+        self.assertEqual(Membership.objects.get().user.firebase_uid, 'nuevo-1')
+        self.assertEqual(Voluntariado.objects.get(slug='pumas_verdes').member_count, 1)
+
+    def test_command_streams_in_batches(self):
+        rows = ''.join(f'lote-{i},lote{i}@unah.hn\n' for i in range(25))
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8') as roster:
+            roster.write('firebase_uid,email\n' + rows + 'lote-0,lote0@unah.hn\n')
+        self.addCleanup(os.remove, roster.name)
+        output = StringIO()
+        call_command('import_users', roster.name, batch_size=10, stdout=output)
+        self.assertIn('25 usuarios creados, 1 omitidos y 0 filas no válidas', output.getvalue())
+        self.assertEqual(import_users(['firebase_uid,email', 'lote-1,lote1@unah.hn']).skipped, 1)
+
+
+class ApiLayerTests(AuthApiTestCase):
+
+    def test_invalid_bodies_share_the_error_payload(self):
+        data = self.post_json('auth:get_all_users', {
+            'admin_uid': 'admin-uid', 'limit': 'diez', 'fields': ['email', 'password'],
+            'fecha_desde': 'ayer', 'include_total': 'no',
+        })
+        self.assertFalse(data['success'])
+        self.assertEqual(data['errors'], {
+            'limit': 'debe ser un número entero',
+            'fields': 'valores no permitidos: password',
+            'include_total': 'debe ser true o false',
+            'fecha_desde': 'debe ser una fecha ISO válida',
+        })
+        self.assertIn('limit: debe ser un número entero', data['message'])
+
+        data = self.post_json('auth:register_for_event', {'uid': 'x', 'event_id': True})
+        self.assertEqual(data['errors'], {'event_id': 'debe ser texto o un número entero'})
+        data = self.post_json('auth:get_user_status', {})
+        self.assertEqual(data, {'success': False, 'message': 'uid: requerido', 'errors': {'uid': 'requerido'}})
+
+    def test_method_and_malformed_json(self):
+        self.assertEqual(self.client.get(reverse('auth:get_user_status')).json()['message'], 'Método no permitido')
+        response = self.client.post(reverse('auth:get_user_status'), data='{uid', content_type='application/json')
+        self.assertEqual(response.json()['message'], 'El cuerpo no es JSON válido')
+        response = self.client.post(reverse('auth:verify_token'), data='[]', content_type='application/json')
+        self.assertEqual(response.json(), {'valid': False, 'message': 'El cuerpo debe ser un objeto JSON'})
+
+    def test_schema_applies_defaults_and_drops_unknown_fields(self):
+        schema = Schema(uid=Field(required=True), limit=Field(int, default=50), ids=Field(list, items=(str, int)))
+        cleaned, errors = schema.validate({'uid': 'a', 'limit': '20', 'ids': ['x', 3], 'extra': 1})
+        self.assertEqual((cleaned, errors), ({'uid': 'a', 'limit': 20, 'ids': ['x', 3]}, {}))
+        cleaned, errors = schema.validate({'uid': '', 'ids': [None]})
+        self.assertEqual(errors, {'uid': 'requerido', 'ids': 'contiene valores de tipo no válido'})
+
+    def test_stdlib_fallback_encodes_the_same_bytes(self):
+        spec = importlib.util.spec_from_file_location('api_sin_orjson', Path(api.__file__))
+        fallback = importlib.util.module_from_spec(spec)
+        with mock.patch.dict(sys.modules, {'orjson': None}):
+            spec.loader.exec_module(fallback)
+        self.assertIsNone(fallback.orjson)
+        payload = {'nombre': 'Núñez', 'fecha': timezone.now(), 'ids': [1, 2.5, None, True], 1: 'clave'}
+        self.assertEqual(fallback.dumps(payload), api.dumps(payload))
+        self.assertEqual(fallback.loads(api.dumps(payload)), api.loads(fallback.dumps(payload)))
+
+    def test_async_views_stay_async(self):
+        self.assertTrue(iscoroutinefunction(views.get_all_users))
+        self.assertFalse(iscoroutinefunction(views.export_users))
+        self.assertTrue(views.get_all_users.csrf_exempt)
@@ -0,0 +1,185 @@
+"""
+Verificación de ID tokens de Firebase en el servidor.
+
+Los certificados públicos de Google se descargan una vez y se reutilizan
+hasta que vence el max-age de su Cache-Control; los tokens ya verificados se
+guardan unos segundos por hash, así la mayoría de las verificaciones no hacen
+ninguna petición de red ni validan la firma otra vez.
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+import urllib.request
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.x509 import load_pem_x509_certificate
+from django.conf import settings
+
+from .cache import TTLCache
+
+FIREBASE_CERTS_URL = (
+    'https://www.googleapis.com/robot/v1/metadata/x509/'
+    'securetoken@system.gserviceaccount.com'
+)
+DEFAULT_CERTS_MAX_AGE = 3600
+# Si la descarga falla con llaves vencidas, segundos antes de reintentarla
+CERTS_RETRY_DELAY = 60
+_MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+
+class InvalidTokenError(ValueError):
+    """El token no es un ID token de Firebase válido para este proyecto"""
+
+
+def _load_public_key(value):
+    """Acepta certificados x509 o llaves públicas en PEM, o llaves ya cargadas"""
+    if not isinstance(value, (str, bytes)):
+        return value
+    pem = value.encode() if isinstance(value, str) else value
+    if b'CERTIFICATE' in pem:
+        return load_pem_x509_certificate(pem).public_key()
+    return serialization.load_pem_public_key(pem)
+
+
+class StaticKeySource:
+    """Conjunto fijo de llaves {kid: llave}, útil para pruebas sin red"""
+
+    def __init__(self, keys):
+        self.keys = {kid: _load_public_key(key) for kid, key in keys.items()}
+
+    def get_keys(self):
+        return self.keys
+
+
+class GoogleCertificateSource:
+    """Descarga los certificados de firma de Firebase respetando Cache-Control"""
+
+    def __init__(self, url=FIREBASE_CERTS_URL, timeout=10):
+        self.url = url
+        self.timeout = timeout
+        self._keys = None
+        self._expires = 0
+        self._lock = threading.Lock()
+
+    def get_keys(self):
+        if self._keys is not None and time.monotonic() < self._expires:
+            return self._keys
+        with self._lock:
+            # Otro hilo pudo refrescar las llaves mientras se esperaba el lock
+            if self._keys is None or time.monotonic() >= self._expires:
+                self._refresh()
+            return self._keys
+
+    def _refresh(self):
+        try:
+            with urllib.request.urlopen(self.url, timeout=self.timeout) as response:
+                certificates = json.loads(response.read())
+                cache_control = response.headers.get('Cache-Control', '')
+            if not isinstance(certificates, dict):
+                raise ValueError('la respuesta no es un objeto JSON')
+            keys = {kid: _load_public_key(cert) for kid, cert in certificates.items()}
+        except (OSError, ValueError) as e:
+            # ValueError cubre un cuerpo que no es JSON o certificados mal formados
+            if self._keys is not None:
+                # Mejor usar llaves vencidas que rechazar todos los tokens; se
+                # reintenta más tarde para no bloquear cada verificación con
+                # una descarga que espera el timeout completo
+                self._expires = time.monotonic() + CERTS_RETRY_DELAY
+                return
+            raise InvalidTokenError(f'No se pudieron obtener los certificados de Firebase: {e}')
+        match = _MAX_AGE_RE.search(cache_control)
+        max_age = int(match.group(1)) if match else DEFAULT_CERTS_MAX_AGE
+        self._keys = keys
+        self._expires = time.monotonic() + max_age
+
+
+class FirebaseTokenVerifier:
+    """
+    Verifica ID tokens de Firebase (RS256) contra las llaves de key_source.
+
+    Los claims de cada token verificado se guardan por SHA-256 del token
+    durante token_cache_ttl segundos, sin pasar de la expiración del token.
+    """
+
+    def __init__(self, project_id, key_source=None, token_cache_ttl=60,
+                 token_cache_size=10000, leeway=5):
+        self.project_id = project_id
+        self.issuer = f'https://securetoken.google.com/{project_id}'
+        self.key_source = key_source or GoogleCertificateSource()
+        self.leeway = leeway
+        self.token_cache_ttl = token_cache_ttl
+        self._verified = TTLCache(token_cache_ttl, token_cache_size)
+
+    def verify(self, token):
+        """Devuelve los claims del token o lanza InvalidTokenError"""
+        if not token or not isinstance(token, str):
+            raise InvalidTokenError('Token requerido')
+
+        token_hash = hashlib.sha256(token.encode()).hexdigest()
+        claims = self._verified.get(token_hash)
+        if claims is not None:
+            if claims['exp'] + self.leeway > time.time():
+                return claims
+            self._verified.delete(token_hash)
+
+        claims = self._decode(token)
+        self._verified.set(token_hash, claims)
+        return claims
+
+    def _decode(self, token):
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.PyJWTError:
+            raise InvalidTokenError('Token con formato inválido')
+        if header.get('alg') != 'RS256':
+            raise InvalidTokenError('Algoritmo de firma no permitido')
+
+        key = self.key_source.get_keys().get(header.get('kid'))
+        if key is None:
+            raise InvalidTokenError('Token firmado con una llave desconocida')
+
+        try:
+            claims = jwt.decode(
+                token,
+                key=key,
+                algorithms=['RS256'],
+                audience=self.project_id,
+                issuer=self.issuer,
+                leeway=self.leeway,
+                options={'require': ['exp', 'iat', 'sub', 'aud', 'iss']},
+            )
+        except jwt.ExpiredSignatureError:
+            raise InvalidTokenError('Token expirado')
+        except jwt.PyJWTError as e:
+            raise InvalidTokenError(f'Token inválido: {e}')
+
+        subject = claims.get('sub')
+        if not isinstance(subject, str) or not subject or len(subject) > 128:
+            raise InvalidTokenError('El token no tiene un UID válido')
+        return claims
+
+
+_verifier = None
+_verifier_lock = threading.Lock()
+
+
+def get_token_verifier():
+    """Devuelve el verificador del proyecto configurado en FIREBASE_PROJECT_ID"""
+    global _verifier
+    if _verifier is None:
+        with _verifier_lock:
+            if _verifier is None:
+                _verifier = FirebaseTokenVerifier(
+                    settings.FIREBASE_PROJECT_ID,
+                    token_cache_ttl=getattr(settings, 'FIREBASE_TOKEN_CACHE_TTL', 60),
+                )
+    return _verifier
+
+
+def set_token_verifier(verifier):
+    """Reemplaza el verificador global, por ejemplo con llaves locales en pruebas"""
+    global _verifier
+    _verifier = verifier
@@ -17,5 +17,14 @@ urlpatterns = [
     path('api/register-user/', views.register_user, name='register_user'),
     path('api/get-user-status/', views.get_user_status, name='get_user_status'),
     path('api/update-user-status/', views.update_user_status, name='update_user_status'),
+    path('api/bulk-update-user-status/', views.bulk_update_user_status, name='bulk_update_user_status'),
     path('api/get-all-users/', views.get_all_users, name='get_all_users'),
+    path('api/export-users/', views.export_users, name='export_users'),
+    path('api/import-users/', views.import_users, name='import_users'),
+    path('api/join-voluntariado/', views.join_voluntariado, name='join_voluntariado_api'),
+    path('api/get-event-participants/', views.get_event_participants, name='get_event_participants'),
+    path('api/register-event/', views.register_for_event, name='register_for_event'),
+    path('api/grant-achievement/', views.grant_achievement, name='grant_achievement'),
+    path('api/revoke-achievement/', views.revoke_achievement, name='revoke_achievement'),
+    path('api/get-achievement-summary/', views.get_achievement_summary, name='get_achievement_summary'),
 ]
@@ -1,12 +1,34 @@
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.views.decorators.csrf import csrf_exempt
-from django.http import JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
 from django.contrib.auth.decorators import login_required
 from django.utils.decorators import method_decorator
 from django.views.decorators.http import require_http_methods
+from django.db import IntegrityError, transaction
+from django.db.models import F, Prefetch, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from datetime import datetime, time
+import base64
+import csv
+import io
+from itertools import islice
 import json
-from .models import UserStatus
+from .api import ApiResponse, Field, Schema, api_endpoint, api_error, dumps
+from .models import (
+    AchievementSummary,
+    Event,
+    Logro,
+    Membership,
+    Participation,
+    UserAchievement,
+    UserStatus,
+    Voluntariado,
+)
+from .onboarding import import_users as import_users_csv
+from .tokens import get_token_verifier
 
 def login_view(request):
     """Vista para mostrar el formulario de inicio de sesión"""
@@ -36,182 +58,772 @@ def inactive_user_view(request):
     """Vista para usuarios inactivos"""
     return render(request, 'auth/inactive-user.html')
 
-@csrf_exempt
-def verify_token(request):
-    """Endpoint para verificar tokens de Firebase (opcional para validación del lado del servidor)"""
-    if request.method == 'POST':
-        try:
-            data = json.loads(request.body)
-            token = data.get('token')
-            # Aquí podrías verificar el token con Firebase Admin SDK
-            # Por ahora solo retornamos éxito
-            return JsonResponse({'valid': True, 'message': 'Token válido'})
-        except Exception as e:
-            return JsonResponse({'valid': False, 'message': str(e)})
-    
-    return JsonResponse({'valid': False, 'message': 'Método no permitido'})
-
-@csrf_exempt
-def register_user(request):
+@api_endpoint(Schema(token=Field(required=True)), status_key='valid')
+def verify_token(request, data):
+    """Endpoint para verificar ID tokens de Firebase del lado del servidor"""
+    claims = get_token_verifier().verify(data['token'])
+    return ApiResponse({
+        'valid': True,
+        'message': 'Token válido',
+        'uid': claims['sub'],
+        'email': claims.get('email'),
+        'email_verified': claims.get('email_verified', False),
+        'exp': claims['exp'],
+    })
+
+
+@api_endpoint(Schema(
+    uid=Field(required=True, max_length=128),
+    email=Field(required=True, max_length=254),
+    nombre=Field(default='', max_length=100),
+    apellido=Field(default='', max_length=100),
+))
+async def register_user(request, data):
     """Endpoint para registrar un nuevo usuario en el sistema"""
-    if request.method == 'POST':
-        try:
-            data = json.loads(request.body)
-            firebase_uid = data.get('uid')
-            email = data.get('email')
-            nombre = data.get('nombre', '')
-            apellido = data.get('apellido', '')
-            
-            if not firebase_uid or not email:
-                return JsonResponse({'success': False, 'message': 'UID y email son requeridos'})
-            
-            # Verificar si el usuario ya existe
-            if UserStatus.objects.filter(firebase_uid=firebase_uid).exists():
-                return JsonResponse({'success': False, 'message': 'Usuario ya registrado'})
-            
-            # Crear nuevo usuario con estado inactivo por defecto
-            user_status = UserStatus.objects.create(
-                firebase_uid=firebase_uid,
-                email=email,
-                nombre=nombre,
-                apellido=apellido,
-                estado='inactivo',  # Estado inicial inactivo
-                rol='usuario'       # Rol por defecto
-            )
-            
-            return JsonResponse({
-                'success': True, 
-                'message': 'Usuario registrado exitosamente',
-                'user_id': user_status.id,
-                'estado': user_status.estado
-            })
-            
-        except Exception as e:
-            return JsonResponse({'success': False, 'message': str(e)})
-    
-    return JsonResponse({'success': False, 'message': 'Método no permitido'})
-
-@csrf_exempt
-def get_user_status(request):
+    firebase_uid = data['uid']
+    
+    # Verificar si el usuario ya existe
+    if await UserStatus.objects.filter(firebase_uid=firebase_uid).aexists():
+        return api_error('Usuario ya registrado')
+    
+    # Crear nuevo usuario con estado inactivo por defecto
+    user_status = await UserStatus.objects.acreate(
+        firebase_uid=firebase_uid,
+        email=data['email'],
+        nombre=data['nombre'],
+        apellido=data['apellido'],
+        estado='inactivo',  # Estado inicial inactivo
+        rol='usuario'       # Rol por defecto
+    )
+    
+    return ApiResponse({
+        'success': True, 
+        'message': 'Usuario registrado exitosamente',
+        'user_id': user_status.id,
+        'estado': user_status.estado
+    })
+
+
+@api_endpoint(Schema(uid=Field(required=True)))
+async def get_user_status(request, data):
     """Endpoint para obtener el estado de un usuario"""
-    if request.method == 'POST':
-        try:
-            data = json.loads(request.body)
-            firebase_uid = data.get('uid')
-            
-            if not firebase_uid:
-                return JsonResponse({'success': False, 'message': 'UID requerido'})
-            
-            try:
-                user_status = UserStatus.objects.get(firebase_uid=firebase_uid)
-                return JsonResponse({
-                    'success': True,
-                    'user': {
-                        'id': user_status.id,
-                        'email': user_status.email,
-                        'nombre': user_status.nombre,
-                        'apellido': user_status.apellido,
-                        'estado': user_status.estado,
-                        'rol': user_status.rol,
-                        'fecha_registro': user_status.fecha_registro.isoformat(),
-                        'can_access': user_status.can_access_voluntariados()
-                    }
-                })
-            except UserStatus.DoesNotExist:
-                return JsonResponse({'success': False, 'message': 'Usuario no encontrado'})
-                
-        except Exception as e:
-            return JsonResponse({'success': False, 'message': str(e)})
-    
-    return JsonResponse({'success': False, 'message': 'Método no permitido'})
-
-@csrf_exempt
-def update_user_status(request):
+    try:
+        user_status = await UserStatus.objects.aget(firebase_uid=data['uid'])
+    except UserStatus.DoesNotExist:
+        return api_error('Usuario no encontrado')
+    return ApiResponse({
+        'success': True,
+        'user': {
+            'id': user_status.id,
+            'email': user_status.email,
+            'nombre': user_status.nombre,
+            'apellido': user_status.apellido,
+            'estado': user_status.estado,
+            'rol': user_status.rol,
+            'fecha_registro': user_status.fecha_registro.isoformat(),
+            'can_access': user_status.can_access_voluntariados()
+        }
+    })
+
+
+@api_endpoint(Schema(
+    admin_uid=Field(required=True),
+    target_uid=Field(required=True),
+    estado=Field(choices=dict(UserStatus.STATUS_CHOICES)),
+    rol=Field(choices=dict(UserStatus.ROLE_CHOICES)),
+))
+async def update_user_status(request, data):
     """Endpoint para actualizar el estado de un usuario (solo administradores)"""
-    if request.method == 'POST':
-        try:
-            data = json.loads(request.body)
-            admin_uid = data.get('admin_uid')
-            target_uid = data.get('target_uid')
-            new_status = data.get('estado')
-            new_role = data.get('rol')
-            
-            if not admin_uid or not target_uid:
-                return JsonResponse({'success': False, 'message': 'UIDs requeridos'})
-            
-            # Verificar que el administrador existe y es admin
-            try:
-                admin_user = UserStatus.objects.get(firebase_uid=admin_uid)
-                if not admin_user.is_admin:
-                    return JsonResponse({'success': False, 'message': 'No tienes permisos de administrador'})
-            except UserStatus.DoesNotExist:
-                return JsonResponse({'success': False, 'message': 'Administrador no encontrado'})
-            
-            # Actualizar el usuario objetivo
-            try:
-                target_user = UserStatus.objects.get(firebase_uid=target_uid)
-                if new_status:
-                    target_user.estado = new_status
-                if new_role:
-                    target_user.rol = new_role
-                target_user.save()
-                
-                return JsonResponse({
-                    'success': True,
-                    'message': 'Estado actualizado exitosamente',
-                    'new_status': target_user.estado,
-                    'new_role': target_user.rol
-                })
-            except UserStatus.DoesNotExist:
-                return JsonResponse({'success': False, 'message': 'Usuario objetivo no encontrado'})
-                
-        except Exception as e:
-            return JsonResponse({'success': False, 'message': str(e)})
-    
-    return JsonResponse({'success': False, 'message': 'Método no permitido'})
-
-@csrf_exempt
-def get_all_users(request):
-    """Endpoint para obtener todos los usuarios (solo administradores)"""
-    if request.method == 'POST':
-        try:
-            data = json.loads(request.body)
-            admin_uid = data.get('admin_uid')
-            
-            if not admin_uid:
-                return JsonResponse({'success': False, 'message': 'UID de administrador requerido'})
-            
-            # Verificar que el usuario es administrador
-            try:
-                admin_user = UserStatus.objects.get(firebase_uid=admin_uid)
-                if not admin_user.is_admin:
-                    return JsonResponse({'success': False, 'message': 'No tienes permisos de administrador'})
-            except UserStatus.DoesNotExist:
-                return JsonResponse({'success': False, 'message': 'Administrador no encontrado'})
-            
-            # Obtener todos los usuarios
-            users = UserStatus.objects.all()
-            users_data = []
-            for user in users:
-                users_data.append({
-                    'id': user.id,
-                    'firebase_uid': user.firebase_uid,
-                    'email': user.email,
-                    'nombre': user.nombre,
-                    'apellido': user.apellido,
-                    'estado': user.estado,
-                    'rol': user.rol,
-                    'fecha_registro': user.fecha_registro.isoformat(),
-                    'fecha_ultima_actividad': user.fecha_ultima_actividad.isoformat(),
-                    'voluntariados': user.voluntariados
-                })
-            
-            return JsonResponse({
-                'success': True,
-                'users': users_data
-            })
-                
-        except Exception as e:
-            return JsonResponse({'success': False, 'message': str(e)})
-    
-    return JsonResponse({'success': False, 'message': 'Método no permitido'})
\ No newline at end of file
+    # Verificar que el administrador existe y es admin
+    admin_error = await _acheck_admin(data['admin_uid'])
+    if admin_error:
+        return admin_error
+    
+    # Actualizar el usuario objetivo
+    try:
+        target_user = await UserStatus.objects.aget(firebase_uid=data['target_uid'])
+    except UserStatus.DoesNotExist:
+        return api_error('Usuario objetivo no encontrado')
+    if data['estado']:
+        target_user.estado = data['estado']
+    if data['rol']:
+        target_user.rol = data['rol']
+    await target_user.asave()
+    
+    return ApiResponse({
+        'success': True,
+        'message': 'Estado actualizado exitosamente',
+        'new_status': target_user.estado,
+        'new_role': target_user.rol
+    })
+
+
+BULK_UPDATE_MAX_USERS = 1000
+BULK_UPDATE_BATCH_SIZE = 500
+
+
+@api_endpoint(Schema(
+    admin_uid=Field(required=True),
+    target_uids=Field(list, required=True, items=(str, int), max_items=BULK_UPDATE_MAX_USERS),
+    estado=Field(choices=dict(UserStatus.STATUS_CHOICES)),
+    rol=Field(choices=dict(UserStatus.ROLE_CHOICES)),
+))
+def bulk_update_user_status(request, data):
+    """
+    Endpoint para cambiar estado y/o rol de varios usuarios a la vez (solo administradores).
+
+    Verifica al administrador una vez y aplica el cambio con UPDATE ... WHERE
+    firebase_uid IN (...) por lotes dentro de una sola transacción. Devuelve
+    el resultado de cada UID enviado.
+    """
+    new_status = data['estado']
+    new_role = data['rol']
+    if not new_status and not new_role:
+        return api_error('Debes indicar estado o rol')
+    
+    admin_error = _check_admin(data['admin_uid'])
+    if admin_error:
+        return admin_error
+    
+    # update() no aplica auto_now, así que la actividad se marca a mano
+    changes = {'fecha_ultima_actividad': timezone.now()}
+    if new_status:
+        changes['estado'] = new_status
+    if new_role:
+        changes['rol'] = new_role
+    
+    target_uids = list(dict.fromkeys(str(uid) for uid in data['target_uids']))
+    found = set()
+    with transaction.atomic():
+        for start in range(0, len(target_uids), BULK_UPDATE_BATCH_SIZE):
+            batch = target_uids[start:start + BULK_UPDATE_BATCH_SIZE]
+            found.update(UserStatus.objects.update_uids(batch, **changes))
+    
+    results = {
+        uid: 'actualizado' if uid in found else 'no encontrado'
+        for uid in target_uids
+    }
+    return ApiResponse({
+        'success': True,
+        'message': f'{len(found)} usuarios actualizados',
+        'updated': len(found),
+        'not_found': len(target_uids) - len(found),
+        'results': results,
+    })
+
+
+@api_endpoint(Schema(admin_uid=Field(required=True), voluntariado=Field()), source='form')
+def import_users(request, data):
+    """
+    Endpoint para dar de alta usuarios desde un archivo CSV (solo administradores).
+
+    Recibe multipart/form-data con admin_uid, file y opcionalmente
+    voluntariado (slug al que se une a todos los importados). El archivo se
+    procesa fila por fila e inserta por lotes (ver auth_firebase.onboarding);
+    responde cuántas filas se crearon, se omitieron por existir ya y cuáles
+    no son válidas o no cupieron en su voluntariado.
+    """
+    admin_error = _check_admin(data['admin_uid'])
+    if admin_error:
+        return admin_error
+    
+    upload = request.FILES.get('file')
+    if upload is None:
+        return api_error('Archivo CSV requerido', errors={'file': 'requerido'})
+    
+    # utf-8-sig descarta el BOM que agrega Excel al guardar como CSV
+    lines = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+    try:
+        result = import_users_csv(lines, voluntariado=data['voluntariado'])
+    except UnicodeDecodeError:
+        return api_error('El archivo debe estar en UTF-8')
+    except ValueError as e:
+        return api_error(str(e))
+    finally:
+        lines.detach()
+    
+    message = f'{result.created} usuarios creados, {result.skipped} omitidos y {result.invalid} filas no válidas'
+    if result.over_capacity:
+        message += f'; {result.over_capacity} membresías sin cupo'
+    return ApiResponse({
+        'success': True,
+        'message': message,
+        **result.as_dict(),
+    })
+
+
+class _VoluntariadoLleno(Exception):
+    """Deshace la membresía creada cuando el voluntariado ya no tiene cupo"""
+
+
+@api_endpoint(Schema(uid=Field(required=True), code=Field(required=True, max_length=20)))
+def join_voluntariado(request, data):
+    """
+    Endpoint para unirse a un voluntariado con su código.
+
+    La membresía y el incremento de member_count se aplican en una sola
+    transacción; el incremento es un UPDATE condicional con F() que solo
+    procede si queda cupo, así las inscripciones simultáneas no pierden
+    actualizaciones ni sobrepasan max_members.
+    """
+    code = data['code'].strip().upper()
+    
+    try:
+        user_status = UserStatus.objects.only('id').get(firebase_uid=data['uid'])
+    except UserStatus.DoesNotExist:
+        return api_error('Usuario no encontrado')
+    
+    try:
+        voluntariado = Voluntariado.objects.get(code=code)
+    except Voluntariado.DoesNotExist:
+        return api_error('Código de voluntariado no válido')
+    
+    if not voluntariado.active:
+        return api_error('Este voluntariado no está activo actualmente')
+    
+    try:
+        with transaction.atomic():
+            Membership.objects.create(user=user_status, voluntariado=voluntariado.slug)
+            updated = (
+                Voluntariado.objects
+                .filter(pk=voluntariado.pk, active=True)
+                .filter(Q(max_members__isnull=True) | Q(member_count__lt=F('max_members')))
+                .update(member_count=F('member_count') + 1)
+            )
+            if not updated:
+                raise _VoluntariadoLleno
+            # El valor leído antes del UPDATE condicional puede estar desactualizado
+            voluntariado.refresh_from_db(fields=['member_count'])
+    except IntegrityError:
+        return api_error('Ya eres miembro de este voluntariado')
+    except _VoluntariadoLleno:
+        return api_error('Este voluntariado ha alcanzado su límite de miembros')
+    
+    return ApiResponse({
+        'success': True,
+        'message': f'¡Te has unido a {voluntariado.name}! Tu cuenta está pendiente de activación por un administrador.',
+        'voluntariado': {
+            'id': voluntariado.slug,
+            'name': voluntariado.name,
+            'member_count': voluntariado.member_count,
+            'max_members': voluntariado.max_members,
+        }
+    })
+
+
+def _get_event(event_id, queryset=None):
+    """Busca un evento por su id de Django o por el id del documento en Firestore"""
+    if queryset is None:
+        queryset = Event.objects.all()
+    lookup = Q(firestore_id=str(event_id))
+    if str(event_id).isdigit():
+        lookup |= Q(pk=int(event_id))
+    return queryset.filter(lookup).first()
+
+
+class _EventoLleno(Exception):
+    """Deshace la inscripción creada cuando el evento ya no tiene cupo"""
+
+
+@api_endpoint(Schema(uid=Field(required=True), event_id=Field((str, int), required=True)))
+def register_for_event(request, data):
+    """
+    Endpoint para inscribirse en un evento respetando su cupo.
+
+    La inscripción se inserta y luego se reserva el lugar con
+    UPDATE ... SET registered = registered + 1 WHERE registered < max_participants;
+    si el UPDATE no afecta filas el evento está lleno y la inscripción queda
+    en lista de espera o se deshace. La base de datos serializa los UPDATE,
+    así nunca se entregan más lugares que el cupo aunque lleguen cientos de
+    peticiones a la vez.
+    """
+    try:
+        user_status = UserStatus.objects.only('id').get(firebase_uid=data['uid'])
+    except UserStatus.DoesNotExist:
+        return api_error('Usuario no encontrado')
+    
+    event = _get_event(data['event_id'], Event.objects.only('id', 'status', 'event_date', 'waitlist'))
+    if event is None:
+        return api_error('Evento no encontrado')
+    if event.status != 'abierto':
+        return api_error('El evento no está abierto a inscripciones', status='cerrado')
+    if event.event_date < timezone.now():
+        return api_error('El evento ya ocurrió', status='cerrado')
+    
+    try:
+        with transaction.atomic():
+            participation = Participation.objects.create(event=event, user=user_status)
+            seat_taken = (
+                Event.objects
+                .filter(pk=event.pk, status='abierto')
+                .filter(Q(max_participants__isnull=True) | Q(registered__lt=F('max_participants')))
+                .update(registered=F('registered') + 1)
+            )
+            if not seat_taken:
+                if not event.waitlist:
+                    raise _EventoLleno
+                participation.status = 'en_espera'
+                participation.save(update_fields=['status'])
+    except IntegrityError:
+        return api_error('Ya estás inscrito en este evento', status='duplicado')
+    except _EventoLleno:
+        return api_error('El evento ya no tiene cupo', status='lleno')
+    
+    if participation.status == 'en_espera':
+        return ApiResponse({
+            'success': True,
+            'status': 'en_espera',
+            'message': 'El evento está lleno, quedaste en lista de espera',
+        })
+    return ApiResponse({
+        'success': True,
+        'status': 'inscrito',
+        'message': 'Inscripción confirmada',
+    })
+
+
+@api_endpoint(Schema(admin_uid=Field(required=True), event_id=Field((str, int), required=True)))
+def get_event_participants(request, data):
+    """
+    Endpoint para obtener un evento con el perfil de todos sus participantes (solo administradores).
+
+    Los participantes se cargan con un prefetch de Participation + UserStatus,
+    así el evento completo cuesta dos consultas sin importar cuántos inscritos tenga.
+    """
+    admin_error = _check_admin(data['admin_uid'])
+    if admin_error:
+        return admin_error
+    
+    participations = Participation.objects.select_related('user').order_by('registered_at', 'id')
+    event = _get_event(
+        data['event_id'],
+        Event.objects.select_related('voluntariado')
+        .prefetch_related(Prefetch('participations', queryset=participations)),
+    )
+    if event is None:
+        return api_error('Evento no encontrado')
+    
+    participants = [
+        {
+            'firebase_uid': participation.user.firebase_uid,
+            'email': participation.user.email,
+            'nombre': participation.user.nombre,
+            'apellido': participation.user.apellido,
+            'estado': participation.user.estado,
+            'status': participation.status,
+            'registered_at': participation.registered_at.isoformat(),
+            'attended': participation.attended,
+        }
+        for participation in event.participations.all()
+    ]
+    
+    return ApiResponse({
+        'success': True,
+        'event': {
+            'id': event.id,
+            'firestore_id': event.firestore_id,
+            'title': event.title,
+            'description': event.description,
+            'event_date': event.event_date.isoformat(),
+            'duration': event.duration,
+            'max_participants': event.max_participants,
+            'registered': event.registered,
+            'status': event.status,
+            'voluntariado': {
+                'id': event.voluntariado.slug,
+                'name': event.voluntariado.name,
+            },
+        },
+        'participants': participants,
+    })
+
+
+# Campos que get_all_users puede devolver y tamaño de página
+USER_LIST_FIELDS = (
+    'id', 'firebase_uid', 'email', 'nombre', 'apellido', 'estado', 'rol',
+    'fecha_registro', 'fecha_ultima_actividad', 'voluntariados',
+)
+USER_LIST_DEFAULT_LIMIT = 50
+USER_LIST_MAX_LIMIT = 500
+
+
+# Cuerpo común de grant_achievement y revoke_achievement
+ACHIEVEMENT_SCHEMA = Schema(
+    admin_uid=Field(required=True),
+    uid=Field(required=True),
+    logro_id=Field((str, int), required=True),
+)
+
+
+def _achievement_request(data):
+    """Busca al administrador, el usuario y el logro; devuelve (error, administrador, usuario, logro)"""
+    admin_user = UserStatus.objects.only('rol').filter(firebase_uid=data['admin_uid']).first()
+    error = _admin_error(admin_user)
+    if error:
+        return error, None, None, None
+    try:
+        user_status = UserStatus.objects.only('id').get(firebase_uid=data['uid'])
+    except UserStatus.DoesNotExist:
+        return api_error('Usuario no encontrado'), None, None, None
+    logro_id = str(data['logro_id'])
+    lookup = Q(firestore_id=logro_id)
+    if logro_id.isdigit():
+        lookup |= Q(pk=int(logro_id))
+    logro = Logro.objects.filter(lookup).first()
+    if logro is None:
+        return api_error('Logro no encontrado'), None, None, None
+    return None, admin_user, user_status, logro
+
+
+def _summary_dict(summary):
+    if summary is None:
+        return {'count': 0, 'points': 0, 'hours': 0, 'latest': None}
+    latest = None
+    if summary.latest_id:
+        latest = {
+            'id': summary.latest.firestore_id or str(summary.latest.pk),
+            'name': summary.latest.name,
+            'icon': summary.latest.icon,
+            'assigned_at': summary.latest_at.isoformat() if summary.latest_at else None,
+        }
+    return {
+        'count': summary.count,
+        'points': summary.points,
+        'hours': summary.hours,
+        'latest': latest,
+    }
+
+
+@api_endpoint(ACHIEVEMENT_SCHEMA)
+def grant_achievement(request, data):
+    """Endpoint para que un administrador otorgue un logro a un usuario"""
+    error, admin_user, user_status, logro = _achievement_request(data)
+    if error:
+        return error
+    if not logro.active:
+        return api_error('El logro no está activo')
+    
+    try:
+        UserAchievement.objects.grant(user_status, logro, assigned_by=admin_user)
+    except IntegrityError:
+        return api_error('El usuario ya tiene este logro')
+    
+    return ApiResponse({
+        'success': True,
+        'message': f'Logro {logro.name} otorgado',
+    })
+
+
+@api_endpoint(ACHIEVEMENT_SCHEMA)
+def revoke_achievement(request, data):
+    """Endpoint para que un administrador retire un logro a un usuario"""
+    error, admin_user, user_status, logro = _achievement_request(data)
+    if error:
+        return error
+    
+    if not UserAchievement.objects.revoke(user_status, logro):
+        return api_error('El usuario no tiene este logro')
+    
+    return ApiResponse({
+        'success': True,
+        'message': f'Logro {logro.name} retirado',
+    })
+
+
+@api_endpoint(Schema(uid=Field(required=True), include_list=Field(bool, default=False)))
+def get_achievement_summary(request, data):
+    """
+    Endpoint con el resumen de logros de un usuario para el dashboard.
+
+    Lee una sola fila de AchievementSummary (con su último logro); con
+    include_list también devuelve los logros otorgados.
+    """
+    firebase_uid = data['uid']
+    summary = (
+        AchievementSummary.objects.select_related('latest')
+        .filter(user__firebase_uid=firebase_uid)
+        .first()
+    )
+    response = {'success': True, 'summary': _summary_dict(summary)}
+    
+    if data['include_list']:
+        achievements = (
+            UserAchievement.objects.select_related('logro__voluntariado')
+            .filter(user__firebase_uid=firebase_uid)
+        )
+        response['achievements'] = [
+            {
+                'id': achievement.logro.firestore_id or str(achievement.logro.pk),
+                'name': achievement.logro.name,
+                'description': achievement.logro.description,
+                'icon': achievement.logro.icon,
+                'points': achievement.logro.points,
+                'hours': achievement.logro.hours,
+                'voluntariado': achievement.logro.voluntariado.slug,
+                'assigned_at': achievement.assigned_at.isoformat(),
+            }
+            for achievement in achievements
+        ]
+    
+    return ApiResponse(response)
+
+
+def _encode_cursor(fecha_registro, pk):
+    """Codifica la posición (fecha_registro, id) del último usuario de la página"""
+    raw = f"{fecha_registro.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor):
+    """Decodifica un cursor generado por _encode_cursor"""
+    try:
+        fecha, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        fecha_registro = datetime.fromisoformat(fecha)
+        return fecha_registro, int(pk)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError('no es un cursor válido')
+
+
+def _parse_fecha(value, day_time=time.min):
+    """
+    Convierte una fecha ISO del cuerpo de la petición en datetime con zona
+    horaria. Una fecha sin hora toma day_time (el inicio del día por defecto).
+    """
+    fecha = parse_datetime(value) if 'T' in value else None
+    if fecha is None:
+        dia = parse_date(value)
+        if dia is None:
+            raise ValueError('debe ser una fecha ISO válida')
+        fecha = datetime.combine(dia, day_time)
+    if timezone.is_naive(fecha):
+        fecha = timezone.make_aware(fecha)
+    return fecha
+
+
+def _parse_fecha_hasta(value):
+    """Como _parse_fecha, pero una fecha sin hora incluye el día completo"""
+    return _parse_fecha(value, time.max)
+
+
+def _attach_voluntariados(rows):
+    """Agrega la lista de voluntariados a cada fila con una sola consulta a Membership"""
+    grouped = Membership.objects.by_user([row['id'] for row in rows])
+    for row in rows:
+        row['voluntariados'] = grouped.get(row['id'], [])
+    return rows
+
+
+async def _aattach_voluntariados(rows):
+    """Versión asíncrona de _attach_voluntariados"""
+    grouped = await Membership.objects.aby_user([row['id'] for row in rows])
+    for row in rows:
+        row['voluntariados'] = grouped.get(row['id'], [])
+    return rows
+
+
+def _admin_error(admin_user):
+    if admin_user is None:
+        return api_error('Administrador no encontrado')
+    if not admin_user.is_admin:
+        return api_error('No tienes permisos de administrador')
+    return None
+
+
+def _check_admin(admin_uid):
+    """Devuelve una respuesta de error si admin_uid no es un administrador, o None"""
+    return _admin_error(UserStatus.objects.only('rol').filter(firebase_uid=admin_uid).first())
+
+
+async def _acheck_admin(admin_uid):
+    """Versión asíncrona de _check_admin"""
+    return _admin_error(await UserStatus.objects.only('rol').filter(firebase_uid=admin_uid).afirst())
+
+
+# Filtros comunes de get_all_users y export_users
+USER_FILTER_FIELDS = {
+    'estado': Field(choices=dict(UserStatus.STATUS_CHOICES)),
+    'rol': Field(choices=dict(UserStatus.ROLE_CHOICES)),
+    'fecha_desde': Field(parse=_parse_fecha),
+    'fecha_hasta': Field(parse=_parse_fecha_hasta),
+}
+
+
+def _filter_users(users, data):
+    """Aplica los filtros estado, rol, fecha_desde y fecha_hasta ya validados por USER_FILTER_FIELDS"""
+    if data['estado']:
+        users = users.filter(estado=data['estado'])
+    if data['rol']:
+        users = users.filter(rol=data['rol'])
+    if data['fecha_desde']:
+        users = users.filter(fecha_registro__gte=data['fecha_desde'])
+    if data['fecha_hasta']:
+        users = users.filter(fecha_registro__lte=data['fecha_hasta'])
+    return users
+
+
+@api_endpoint(Schema(
+    admin_uid=Field(required=True),
+    limit=Field(int, default=USER_LIST_DEFAULT_LIMIT),
+    fields=Field(list, choices=USER_LIST_FIELDS),
+    include_total=Field(bool, default=True),
+    cursor=Field(parse=_decode_cursor),
+    **USER_FILTER_FIELDS,
+))
+async def get_all_users(request, data):
+    """
+    Endpoint para listar usuarios (solo administradores).
+
+    Pagina por cursor sobre (fecha_registro, id) en orden descendente, así cada
+    página es una consulta acotada sin OFFSET. Acepta filtros por estado, rol y
+    rango de fecha_registro, una lista de campos a devolver y include_total
+    para omitir el COUNT(*) cuando el panel no lo necesita.
+    """
+    # Verificar que el usuario es administrador
+    admin_error = await _acheck_admin(data['admin_uid'])
+    if admin_error:
+        return admin_error
+    
+    limit = max(1, min(data['limit'], USER_LIST_MAX_LIMIT))
+    fields = data['fields'] or list(USER_LIST_FIELDS)
+    # id y fecha_registro siempre se leen porque forman el cursor;
+    # voluntariados viene de Membership, no de una columna
+    query_fields = [f for f in fields if f != 'voluntariados']
+    query_fields = list(dict.fromkeys(query_fields + ['id', 'fecha_registro']))
+    
+    users = _filter_users(UserStatus.objects.all(), data)
+    total = await users.acount() if data['include_total'] else None
+    
+    if data['cursor']:
+        last_fecha, last_id = data['cursor']
+        # Equivale a (fecha_registro, id) < (last_fecha, last_id) pero
+        # escrito así el motor puede buscar en el índice en vez de recorrerlo
+        users = users.filter(fecha_registro__lte=last_fecha).exclude(
+            fecha_registro=last_fecha, id__gte=last_id
+        )
+    
+    # Se pide un registro extra para saber si existe otra página
+    rows = [
+        row async for row in
+        users.order_by('-fecha_registro', '-id').values(*query_fields)[:limit + 1]
+    ]
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if has_more:
+        next_cursor = _encode_cursor(rows[-1]['fecha_registro'], rows[-1]['id'])
+    if 'voluntariados' in fields:
+        await _aattach_voluntariados(rows)
+    
+    users_data = []
+    for row in rows:
+        user_data = {}
+        for field in fields:
+            value = row[field]
+            if field in ('fecha_registro', 'fecha_ultima_actividad'):
+                value = value.isoformat()
+            user_data[field] = value
+        users_data.append(user_data)
+    
+    response = {
+        'success': True,
+        'users': users_data,
+        'next_cursor': next_cursor,
+        'has_more': has_more,
+    }
+    if total is not None:
+        response['total'] = total
+    return ApiResponse(response)
+
+
+EXPORT_FORMATS = ('ndjson', 'csv')
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_COLUMNS = tuple(f for f in USER_LIST_FIELDS if f != 'voluntariados')
+
+
+class _Echo:
+    """Objeto tipo archivo que devuelve lo escrito, para usar csv.writer en streaming"""
+
+    def write(self, value):
+        return value
+
+
+def _export_value(value):
+    """Convierte un valor de la base de datos en texto plano para CSV"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _iter_export_rows(rows):
+    """Recorre las filas por bloques, agregando los voluntariados de cada bloque"""
+    while True:
+        chunk = list(islice(rows, EXPORT_CHUNK_SIZE))
+        if not chunk:
+            return
+        yield from _attach_voluntariados(chunk)
+
+
+def _stream_ndjson(rows):
+    for row in rows:
+        yield dumps(row) + b'\n'
+
+
+def _stream_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(USER_LIST_FIELDS)
+    for row in rows:
+        yield writer.writerow([_export_value(row[field]) for field in USER_LIST_FIELDS])
+
+
+async def _astream(lines):
+    """
+    Recorre un generador síncrono de líneas desde un servidor ASGI: cada
+    bloque de EXPORT_CHUNK_SIZE líneas se genera en un hilo con
+    sync_to_async y se envía antes de leer el siguiente. Con un iterador
+    síncrono el ASGIHandler armaría la respuesta completa en memoria.
+    """
+    next_block = sync_to_async(lambda: list(islice(lines, EXPORT_CHUNK_SIZE)))
+    while block := await next_block():
+        for line in block:
+            yield line
+
+
+@api_endpoint(Schema(
+    admin_uid=Field(required=True),
+    format=Field(default='ndjson', choices=EXPORT_FORMATS),
+    **USER_FILTER_FIELDS,
+))
+def export_users(request, data):
+    """
+    Endpoint para exportar usuarios en NDJSON o CSV (solo administradores).
+
+    Las filas se leen con iterator(chunk_size=EXPORT_CHUNK_SIZE) y se envían
+    a medida que se generan, así la memoria usada no depende del número de
+    usuarios. Bajo ASGI el contenido es un generador asíncrono (_astream)
+    para que también se transmita por bloques. Acepta los mismos filtros que
+    get_all_users.
+    """
+    admin_error = _check_admin(data['admin_uid'])
+    if admin_error:
+        return admin_error
+    
+    export_format = data['format']
+    users = _filter_users(UserStatus.objects.all(), data)
+    rows = _iter_export_rows(
+        users.order_by('-fecha_registro', '-id').values(*EXPORT_COLUMNS).iterator(
+            chunk_size=EXPORT_CHUNK_SIZE
+        )
+    )
+    
+    if export_format == 'csv':
+        lines, content_type = _stream_csv(rows), 'text/csv; charset=utf-8'
+    else:
+        lines, content_type = _stream_ndjson(rows), 'application/x-ndjson'
+    if isinstance(request, ASGIRequest):
+        lines = _astream(lines)
+    response = StreamingHttpResponse(lines, content_type=content_type)
+    filename = f"usuarios-{timezone.now():%Y%m%d-%H%M%S}.{export_format}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,32 @@
+"""
+Configuración de gunicorn para Railway.
+
+SERVER_MODE elige cómo se sirve la aplicación:
+- wsgi (por defecto): Voluntariados.wsgi con workers síncronos.
+- asgi: Voluntariados.asgi con workers de uvicorn; las vistas asíncronas de
+  auth_firebase atienden muchas peticiones por worker mientras esperan E/S.
+
+WEB_CONCURRENCY define la cantidad de workers (gunicorn lo lee directamente).
+"""
+import os
+
+SERVER_MODE = os.environ.get('SERVER_MODE', 'wsgi').lower()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+if SERVER_MODE == 'asgi':
+    wsgi_app = 'Voluntariados.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+else:
+    wsgi_app = 'Voluntariados.wsgi:application'
+    worker_class = 'sync'
+
+
+def on_starting(server):
+    # Los archivos de métricas de workers anteriores (ver home.metrics) se
+    # descartan al arrancar para no sumarlos a los de este despliegue
+    directory = os.environ.get('METRICS_DIR')
+    if directory and os.path.isdir(directory):
+        for filename in os.listdir(directory):
+            if filename.startswith('metrics-'):
+                os.remove(os.path.join(directory, filename))
@@ -1,6 +1,19 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class HomeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'home'
+
+    def ready(self):
+        if getattr(settings, 'METRICS_ENABLED', True):
+            from django.db import connections
+            from django.db.backends.signals import connection_created
+
+            from .metrics import install_query_wrapper
+
+            # Cuenta las consultas de cada petición en todas las conexiones
+            connection_created.connect(install_query_wrapper)
+            for connection in connections.all(initialized_only=True):
+                install_query_wrapper(connection)
@@ -0,0 +1,14 @@
+from django.conf import settings
+
+
+def deploy(request):
+    """
+    Versión de despliegue y duración para los {% cache %} de los templates.
+
+    Con DEBUG activo el timeout es 0 para que los fragmentos no se guarden y
+    los cambios en los templates se vean al instante.
+    """
+    return {
+        'deploy_version': settings.DEPLOY_VERSION,
+        'fragment_cache_timeout': 0 if settings.DEBUG else settings.FRAGMENT_CACHE_TIMEOUT,
+    }
@@ -0,0 +1,90 @@
+import statistics
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+
+EXCLUDED_NAMESPACES = {'admin'}
+EXCLUDED_ROUTES = {'metrics'}
+
+
+def iter_page_routes(patterns=None, namespace=None, prefix=''):
+    """
+    Pares (nombre, path) de las rutas con nombre y sin parámetros, excepto
+    las del admin, los endpoints JSON (api/) y /metrics.
+    """
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            child_namespace = pattern.namespace or namespace
+            if child_namespace in EXCLUDED_NAMESPACES:
+                continue
+            if namespace and pattern.namespace:
+                child_namespace = f'{namespace}:{pattern.namespace}'
+            yield from iter_page_routes(pattern.url_patterns, child_namespace, route)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            if pattern.pattern.converters or 'api/' in route:
+                continue
+            name = f'{namespace}:{pattern.name}' if namespace else pattern.name
+            if name in EXCLUDED_ROUTES:
+                continue
+            yield name, reverse(name)
+
+
+class Command(BaseCommand):
+    help = (
+        "Pide cada página del sitio y muestra el tamaño del HTML original, "
+        "minificado, con gzip y con brotli, además de la latencia mediana."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=10, help='Peticiones por ruta y codificación')
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        with override_settings(HTML_MINIFY=False):
+            raw_client = Client()
+            # El middleware lee HTML_MINIFY al cargarse, así que se carga aquí
+            raw_client.handler.load_middleware()
+        client = Client()
+
+        self.stdout.write(
+            f"{'ruta':42} {'original':>9} {'minif.':>9} {'gzip':>8} {'br':>8} "
+            f"{'ms':>7} {'ms gzip':>8} {'ms br':>7}"
+        )
+        total_raw = total_br = 0
+        seen = set()
+        for name, path in iter_page_routes():
+            if path in seen:
+                continue
+            seen.add(path)
+            cache.clear()
+            raw = raw_client.get(path)
+            if raw.status_code != 200:
+                continue
+            sizes = {}
+            latencies = {}
+            for encoding in ('identity', 'gzip', 'br'):
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    response = client.get(path, HTTP_ACCEPT_ENCODING=encoding)
+                    timings.append((time.perf_counter() - start) * 1000)
+                sizes[encoding] = len(response.content)
+                latencies[encoding] = statistics.median(timings)
+            total_raw += len(raw.content)
+            total_br += sizes['br']
+            self.stdout.write(
+                f"{name:42} {len(raw.content):>9} {sizes['identity']:>9} {sizes['gzip']:>8} "
+                f"{sizes['br']:>8} {latencies['identity']:>7.2f} {latencies['gzip']:>8.2f} "
+                f"{latencies['br']:>7.2f}"
+            )
+        if total_raw:
+            self.stdout.write(self.style.SUCCESS(
+                f'Total: {total_raw} bytes originales, {total_br} con minificación y brotli '
+                f'({100 * total_br / total_raw:.1f}%)'
+            ))
@@ -0,0 +1,78 @@
+import statistics
+import time
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.template import engines
+from django.test import RequestFactory
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el costo de compilar y renderizar cada template de templates/ y de "
+        "las aplicaciones del proyecto (parseo sin caché, primer render y render "
+        "con el caché de fragmentos caliente)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20, help='Renders por template')
+        parser.add_argument(
+            '--app', action='append', dest='apps',
+            help='Limitar a las aplicaciones indicadas (se puede repetir)',
+        )
+
+    def handle(self, *args, **options):
+        cache.clear()
+        request = RequestFactory().get('/')
+        engine = engines['django']
+        rows = []
+        for name, path in self.template_files(options['apps']):
+            source = path.read_text(encoding='utf-8')
+
+            # from_string siempre compila: lo que costaría cada petición sin el cached loader
+            start = time.perf_counter()
+            engine.engine.from_string(source)
+            parse_ms = (time.perf_counter() - start) * 1000
+
+            template = engine.get_template(name)
+            start = time.perf_counter()
+            html = template.render({}, request)
+            first_ms = (time.perf_counter() - start) * 1000
+
+            timings = []
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                template.render({}, request)
+                timings.append((time.perf_counter() - start) * 1000)
+            rows.append((name, len(source), len(html), parse_ms, first_ms, statistics.median(timings)))
+
+        rows.sort(key=lambda row: row[4], reverse=True)
+        self.stdout.write(
+            f"{'template':45} {'fuente':>9} {'html':>9} {'parseo ms':>10} "
+            f"{'1er render':>11} {'render ms':>10}"
+        )
+        for name, source_size, html_size, parse_ms, first_ms, render_ms in rows:
+            self.stdout.write(
+                f'{name:45} {source_size:>9} {html_size:>9} {parse_ms:>10.2f} '
+                f'{first_ms:>11.2f} {render_ms:>10.2f}'
+            )
+
+    def template_files(self, app_labels=None):
+        """Pares (nombre, ruta) de los templates del proyecto"""
+        directories = []
+        if not app_labels:
+            directories.extend(Path(d) for d in settings.TEMPLATES[0]['DIRS'])
+        for app_config in apps.get_app_configs():
+            if app_labels and app_config.label not in app_labels:
+                continue
+            app_path = Path(app_config.path)
+            # Solo las aplicaciones del proyecto, no las de Django
+            if Path(settings.BASE_DIR) not in app_path.parents:
+                continue
+            directories.append(app_path / 'templates')
+        for directory in directories:
+            for path in sorted(directory.rglob('*.html')):
+                yield path.relative_to(directory).as_posix(), path
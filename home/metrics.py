@@ -0,0 +1,213 @@
+"""
+Métricas de peticiones en formato de texto de Prometheus.
+
+Cada hilo escribe en su propio fragmento (shard) de contadores, así el
+registro de una petición no toma ningún lock; los fragmentos solo se suman
+al leer las métricas. Con METRICS_DIR cada proceso (worker de gunicorn)
+vuelca periódicamente su estado a un archivo en ese directorio y el
+endpoint /metrics suma los de todos los workers.
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from django.conf import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+COUNTERS = {
+    'http_requests_total': 'Peticiones atendidas por ruta, método y estado',
+    'db_queries_total': 'Consultas SQL ejecutadas por ruta',
+}
+HISTOGRAMS = {
+    'http_request_duration_seconds': ('Duración de la petición por ruta', LATENCY_BUCKETS),
+    'http_response_size_bytes': ('Tamaño del cuerpo de la respuesta por ruta', SIZE_BUCKETS),
+    'http_request_db_queries': ('Consultas SQL por petición', QUERY_BUCKETS),
+    'http_request_db_duration_seconds': ('Tiempo en la base de datos por petición', LATENCY_BUCKETS),
+}
+
+
+class _Shard:
+    __slots__ = ('counters', 'histograms')
+
+    def __init__(self):
+        self.counters = {}
+        # {(nombre, etiquetas): [conteo por bucket..., +Inf, suma, total]}
+        self.histograms = {}
+
+
+class MetricsRegistry:
+    """Contadores e histogramas del proceso, con un fragmento por hilo"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = _Shard()
+            # Solo la primera vez que un hilo registra algo
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def inc(self, name, labels, amount=1):
+        counters = self._shard().counters
+        key = (name, labels)
+        counters[key] = counters.get(key, 0) + amount
+
+    def observe(self, name, labels, value):
+        histograms = self._shard().histograms
+        key = (name, labels)
+        buckets = HISTOGRAMS[name][1]
+        values = histograms.get(key)
+        if values is None:
+            values = histograms[key] = [0] * (len(buckets) + 3)
+        values[bisect_left(buckets, value)] += 1
+        values[-2] += value
+        values[-1] += 1
+
+    def snapshot(self):
+        """Suma de los fragmentos de todos los hilos: (contadores, histogramas)"""
+        counters, histograms = {}, {}
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            # list() copia el diccionario de una vez aunque otro hilo lo esté modificando
+            for key, value in list(shard.counters.items()):
+                counters[key] = counters.get(key, 0) + value
+            for key, values in list(shard.histograms.items()):
+                _add_histogram(histograms, key, values)
+        return counters, histograms
+
+    def reset(self):
+        with self._shards_lock:
+            for shard in self._shards:
+                shard.counters.clear()
+                shard.histograms.clear()
+
+
+def _add_histogram(histograms, key, values):
+    total = histograms.get(key)
+    if total is None:
+        histograms[key] = list(values)
+    else:
+        for index, value in enumerate(values):
+            total[index] += value
+
+
+def _worker_path(directory, pid=None):
+    return os.path.join(directory, f'metrics-{pid or os.getpid()}.json')
+
+
+def flush(registry, directory):
+    """Guarda el estado del proceso en directory (reemplazo atómico del archivo)"""
+    counters, histograms = registry.snapshot()
+    data = {
+        'counters': [[name, list(labels), value] for (name, labels), value in counters.items()],
+        'histograms': [[name, list(labels), values] for (name, labels), values in histograms.items()],
+    }
+    path = _worker_path(directory)
+    temporary = f'{path}.{threading.get_ident()}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as output:
+        json.dump(data, output)
+    os.replace(temporary, path)
+
+
+def collect(registry, directory=None):
+    """Métricas de este proceso más las de los demás workers guardadas en directory"""
+    counters, histograms = registry.snapshot()
+    if directory and os.path.isdir(directory):
+        own = os.path.basename(_worker_path(directory))
+        for filename in os.listdir(directory):
+            if filename == own or not (filename.startswith('metrics-') and filename.endswith('.json')):
+                continue
+            try:
+                with open(os.path.join(directory, filename), encoding='utf-8') as source:
+                    data = json.load(source)
+            except (OSError, ValueError):
+                continue
+            for name, labels, value in data['counters']:
+                key = (name, tuple(tuple(pair) for pair in labels))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, values in data['histograms']:
+                _add_histogram(histograms, (name, tuple(tuple(pair) for pair in labels)), values)
+    return counters, histograms
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_number(value):
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def render(counters, histograms):
+    """Texto de exposición de Prometheus (versión 0.0.4)"""
+    lines = []
+    for name, help_text in COUNTERS.items():
+        samples = sorted((labels, value) for (metric, labels), value in counters.items() if metric == name)
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} counter')
+        for labels, value in samples:
+            lines.append(f'{name}{_format_labels(labels)} {_format_number(value)}')
+    for name, (help_text, buckets) in HISTOGRAMS.items():
+        samples = sorted((labels, values) for (metric, labels), values in histograms.items() if metric == name)
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} histogram')
+        for labels, values in samples:
+            cumulative = 0
+            for bound, count in zip(buckets + ('+Inf',), values):
+                cumulative += count
+                lines.append(f'{name}_bucket{_format_labels(labels, [("le", bound)])} {cumulative}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {_format_number(values[-2])}')
+            lines.append(f'{name}_count{_format_labels(labels)} {values[-1]}')
+    return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+# Consultas de la petición en curso: [cantidad, segundos]. Es una ContextVar
+# para que también cuente las consultas hechas desde sync_to_async bajo ASGI.
+current_queries = ContextVar('current_queries', default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """execute_wrapper instalado en cada conexión (ver home.apps)"""
+    totals = current_queries.get()
+    if totals is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        totals[0] += 1
+        totals[1] += time.perf_counter() - start
+
+
+def install_query_wrapper(connection, **kwargs):
+    """Receptor de connection_created: agrega record_query a la conexión una sola vez"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def metrics_dir():
+    return getattr(settings, 'METRICS_DIR', None)
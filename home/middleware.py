@@ -0,0 +1,268 @@
+import os
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+from django.utils.text import compress_sequence, compress_string
+
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from . import metrics
+from .minify import minify_html
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional; sin él solo se usa gzip
+    brotli = None
+
+_ACCEPTS_BR_RE = _lazy_re_compile(r'\bbr\b')
+_ACCEPTS_GZIP_RE = _lazy_re_compile(r'\bgzip\b')
+
+
+class ResponseMiddleware:
+    """
+    Base de los middlewares que solo transforman la respuesta.
+
+    Funciona igual bajo WSGI y ASGI: con una cadena asíncrona se espera la
+    respuesta y process_response se ejecuta en el mismo hilo del event loop
+    (solo hace trabajo de CPU), sin pasar por sync_to_async como
+    MiddlewareMixin.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        raise NotImplementedError
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise con soporte para ASGI.
+
+    WhiteNoiseMiddleware solo es síncrono; bajo ASGI obligaría a pasar cada
+    petición por un hilo. La búsqueda del archivo es un diccionario en
+    memoria (con autorefresh, solo en DEBUG, consulta el disco), así que se
+    hace en el event loop y el resto de la cadena sigue siendo asíncrona.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, **kwargs):
+        super().__init__(get_response, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
+
+
+class HTMLMinifyMiddleware(ResponseMiddleware):
+    """
+    Minifica las respuestas HTML renderizadas (ver home.minify).
+
+    Se desactiva con DEBUG o con HTML_MINIFY = False.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.enabled = getattr(settings, 'HTML_MINIFY', True) and not settings.DEBUG
+
+    def process_response(self, request, response):
+        if (
+            not self.enabled
+            or response.streaming
+            or response.status_code != 200
+            or response.has_header('Content-Encoding')
+            or not response.get('Content-Type', '').startswith('text/html')
+        ):
+            return response
+
+        charset = response.charset
+        html = response.content.decode(charset)
+        response.content = minify_html(html).encode(charset)
+        if response.has_header('Content-Length'):
+            response['Content-Length'] = str(len(response.content))
+        return response
+
+
+class CompressionMiddleware(ResponseMiddleware):
+    """
+    Comprime las respuestas con brotli o gzip según Accept-Encoding.
+
+    Sigue las mismas reglas que django.middleware.gzip.GZipMiddleware (no
+    comprime respuestas pequeñas ni ya comprimidas, debilita el ETag y
+    agrega hasta max_random_bytes de relleno aleatorio al gzip contra
+    BREACH), pero prefiere brotli cuando el cliente lo acepta y el módulo
+    está instalado. brotli no admite ese relleno, así que las respuestas que
+    llevan un token CSRF (admin, formularios) se comprimen siempre con gzip.
+    Los archivos estáticos no pasan por aquí: WhiteNoise los sirve antes y
+    ya precomprimidos.
+    """
+
+    min_length = 200
+    brotli_quality = 5
+    max_random_bytes = 100
+
+    def process_response(self, request, response):
+        if not response.streaming and len(response.content) < self.min_length:
+            return response
+        if response.has_header('Content-Encoding'):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        # get_token() deja esta clave en META cuando la página incluye un token CSRF
+        has_csrf_token = 'CSRF_COOKIE_NEEDS_UPDATE' in request.META
+        if (
+            brotli is not None
+            and not response.streaming
+            and not has_csrf_token
+            and _ACCEPTS_BR_RE.search(accept_encoding)
+        ):
+            compressed = brotli.compress(response.content, quality=self.brotli_quality)
+            encoding = 'br'
+        elif _ACCEPTS_GZIP_RE.search(accept_encoding):
+            if response.streaming:
+                if response.is_async:
+                    response.streaming_content = _acompress_sequence(
+                        response.streaming_content, self.max_random_bytes
+                    )
+                else:
+                    response.streaming_content = compress_sequence(
+                        response.streaming_content, max_random_bytes=self.max_random_bytes
+                    )
+                del response.headers['Content-Length']
+                self._finish(response, 'gzip')
+                return response
+            compressed = compress_string(response.content, max_random_bytes=self.max_random_bytes)
+            encoding = 'gzip'
+        else:
+            return response
+
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        self._finish(response, encoding)
+        return response
+
+    def _finish(self, response, encoding):
+        # El cuerpo ya no es idéntico byte a byte, así que el ETag pasa a ser débil
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+
+
+async def _acompress_sequence(sequence, max_random_bytes):
+    # Igual que GZipMiddleware con contenido asíncrono: cada fragmento es un
+    # miembro gzip completo y los navegadores los concatenan
+    async for chunk in sequence:
+        yield compress_string(chunk, max_random_bytes=max_random_bytes)
+
+
+class MetricsMiddleware:
+    """
+    Registra por nombre de URL la latencia, las consultas SQL y su tiempo, el
+    tamaño de la respuesta y el código de estado (ver home.metrics).
+
+    Va primero en MIDDLEWARE para medir la petición completa y el tamaño ya
+    comprimido. Con METRICS_DIR vuelca las métricas del proceso cada
+    METRICS_FLUSH_INTERVAL segundos para que /metrics sume todos los workers.
+    """
+
+    sync_capable = True
+    async_capable = True
+    methods = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'}
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'METRICS_ENABLED', True)
+        self.directory = metrics.metrics_dir()
+        self.flush_interval = getattr(settings, 'METRICS_FLUSH_INTERVAL', 5)
+        self.last_flush = time.monotonic()
+        if self.enabled and self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+        start = time.perf_counter()
+        token = metrics.current_queries.set([0, 0.0])
+        try:
+            response = self.get_response(request)
+        finally:
+            queries = metrics.current_queries.get()
+            metrics.current_queries.reset(token)
+        self.record(request, response, time.perf_counter() - start, queries)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+        start = time.perf_counter()
+        token = metrics.current_queries.set([0, 0.0])
+        try:
+            response = await self.get_response(request)
+        finally:
+            queries = metrics.current_queries.get()
+            metrics.current_queries.reset(token)
+        self.record(request, response, time.perf_counter() - start, queries)
+        return response
+
+    def record(self, request, response, duration, queries):
+        match = request.resolver_match
+        # Sin nombre de URL (estáticos, 404) se agrupa todo para no crear una serie por path
+        route = (match.view_name if match else None) or 'sin_ruta'
+        method = request.method if request.method in self.methods else 'OTHER'
+        labels = (('route', route),)
+        registry = metrics.registry
+        registry.inc(
+            'http_requests_total',
+            (('route', route), ('method', method), ('status', str(response.status_code))),
+        )
+        registry.observe('http_request_duration_seconds', labels, duration)
+        registry.inc('db_queries_total', labels, queries[0])
+        registry.observe('http_request_db_queries', labels, queries[0])
+        registry.observe('http_request_db_duration_seconds', labels, queries[1])
+        if not response.streaming:
+            registry.observe('http_response_size_bytes', labels, len(response.content))
+        elif response.has_header('Content-Length'):
+            registry.observe('http_response_size_bytes', labels, int(response['Content-Length']))
+
+        if self.directory and time.monotonic() - self.last_flush >= self.flush_interval:
+            self.last_flush = time.monotonic()
+            metrics.flush(registry, self.directory)
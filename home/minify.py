@@ -0,0 +1,94 @@
+"""
+Minificación conservadora del HTML renderizado.
+
+Solo se eliminan espacios y comentarios que no cambian el resultado: fuera de
+<pre>, <textarea>, <script> y <style> los espacios seguidos se reducen a uno;
+en los <script> y <style> en línea se quitan la sangría y las líneas vacías
+(sin tocar el interior de los template literals de JS) y en CSS también los
+comentarios. Como las páginas repiten los mismos bloques, cada bloque y cada
+documento minificado se guarda por hash.
+"""
+import hashlib
+import re
+
+from auth_firebase.cache import TTLCache
+
+_RAW_BLOCK_RE = re.compile(
+    r'(<(script|style|pre|textarea)\b[^>]*>)(.*?)(</\2\s*>)',
+    re.IGNORECASE | re.DOTALL,
+)
+_HTML_COMMENT_RE = re.compile(r'<!--(?!\[if|<!|>).*?-->', re.DOTALL)
+_WHITESPACE_RE = re.compile(r'\s+')
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+_CSS_PUNCTUATION_RE = re.compile(r'\s*([{};])\s*')
+
+# Los bloques y documentos minificados no expiran; el tamaño acota la memoria
+_CACHE_TTL = 24 * 60 * 60
+_blocks = TTLCache(_CACHE_TTL, 512)
+_documents = TTLCache(_CACHE_TTL, 128)
+
+
+def _cached(cache, text, minifier):
+    key = hashlib.sha1(text.encode('utf-8', 'surrogatepass')).hexdigest()
+    result = cache.get(key)
+    if result is None:
+        result = minifier(text)
+        cache.set(key, result)
+    return result
+
+
+def minify_js(source):
+    """Quita sangría y líneas vacías, conservando el contenido de los template literals"""
+    lines = []
+    in_template_literal = False
+    for line in source.split('\n'):
+        if in_template_literal:
+            lines.append(line)
+        else:
+            stripped = line.strip()
+            if stripped:
+                lines.append(stripped)
+        # Cuenta los backticks sin escapar para saber si la línea deja abierto un literal
+        if (line.count('`') - line.count('\\`')) % 2:
+            in_template_literal = not in_template_literal
+    return '\n'.join(lines)
+
+
+def minify_css(source):
+    source = _CSS_COMMENT_RE.sub('', source)
+    source = _WHITESPACE_RE.sub(' ', source)
+    return _CSS_PUNCTUATION_RE.sub(r'\1', source).strip()
+
+
+def _minify_block(match):
+    open_tag, tag, body, close_tag = match.groups()
+    tag = tag.lower()
+    if tag == 'script' and 'src=' not in open_tag.lower():
+        body = _cached(_blocks, body, minify_js)
+    elif tag == 'style':
+        body = _cached(_blocks, body, minify_css)
+    return open_tag, body, close_tag
+
+
+def _minify_html(html):
+    parts = []
+    position = 0
+    for match in _RAW_BLOCK_RE.finditer(html):
+        parts.append(_collapse(html[position:match.start()]))
+        open_tag, body, close_tag = _minify_block(match)
+        parts.append(_collapse(open_tag))
+        parts.append(body)
+        parts.append(close_tag)
+        position = match.end()
+    parts.append(_collapse(html[position:]))
+    return ''.join(parts).strip()
+
+
+def _collapse(fragment):
+    fragment = _HTML_COMMENT_RE.sub('', fragment)
+    return _WHITESPACE_RE.sub(' ', fragment)
+
+
+def minify_html(html):
+    """Devuelve html minificado; los documentos repetidos se sirven desde caché"""
+    return _cached(_documents, html, _minify_html)
@@ -0,0 +1,69 @@
+"""
+Caché de páginas estáticas con soporte de GET condicional.
+
+Las páginas informativas solo cambian con cada despliegue, así que se
+renderizan una vez por versión (DEPLOY_VERSION) y se sirven desde el caché
+con ETag y Last-Modified; si el navegador ya tiene la versión actual recibe
+un 304 sin cuerpo.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+def _page_cache():
+    return caches[getattr(settings, 'STATIC_PAGE_CACHE', 'default')]
+
+
+def _cache_key(template_name, request):
+    return f'static_page:{settings.DEPLOY_VERSION}:{template_name}:{request.path}'
+
+
+def static_page(template_name):
+    """
+    Decorador para vistas que solo renderizan template_name sin depender de la petición.
+
+    La respuesta de la vista se guarda por template, path y versión de
+    despliegue; las siguientes peticiones GET/HEAD se responden desde el
+    caché o con 304 Not Modified. Con DEBUG activo no se cachea nada para
+    ver los cambios en los templates al instante.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if settings.DEBUG or request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+
+            cache = _page_cache()
+            key = _cache_key(template_name, request)
+            page = cache.get(key)
+            if page is None:
+                response = view_func(request, *args, **kwargs)
+                if response.status_code != 200 or response.streaming:
+                    return response
+                page = {
+                    'content': response.content,
+                    'content_type': response['Content-Type'],
+                    'etag': '"%s"' % hashlib.md5(response.content).hexdigest(),
+                    'last_modified': int(time.time()),
+                }
+                cache.set(key, page, getattr(settings, 'STATIC_PAGE_CACHE_TIMEOUT', None))
+
+            response = get_conditional_response(
+                request, etag=page['etag'], last_modified=page['last_modified']
+            )
+            if response is None:
+                response = HttpResponse(page['content'], content_type=page['content_type'])
+            response['ETag'] = page['etag']
+            response['Last-Modified'] = http_date(page['last_modified'])
+            # El navegador puede guardar la página pero debe revalidarla
+            patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+            return response
+        return wrapper
+    return decorator
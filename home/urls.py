@@ -8,4 +8,5 @@ urlpatterns = [
     path("errores/", views.errores, name="errores"),
     path("unirse/", views.unirse, name="unirse"),
     path("eventos/", views.eventos, name="eventos"),
+    path("metrics", views.metrics, name="metrics"),
 ]
\ No newline at end of file
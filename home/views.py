@@ -1,6 +1,14 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
 from django.shortcuts import render
 from django.urls import reverse
 
+from .metrics import collect, metrics_dir, registry, render as render_metrics
+from .page_cache import static_page
+
+@static_page('home.html')
 def home(request):
     context = {
         "url_pumas_verdes": reverse('nuestros_voluntariados:pumas_verdes'),
@@ -10,6 +18,7 @@ def home(request):
 
     return render(request, 'home.html', context)
 
+@static_page('reglamento.html')
 def reglamento(request):
     return render(request, 'reglamento.html')
 
@@ -35,4 +44,27 @@ def eventos(request):
         "enlace_inicio": reverse('home'),
         "voluntariados": reverse('nuestros_voluntariados:home')
     }
-    return render(request, 'eventos.html', context)
\ No newline at end of file
+    return render(request, 'eventos.html', context)
+
+def _metrics_authorized(request):
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    if token:
+        authorization = request.headers.get('Authorization', '')
+        if hmac.compare_digest(authorization.encode(), f'Bearer {token}'.encode()):
+            return True
+    return request.user.is_active and request.user.is_staff
+
+def metrics(request):
+    """
+    Métricas de todas las rutas en formato de texto de Prometheus.
+
+    Solo para el staff del admin de Django o para quien envíe
+    "Authorization: Bearer <METRICS_TOKEN>" (el scraper de Prometheus).
+    """
+    if not _metrics_authorized(request):
+        return HttpResponseForbidden()
+    counters, histograms = collect(registry, metrics_dir())
+    return HttpResponse(
+        render_metrics(counters, histograms),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class NuestrosVoluntariadosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'nuestros_voluntariados'
+
+    def ready(self):
+        from .catalog import catalog
+
+        # Valida el catálogo al iniciar para fallar en el arranque y no en una petición
+        catalog.load()
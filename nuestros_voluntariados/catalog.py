@@ -0,0 +1,176 @@
+"""
+Catálogo de voluntariados.
+
+VOLUNTARIADOS es la única fuente que describe cada programa: su slug, el
+template de su página, las etiquetas y los datos de la tarjeta del listado.
+Agregar un voluntariado es agregar una entrada aquí y su template; las rutas,
+la vista de detalle y el listado se generan a partir del catálogo.
+
+Los programas con 'url_externa' no tienen página propia y solo aparecen en
+el listado enlazando a su sitio.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+from django.urls import reverse
+
+VOLUNTARIADOS = [
+    {
+        "slug": "vtic",
+        "nombre": "VTIC",
+        "url_externa": "https://nvlearn-53156.web.app/",
+        "color_class": "is-link",
+        "categorias": "social educacion",
+        "logo_url": "https://res.cloudinary.com/dcm2dsjov/image/upload/v1757627650/Agregar_un_subt%C3%ADtulo_10_irdlej.png",
+        "tags": [
+            {"class": "is-info", "text": "Social"},
+            {"class": "is-danger", "text": "Educacion"},
+        ],
+        "descripcion": "Voluntariado de educación e investigación científica de la UNAH, comprometido con la excelencia académica y el desarrollo de nuestros estudiantes a través de tutorías especializadas y grupos de investigación.",
+        "voluntarios": 95,
+        "proyectos": 10,
+    },
+    {
+        "slug": "pumas_verdes",
+        "nombre": "Pumas Verdes",
+        "template": "pumas_verdes.html",
+        "color_class": "is-success",
+        "categorias": "ambiental social",
+        "logo_url": "https://res.cloudinary.com/dcm2dsjov/image/upload/v1741580608/Logo_PV_UNAH_VS-removebg-preview_jadsip.png",
+        "tags": [
+            {"class": "is-primary", "text": "Medio Ambiente"},
+            {"class": "is-link", "text": "Social"},
+        ],
+        "descripcion": "Comprometidos con la sostenibilidad ambiental y la educación ecológica en nuestro campus y comunidades.",
+        "voluntarios": 85,
+        "proyectos": 12,
+    },
+    {
+        "slug": "sonriendo_juntos",
+        "nombre": "Sonriendo Juntos",
+        "template": "sonriendo_juntos.html",
+        "color_class": "is-warning",
+        "categorias": "social",
+        "logo_url": "https://res.cloudinary.com/dcm2dsjov/image/upload/v1741580995/c31eebe3-8666-4c25-ba58-c81ae0da5ab6-removebg-preview_b1an3v.png",
+        "tags": [
+            {"class": "is-link", "text": "Social"},
+        ],
+        "descripcion": "Transformando vidas a través de la salud y bienestar, colaborando con Operación Sonrisa Honduras.",
+        "voluntarios": 120,
+        "proyectos": 8,
+    },
+    {
+        "slug": "patitas_unah",
+        "nombre": "Patitas UNAH",
+        "template": "patitas.html",
+        "color_class": "is-danger",
+        "categorias": "animal social",
+        "logo_url": "https://res.cloudinary.com/dcm2dsjov/image/upload/v1741580981/273c01b6-b5ce-4abb-af34-c5046222a2d6-removebg-preview_ycw82u.png",
+        "tags": [
+            {"class": "is-link", "text": "Social"},
+            {"class": "is-warning", "text": "Animales"},
+        ],
+        "descripcion": "Protectores de la vida animal: Rescate, rehabilitación y concienciación sobre tenencia responsable.",
+        "voluntarios": 65,
+        "proyectos": 15,
+    },
+    {
+        "slug": "pumas_unidos",
+        "nombre": "Pumas Unidos",
+        "template": "pumas_unidos.html",
+        "color_class": "is-warning",
+        "categorias": "social",
+        "logo_url": "https://res.cloudinary.com/dcm2dsjov/image/upload/v1741581160/27022b04-71eb-4808-95e2-fbc2c4e43738-removebg-preview_hewtfm.png",
+        "tags": [
+            {"class": "is-link", "text": "Social"},
+        ],
+        "descripcion": "Acciones solidarias que fortalecen comunidades vulnerables mediante ayuda humanitaria y educación.",
+        "voluntarios": 110,
+        "proyectos": 20,
+    },
+    {
+        "slug": "pumas_en_accion",
+        "nombre": "Pumas en Acción",
+        "template": "pumas_en_accion.html",
+        "color_class": "is-info",
+        "categorias": "social educacion",
+        "logo_url": "https://res.cloudinary.com/dcm2dsjov/image/upload/v1743287190/f24b026d-f1f9-4f7d-8ada-2bd7f071bb9e_nehray.jpg",
+        "tags": [
+            {"class": "is-link", "text": "Social"},
+            {"class": "is-danger", "text": "Educacion"},
+        ],
+        "descripcion": "Programas de alfabetización y refuerzo educativo en comunidades con bajos recursos educativos.",
+        "voluntarios": 95,
+        "proyectos": 10,
+    },
+]
+
+REQUIRED_KEYS = ("slug", "nombre", "color_class", "categorias", "logo_url", "tags", "descripcion")
+
+
+class Catalog:
+    """Índice del catálogo por slug, validado una vez al iniciar la aplicación"""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.by_slug = {}
+        self._home_context = None
+
+    def load(self):
+        by_slug = {}
+        for entry in self.entries:
+            missing = [key for key in REQUIRED_KEYS if key not in entry]
+            if missing:
+                raise ImproperlyConfigured(
+                    f"Voluntariado {entry.get('slug', '?')} sin campos: {', '.join(missing)}"
+                )
+            slug = entry["slug"]
+            if slug in by_slug:
+                raise ImproperlyConfigured(f"Slug de voluntariado repetido: {slug}")
+            if bool(entry.get("template")) == bool(entry.get("url_externa")):
+                raise ImproperlyConfigured(
+                    f"El voluntariado {slug} debe tener 'template' o 'url_externa', no ambos"
+                )
+            for tag in entry["tags"]:
+                if set(tag) != {"class", "text"}:
+                    raise ImproperlyConfigured(f"Etiqueta inválida en {slug}: {tag}")
+            if entry.get("template"):
+                try:
+                    get_template(entry["template"])
+                except TemplateDoesNotExist:
+                    raise ImproperlyConfigured(
+                        f"No existe el template {entry['template']} del voluntariado {slug}"
+                    )
+            by_slug[slug] = entry
+        self.by_slug = by_slug
+        self._home_context = None
+
+    def get(self, slug):
+        """Entrada del voluntariado con página propia, o None"""
+        entry = self.by_slug.get(slug)
+        if entry is None or not entry.get("template"):
+            return None
+        return entry
+
+    def pages(self):
+        """Voluntariados con página propia, en el orden del catálogo"""
+        return [entry for entry in self.entries if entry.get("template")]
+
+    def home_context(self):
+        """
+        Contexto del listado de voluntariados. Se calcula en la primera petición
+        (las URLs no pueden resolverse durante ready()) y se reutiliza después.
+        """
+        if self._home_context is None:
+            cards = []
+            for entry in self.entries:
+                card = dict(entry)
+                card["url"] = entry.get("url_externa") or reverse(
+                    "nuestros_voluntariados:detalle", kwargs={"slug": entry["slug"]}
+                )
+                cards.append(card)
+            self._home_context = {"voluntariados": cards}
+        return self._home_context
+
+
+catalog = Catalog(VOLUNTARIADOS)
@@ -1,3 +1,43 @@
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from .catalog import VOLUNTARIADOS, Catalog, catalog
+
+
+class CatalogTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_every_page_is_served_by_slug(self):
+        for entry in catalog.pages():
+            url = reverse('nuestros_voluntariados:detalle', kwargs={'slug': entry['slug']})
+            self.assertEqual(url, reverse(f"nuestros_voluntariados:{entry['slug']}"))
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            # La ruta propia del voluntariado gana sobre la genérica
+            self.assertEqual(response.resolver_match.url_name, entry['slug'])
+
+    def test_unknown_and_external_slugs_404(self):
+        for slug in ('no_existe', 'vtic'):
+            url = reverse('nuestros_voluntariados:detalle', kwargs={'slug': slug})
+            self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_listing_shows_every_program(self):
+        response = self.client.get(reverse('nuestros_voluntariados:home'))
+        for entry in VOLUNTARIADOS:
+            self.assertContains(response, entry['nombre'])
+        self.assertContains(response, 'https://nvlearn-53156.web.app/')
+
+    def test_invalid_catalog_fails_on_load(self):
+        entry = dict(VOLUNTARIADOS[1])
+        for entries in (
+            [entry, entry],
+            [dict(entry, template='no_existe.html')],
+            [dict(entry, url_externa='https://example.com')],
+            [{'slug': 'incompleto'}],
+        ):
+            with self.assertRaises(ImproperlyConfigured):
+                Catalog(entries).load()
@@ -1,14 +1,18 @@
 from django.urls import path
 
 from . import views
+from .catalog import catalog
 
 app_name = "nuestros_voluntariados"  # <-- Add this line
 
+# Cada voluntariado tiene su propio nombre de URL (p. ej. nuestros_voluntariados:pumas_verdes)
+# para los templates, las vistas que lo usan y las métricas por ruta. Van antes
+# de "detalle", que solo atiende los slugs que no están en el catálogo (404).
 urlpatterns = [
     path("home/", views.home, name="home"),
-    path("pumas_verdes/", views.pumas_verdes, name="pumas_verdes"),
-    path("patitas_unah/", views.patitas_unah, name="patitas_unah"),
-    path("sonriendo_juntos/", views.sonriendo_juntos, name="sonriendo_juntos"),
-    path("pumas_en_accion/", views.pumas_en_accion, name="pumas_en_accion"), 
-    path("pumas_unidos/", views.pumas_unidos, name="pumas_unidos"), 
-]
\ No newline at end of file
+] + [
+    path(f"{entry['slug']}/", views.detalle, {"slug": entry["slug"]}, name=entry["slug"])
+    for entry in catalog.pages()
+] + [
+    path("<slug:slug>/", views.detalle, name="detalle"),
+]